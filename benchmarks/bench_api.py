@@ -0,0 +1,116 @@
+"""
+Cliente local da API HTTP: cadastra unidades, manda leituras em lotes por
+várias conexões, confere um pedido e baixa um PDF de etiquetas, medindo
+eventos por segundo e conferindo os totais no banco.
+
+Uso: python -m benchmarks.bench_api [--clientes 8] [--leituras 100000] [--lote 1000]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import tempfile
+import threading
+import time
+
+from estoque import payload
+from estoque.api import iniciar
+from estoque.banco import BancoEstoque
+from estoque.catalogo import PRODUTOS_PADRAO
+
+
+class Cliente:
+    """Uma conexão HTTP/1.1 mantida aberta entre as requisições."""
+
+    def __init__(self, porta):
+        self.conexao = http.client.HTTPConnection("127.0.0.1", porta)
+
+    def pedir(self, metodo, caminho, corpo=None):
+        dados = None if corpo is None else json.dumps(corpo).encode("utf-8")
+        self.conexao.request(metodo, caminho, body=dados, headers={"Content-Type": "application/json"})
+        resposta = self.conexao.getresponse()
+        conteudo = resposta.read()
+        if resposta.status >= 400:
+            raise RuntimeError(f"{metodo} {caminho}: {resposta.status} {conteudo.decode()}")
+        if resposta.getheader("Content-Type") == "application/json":
+            return json.loads(conteudo)
+        return conteudo
+
+
+def codigos(faixas):
+    produtos = {p["id"]: p for p in PRODUTOS_PADRAO}
+    for f in faixas:
+        for numero in range(f["inicio"], f["fim"] + 1):
+            yield payload.codificar({"numero": numero, "validade": f["validade"]}, produtos[f["produto_id"]])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clientes", type=int, default=8, help="conexões simultâneas")
+    parser.add_argument("--leituras", type=int, default=100_000)
+    parser.add_argument("--lote", type=int, default=1000, help="leituras por requisição")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        banco = BancoEstoque(os.path.join(pasta, "api.db"), produtos_iniciais=PRODUTOS_PADRAO)
+        servidor = iniciar(banco, porta=0)
+        porta = servidor.server_address[1]
+        cliente = Cliente(porta)
+
+        por_produto = -(-args.leituras // len(PRODUTOS_PADRAO))
+        inicio = time.perf_counter()
+        faixas = cliente.pedir("POST", "/unidades", {"cadastros": [
+            {"produto_id": p["id"], "quantidade": por_produto, "validade": "31/12/2027", "lote": "API"}
+            for p in PRODUTOS_PADRAO]})["faixas"]
+        print(f"cadastro: {len(faixas)} faixas, {len(faixas) * por_produto} unidades em "
+              f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+        todos = list(codigos(faixas))[:args.leituras]
+        lotes = [todos[i:i + args.lote] for i in range(0, len(todos), args.lote)]
+        tempos = []
+
+        def enviar(parte):
+            c = Cliente(porta)
+            for lote in parte:
+                t = time.perf_counter()
+                resposta = c.pedir("POST", "/leituras", {"codigos": lote})
+                tempos.append(time.perf_counter() - t)
+                assert resposta["registradas"] == len(lote) and not resposta["invalidos"], resposta
+
+        threads = [threading.Thread(target=enviar, args=(lotes[i::args.clientes],)) for i in range(args.clientes)]
+        inicio = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        duracao = time.perf_counter() - inicio
+        assert banco.contar_leituras() == len(todos), "leituras perdidas"
+        tempos.sort()
+        print(f"leituras: {len(todos)} em {duracao:.2f} s ({len(todos) / duracao:.0f} eventos/s, "
+              f"{args.clientes} conexões, lotes de {args.lote}; p50 {tempos[len(tempos) // 2] * 1000:.1f} ms "
+              f"por lote)")
+
+        itens = [{"produto_id": f["produto_id"], "quantidade": f["fim"] - f["inicio"] + 1} for f in faixas[:2]]
+        pedido = banco.salvar_pedido("Benchmark", itens)
+        selecionados = [c for c in todos if c.split(":")[2] in {i["produto_id"] for i in itens}]
+        inicio = time.perf_counter()
+        for i in range(0, len(selecionados), args.lote):
+            cliente.pedir("POST", f"/pedidos/{pedido['id']}/conferencia", {"codigos": selecionados[i:i + args.lote]})
+        estado = cliente.pedir("GET", f"/pedidos/{pedido['id']}/conferencia")
+        assert estado["completa"], estado
+        print(f"conferência: {estado['conferidas']} unidades em {(time.perf_counter() - inicio) * 1000:.0f} ms, "
+              f"pedido completo")
+
+        inicio = time.perf_counter()
+        pdf = cliente.pedir("GET", f"/etiquetas.pdf?numero_de={faixas[0]['inicio']}&numero_ate={faixas[0]['inicio'] + 99}")
+        assert pdf.startswith(b"%PDF"), "PDF inválido"
+        print(f"etiquetas: 100 em PDF vetorial ({len(pdf) // 1024} KiB) em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+        servidor.shutdown()
+        servidor.server_close()
+        banco.fechar()
+
+
+if __name__ == "__main__":
+    main()
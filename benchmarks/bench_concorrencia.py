@@ -0,0 +1,127 @@
+"""
+Várias estações cadastrando, lendo e consultando o mesmo banco ao mesmo
+tempo: confere que nenhum número de unidade foi alocado duas vezes e mede
+a vazão.
+
+As estações são threads sobre uma única ``BancoEstoque`` (como as sessões
+do Streamlit) e, com ``--processos``, também processos com instâncias
+próprias apontando para o mesmo arquivo.
+
+Uso: python -m benchmarks.bench_concorrencia [--estacoes 16] [--operacoes 200] [--processos 2]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+from estoque.banco import BancoEstoque
+
+PRODUTOS = [{"id": f"P{i}", "nome": f"Produto {i}", "volume": "20L", "categoria": "Outro"} for i in range(10)]
+
+
+def estacao(banco, operacoes, semente):
+    """Mistura de cadastros, leituras e consultas; retorna (faixas alocadas, tempos de consulta)."""
+    aleatorio = random.Random(semente)
+    faixas, consultas = [], []
+    for _ in range(operacoes):
+        sorteio = aleatorio.random()
+        if sorteio < 0.4:
+            faixa = banco.cadastrar_unidades(aleatorio.choice(PRODUTOS)["id"], aleatorio.randint(1, 100),
+                                             date(2027, 1, 1), "STRESS")
+            faixas.append((faixa.inicio, faixa.fim))
+        elif sorteio < 0.7:
+            horario = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            banco.registrar_leituras([{"numero": aleatorio.randint(1, 1000), "produto_id": "P0",
+                                       "nome": "Produto 0", "horario": horario} for _ in range(20)])
+        else:
+            inicio = time.perf_counter()
+            banco.contar_unidades(status="em_estoque")
+            banco.listar_unidades(limite=10, recentes_primeiro=True)
+            consultas.append(time.perf_counter() - inicio)
+    return faixas, consultas
+
+
+def _processo(caminho, estacoes, operacoes, semente, fila):
+    banco = BancoEstoque(caminho)
+    fila.put(_rodar_threads(banco, estacoes, operacoes, semente))
+    banco.fechar()
+
+
+def _rodar_threads(banco, estacoes, operacoes, semente):
+    resultados = [None] * estacoes
+
+    def rodar(i):
+        resultados[i] = estacao(banco, operacoes, semente * 1000 + i)
+
+    threads = [threading.Thread(target=rodar, args=(i,)) for i in range(estacoes)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return ([f for faixas, _ in resultados for f in faixas],
+            [c for _, consultas in resultados for c in consultas])
+
+
+def verificar(banco, faixas):
+    """Levanta AssertionError se alguma faixa se sobrepõe ou se a numeração tem buraco."""
+    faixas = sorted(faixas)
+    for (_, fim_anterior), (inicio, _) in zip(faixas, faixas[1:]):
+        assert inicio > fim_anterior, f"números repetidos: faixa iniciando em {inicio}"
+    total = sum(fim - inicio + 1 for inicio, fim in faixas)
+    assert total == banco.contar_unidades() == banco.proximo_numero() - 1, "numeração inconsistente"
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--estacoes", type=int, default=16, help="threads por processo")
+    parser.add_argument("--operacoes", type=int, default=200, help="operações por estação")
+    parser.add_argument("--processos", type=int, default=0, help="processos extras no mesmo arquivo")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "stress.db")
+        banco = BancoEstoque(caminho, produtos_iniciais=PRODUTOS)
+
+        contexto = multiprocessing.get_context("spawn")
+        fila = contexto.Queue()
+        processos = [contexto.Process(target=_processo, args=(caminho, args.estacoes, args.operacoes, p + 1, fila))
+                     for p in range(args.processos)]
+        inicio = time.perf_counter()
+        for p in processos:
+            p.start()
+        faixas, consultas = _rodar_threads(banco, args.estacoes, args.operacoes, 0)
+        for _ in processos:
+            outras_faixas, outras_consultas = fila.get()
+            faixas += outras_faixas
+            consultas += outras_consultas
+        for p in processos:
+            p.join()
+        duracao = time.perf_counter() - inicio
+
+        try:
+            total = verificar(banco, faixas)
+        except AssertionError as e:
+            print(f"FALHOU: {e}")
+            sys.exit(1)
+        banco.fechar()
+
+    estacoes = args.estacoes * (1 + args.processos)
+    consultas.sort()
+    print(f"{estacoes} estações, {estacoes * args.operacoes} operações em {duracao:.2f} s "
+          f"({estacoes * args.operacoes / duracao:.0f} op/s)")
+    print(f"{len(faixas)} cadastros, {total} unidades, nenhum número repetido "
+          f"({len(faixas) / duracao:.0f} cadastros/s)")
+    if consultas:
+        print(f"consulta com escritas concorrentes: p50 {consultas[len(consultas) // 2] * 1000:.1f} ms, "
+              f"p95 {consultas[int(len(consultas) * 0.95)] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
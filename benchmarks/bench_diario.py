@@ -0,0 +1,76 @@
+"""
+Snapshot e recuperação com um histórico grande: tamanho do snapshot,
+tempo de gravar e restaurar e pico de memória Python (tracemalloc), que
+deve ficar no mesmo patamar qualquer que seja o tamanho do banco.
+
+Uso: python -m benchmarks.bench_diario [--cadastros 20000 100000] [--leituras 200000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from estoque import banco as modulo_banco
+from estoque.banco import BancoEstoque
+from estoque.catalogo import PRODUTOS_PADRAO
+
+
+def medir(funcao):
+    """(resultado, segundos, pico de MiB alocados); a memória é medida numa segunda chamada.
+
+    tracemalloc deixa tudo várias vezes mais lento, então o tempo vem de
+    uma chamada sem ele. As duas operações medidas podem ser repetidas.
+    """
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado, duracao, pico / 2 ** 20
+
+
+def popular(banco, cadastros, leituras):
+    for i in range(cadastros):
+        banco.cadastrar_unidades(PRODUTOS_PADRAO[i % len(PRODUTOS_PADRAO)]["id"], 10,
+                                 date(2027, 1, 1) + timedelta(days=i % 500), f"L{i % 97}")
+    lote = [{"numero": n, "produto_id": "ENGEO20", "nome": "Engeo", "horario": "01/01/2026 08:00:00"}
+            for n in range(1000)]
+    for _ in range(leituras // len(lote)):
+        banco.registrar_leituras(lote)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cadastros", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--leituras", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Só os snapshots medidos aqui, sem os automáticos no meio da carga
+    modulo_banco.EVENTOS_POR_SNAPSHOT = float("inf")
+    print(f"{'cadastros':>10} {'unidades':>10} {'eventos':>8} {'snapshot':>10} {'gravar s':>9} {'MiB':>6} "
+          f"{'recuperar s':>12} {'MiB':>6}")
+    for cadastros in args.cadastros:
+        with tempfile.TemporaryDirectory() as pasta:
+            banco = BancoEstoque(os.path.join(pasta, "diario.db"), produtos_iniciais=PRODUTOS_PADRAO)
+            popular(banco, cadastros // 2, args.leituras)
+            _, tempo_gravar, pico_gravar = medir(banco.gravar_snapshot)
+            # Metade do histórico fica só no diário e é reaplicada por cima do snapshot
+            popular(banco, cadastros - cadastros // 2, 0)
+            eventos = banco.diario.ultimo_seq()
+            esperado = banco.contar_unidades(), banco.contar_leituras()
+            # Com ``ate`` as duas chamadas partem do mesmo snapshot e reaplicam o mesmo trecho do diário
+            _, tempo_recuperar, pico_recuperar = medir(lambda: banco.recuperar(ate=eventos))
+            assert (banco.contar_unidades(), banco.contar_leituras()) == esperado, "recuperação divergente"
+            tamanho = max(os.path.getsize(c) for c in os.scandir(banco.pasta_snapshots))
+            print(f"{cadastros:>10} {esperado[0]:>10} {eventos:>8} {tamanho / 2 ** 20:>8.1f}MB "
+                  f"{tempo_gravar:>9.2f} {pico_gravar:>6.1f} {tempo_recuperar:>12.2f} {pico_recuperar:>6.1f}")
+            banco.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Tempo por etiqueta de ``gerar_etiqueta`` com e sem os caches de fonte/fundo.
+
+Uso: python -m benchmarks.bench_etiquetas [--n 200]
+"""
+
+import argparse
+import time
+
+from estoque import etiquetas
+
+PRODUTO = {"id": "PRIORI20", "nome": "Fungicida Priori Xtra", "volume": "20L", "categoria": "Fungicida"}
+
+
+def unidade(n):
+    return {"numero": n, "produto_id": PRODUTO["id"], "validade": "31/12/2027", "lote": "2025-A",
+            "data_cadastro": "01/01/2025 08:00", "status": "em_estoque"}
+
+
+def medir(n, com_cache):
+    inicio = time.perf_counter()
+    for i in range(1, n + 1):
+        if not com_cache:
+            # Simula o comportamento anterior: fontes e fundo refeitos a cada etiqueta
+            etiquetas._fontes.cache_clear()
+            etiquetas._fundo_etiqueta.cache_clear()
+        etiquetas.gerar_etiqueta(unidade(i), PRODUTO)
+    return (time.perf_counter() - inicio) / n * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=200, help="etiquetas por rodada")
+    args = parser.parse_args()
+
+    etiquetas.gerar_etiqueta(unidade(0), PRODUTO)  # aquecimento
+    sem_cache = medir(args.n, com_cache=False)
+    com_cache = medir(args.n, com_cache=True)
+    print(f"sem cache: {sem_cache:.1f} ms/etiqueta")
+    print(f"com cache: {com_cache:.1f} ms/etiqueta ({sem_cache / com_cache:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Exportação do estoque inteiro: DataFrame completo + CSV em memória (como
+era) contra a exportação em blocos para arquivo, em CSV e Parquet.
+
+Cada modo roda em um processo próprio, que informa o tempo e quanto o
+pico de memória residente (ru_maxrss) subiu durante a exportação.
+
+Uso: python -m benchmarks.bench_exportacao [--unidades 1000000] [--por-cadastro 100]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from datetime import date, timedelta
+
+from estoque.banco import BancoEstoque
+from estoque.catalogo import PRODUTOS_PADRAO
+from estoque.exportacao import FORMATOS, exportar, parquet_disponivel
+
+
+def popular(caminho, unidades, por_cadastro):
+    """Banco com ``unidades`` em faixas de ``por_cadastro`` e 1% delas expedidas."""
+    faixas = [{"inicio": inicio, "fim": min(inicio + por_cadastro - 1, unidades),
+               "produto_id": PRODUTOS_PADRAO[i % len(PRODUTOS_PADRAO)]["id"],
+               "validade": (date(2026, 1, 1) + timedelta(days=i % 700)).isoformat(), "lote": f"2025-{i % 40:02d}",
+               "data_cadastro": f"{1 + i % 28:02d}/01/2025 08:00"}
+              for i, inicio in enumerate(range(1, unidades + 1, por_cadastro))]
+    situacoes = [{"numero": n, "status": "expedido"} for n in range(1, unidades + 1, 100)]
+    banco = BancoEstoque(caminho)
+    banco.restaurar_backup({"produtos": PRODUTOS_PADRAO, "faixas": faixas, "situacoes": situacoes,
+                            "proximo_numero": unidades + 1})
+    banco.fechar()
+
+
+def em_memoria(banco, destino):
+    """O caminho antigo: DataFrame de todas as unidades e o CSV inteiro em bytes."""
+    df = banco.unidades_colunares().como_dataframe()
+    df["validade"] = df["validade"].dt.strftime("%d/%m/%Y")
+    df["produto_nome"] = banco.catalogo.nomes(df["produto_id"])
+    dados = df.to_csv(index=False).encode("utf-8")
+    with open(destino, "wb") as saida:
+        saida.write(dados)
+    return len(df)
+
+
+def _medir(caminho, modo, destino, fila):
+    banco = BancoEstoque(caminho)
+    antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    inicio = time.perf_counter()
+    if modo == "memoria":
+        total = em_memoria(banco, destino)
+    else:
+        with open(destino, "wb") as saida:
+            total = exportar(banco, modo, saida)
+    duracao = time.perf_counter() - inicio
+    fila.put((total, duracao, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - antes) / 1024))
+    banco.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--unidades", type=int, default=1_000_000)
+    parser.add_argument("--por-cadastro", type=int, default=100, help="unidades por faixa")
+    args = parser.parse_args()
+
+    modos = ["memoria", "csv"] + (["parquet"] if parquet_disponivel() else [])
+    contexto = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "exportacao.db")
+        popular(caminho, args.unidades, args.por_cadastro)
+        print(f"{'modo':>8} {'unidades':>10} {'segundos':>9} {'MiB arquivo':>12} {'+MiB RSS':>9}")
+        for modo in modos:
+            destino = os.path.join(pasta, "estoque" + FORMATOS.get(modo, FORMATOS["csv"])[1])
+            fila = contexto.Queue()
+            processo = contexto.Process(target=_medir, args=(caminho, modo, destino, fila))
+            processo.start()
+            total, duracao, rss = fila.get()
+            processo.join()
+            assert total == args.unidades, f"{modo}: {total} unidades exportadas"
+            print(f"{modo:>8} {total:>10} {duracao:>9.2f} {os.path.getsize(destino) / 2 ** 20:>12.1f} {rss:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
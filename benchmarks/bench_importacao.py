@@ -0,0 +1,74 @@
+"""
+Importação de um catálogo de fornecedor (CSV e XLSX) com linhas inválidas
+e repetidas misturadas: tempo total e conferência do relatório de erros.
+
+Uso: python -m benchmarks.bench_importacao [--linhas 50000]
+"""
+
+import argparse
+import csv
+import io
+import os
+import tempfile
+import time
+
+from estoque.banco import BancoEstoque
+from estoque.catalogo import PRODUTOS_PADRAO
+from estoque.importacao import importar_produtos, ler_planilha
+
+
+def linhas_catalogo(total):
+    """Linhas (id, nome, volume, categoria); a cada 100, uma sem nome e uma repetida."""
+    for i in range(total):
+        if i % 100 == 50:
+            yield f"sem{i}", "", "5L", "Herbicida"
+        elif i % 100 == 99:
+            yield f"forn{i - 1:06d}", f"Repetido {i}", "5L", ""
+        else:
+            yield f" forn{i:06d} ", f"Produto {i}", "20L", "Fungicida" if i % 2 else ""
+
+
+def planilha_csv(total):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=";")
+    escritor.writerow(["id", "nome", "volume", "categoria"])
+    escritor.writerows(linhas_catalogo(total))
+    return io.BytesIO(buffer.getvalue().encode("utf-8"))
+
+
+def planilha_xlsx(total):
+    from openpyxl import Workbook
+
+    livro = Workbook(write_only=True)
+    folha = livro.create_sheet()
+    folha.append(["id", "nome", "volume", "categoria"])
+    for linha in linhas_catalogo(total):
+        folha.append(linha)
+    buffer = io.BytesIO()
+    livro.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--linhas", type=int, default=50_000)
+    args = parser.parse_args()
+
+    esperados_erros = 2 * (args.linhas // 100) + (args.linhas % 100 > 50)
+    for nome, montar in [("catalogo.csv", planilha_csv), ("catalogo.xlsx", planilha_xlsx)]:
+        arquivo = montar(args.linhas)
+        with tempfile.TemporaryDirectory() as pasta:
+            banco = BancoEstoque(os.path.join(pasta, "importacao.db"), produtos_iniciais=PRODUTOS_PADRAO)
+            inicio = time.perf_counter()
+            importados, erros = importar_produtos(banco, ler_planilha(arquivo, nome))
+            duracao = time.perf_counter() - inicio
+            assert len(erros) == esperados_erros, f"{len(erros)} erros, esperados {esperados_erros}"
+            assert importados == args.linhas - len(erros) == len(banco.catalogo) - len(PRODUTOS_PADRAO)
+            banco.fechar()
+        print(f"{nome:>14}: {args.linhas} linhas em {duracao:.2f} s "
+              f"({importados} importados, {len(erros)} recusados: {dict(erros['erro'].value_counts())})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Tempo de abertura (primeira execução do script num processo novo) e de
+cada nova execução (interação) por página, com as dependências pesadas
+que ficaram carregadas.
+
+Cada página roda em um processo separado, com um banco temporário.
+
+Uso: python -m benchmarks.bench_inicio [--reexecucoes 10] [--unidades 1000]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADOS = ["pandas", "numpy", "PIL", "qrcode", "reportlab", "pyzbar", "cv2"]
+
+
+def medir_pagina(pagina, reexecucoes, unidades):
+    """Roda dentro do processo filho; CAMDA_DB já aponta para um banco temporário."""
+    from streamlit.testing.v1 import AppTest
+
+    if unidades:
+        from estoque.banco import BancoEstoque
+        banco = BancoEstoque(os.environ["CAMDA_DB"])
+        for _ in range(0, unidades, 100):
+            banco.cadastrar_unidades("ENGEO20", 100, "31/12/2027", "BENCH")
+        banco.fechar()
+
+    carregados_antes = {m for m in PESADOS if m in sys.modules}
+    app = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=120)
+    app.session_state["pagina"] = pagina
+    inicio = time.perf_counter()
+    app.run()
+    abertura = time.perf_counter() - inicio
+    if app.exception:
+        raise RuntimeError(app.exception)
+
+    tempos = []
+    for _ in range(reexecucoes):
+        inicio = time.perf_counter()
+        app.run()
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        "abertura_ms": abertura * 1000,
+        "reexecucao_ms": sorted(tempos)[len(tempos) // 2] * 1000 if tempos else None,
+        "carregados": sorted(m for m in PESADOS if m in sys.modules and m not in carregados_antes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reexecucoes", type=int, default=10)
+    parser.add_argument("--unidades", type=int, default=1000, help="unidades no banco de teste")
+    parser.add_argument("--pagina", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.pagina:
+        print(json.dumps(medir_pagina(args.pagina, args.reexecucoes, args.unidades)))
+        return
+
+    from paginas import PAGINAS
+
+    print(f"{'página':<26} {'abertura ms':>12} {'reexecução ms':>14}  carregados")
+    for pagina in PAGINAS:
+        with tempfile.TemporaryDirectory() as pasta:
+            env = dict(os.environ, CAMDA_DB=os.path.join(pasta, "bench.db"))
+            saida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_inicio", "--pagina", pagina,
+                 "--reexecucoes", str(args.reexecucoes), "--unidades", str(args.unidades)],
+                cwd=RAIZ, env=env, capture_output=True, text=True, check=True,
+            )
+        r = json.loads(saida.stdout.strip().splitlines()[-1])
+        print(f"{pagina:<26} {r['abertura_ms']:>12.0f} {r['reexecucao_ms']:>14.1f}  {', '.join(r['carregados'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Memória e tempo para montar o DataFrame das unidades: lista de dicts (como
+ficava no session_state) contra ``UnidadesColunares``.
+
+Uso: python -m benchmarks.bench_memoria [--tamanhos 10000 100000 1000000] [--por-cadastro 100]
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from estoque.colunar import UnidadesColunares
+
+PRODUTOS = ["ENGEO20", "ACTARA5", "FRONDEO5", "PRIORI20", "REVERB5", "ELATUS3"]
+
+
+def cadastros(total, por_cadastro):
+    """Atributos de cada cadastro simulado: (inicio, fim, produto, validade, lote, data)."""
+    base = datetime(2025, 1, 1, 8, 0)
+    for i, inicio in enumerate(range(1, total + 1, por_cadastro)):
+        fim = min(inicio + por_cadastro - 1, total)
+        validade = date(2026, 1, 1) + timedelta(days=i % 700)
+        yield (inicio, fim, PRODUTOS[i % len(PRODUTOS)], validade, f"2025-{i % 40:02d}",
+               base + timedelta(minutes=i))
+
+
+def lista_de_dicts(total, por_cadastro):
+    unidades = []
+    for inicio, fim, produto, validade, lote, cadastro in cadastros(total, por_cadastro):
+        for n in range(inicio, fim + 1):
+            unidades.append({
+                "numero": n,
+                "produto_id": produto,
+                "validade": validade.strftime("%d/%m/%Y"),
+                "lote": lote,
+                "data_cadastro": cadastro.strftime("%d/%m/%Y %H:%M"),
+                "status": "em_estoque",
+            })
+    return unidades
+
+
+def colunar(total, por_cadastro):
+    faixas = [{"inicio": inicio, "fim": fim, "produto_id": produto, "validade": validade.isoformat(),
+               "lote": lote, "data_cadastro": cadastro.strftime("%d/%m/%Y %H:%M")}
+              for inicio, fim, produto, validade, lote, cadastro in cadastros(total, por_cadastro)]
+    return UnidadesColunares.de_faixas(faixas)
+
+
+def medir(montar, para_dataframe):
+    """(MiB retidos pela estrutura, segundos para montar, segundos para virar DataFrame)."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    dados = montar()
+    tempo_montar = time.perf_counter() - inicio
+    retidos = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    inicio = time.perf_counter()
+    para_dataframe(dados)
+    return retidos / 2 ** 20, tempo_montar, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--por-cadastro", type=int, default=100, help="unidades por cadastro")
+    args = parser.parse_args()
+
+    print(f"{'unidades':>10} {'estrutura':>10} {'MiB':>9} {'B/unid.':>8} {'montar s':>9} {'DataFrame s':>12}")
+    for total in args.tamanhos:
+        for nome, montar, para_dataframe in [
+            ("dicts", lambda: lista_de_dicts(total, args.por_cadastro), pd.DataFrame),
+            ("colunar", lambda: colunar(total, args.por_cadastro), UnidadesColunares.como_dataframe),
+        ]:
+            mib, tempo_montar, tempo_df = medir(montar, para_dataframe)
+            print(f"{total:>10} {nome:>10} {mib:>9.1f} {mib * 2 ** 20 / total:>8.0f} "
+                  f"{tempo_montar:>9.2f} {tempo_df:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
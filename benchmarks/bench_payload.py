@@ -0,0 +1,71 @@
+"""
+Compara o payload JSON legado com o compacto: versão do QR, tempo de
+geração e taxa de leitura (pyzbar) com a etiqueta reduzida e desfocada,
+simulando fotos tiradas de longe.
+
+Uso: python -m benchmarks.bench_payload [--n 50]
+"""
+
+import argparse
+import time
+
+from PIL import Image, ImageFilter
+
+from estoque import etiquetas, payload
+
+PRODUTO = {"id": "REVERB5", "nome": "Fungicida Microbiológico Reverb", "volume": "5L", "categoria": "Fungicida"}
+LARGURAS_FOTO = [600, 400, 300, 240, 200, 160]
+
+
+def unidade(n):
+    return {"numero": n, "produto_id": PRODUTO["id"], "validade": "31/12/2027", "lote": "2025-A",
+            "data_cadastro": "01/01/2025 08:00", "status": "em_estoque"}
+
+
+def medir_geracao(codificar, n):
+    inicio = time.perf_counter()
+    for i in range(1, n + 1):
+        etiquetas.gerar_qr_code(codificar(unidade(i), PRODUTO), tamanho_box=12)
+    return (time.perf_counter() - inicio) / n * 1000
+
+
+def medir_leitura(codificar, n):
+    """Fração de leituras corretas por largura da foto; None se o pyzbar não estiver disponível."""
+    try:
+        from pyzbar.pyzbar import decode
+    except ImportError:
+        return None
+    acertos = {largura: 0 for largura in LARGURAS_FOTO}
+    for i in range(1, n + 1):
+        esperado = codificar(unidade(i), PRODUTO)
+        # QR no mesmo tamanho e posição que ocupa na etiqueta de 1200x1500
+        img = Image.new("L", (1200, 1500), "white")
+        qr = etiquetas.gerar_qr_code(esperado, tamanho_box=12).convert("L")
+        img.paste(qr.resize((etiquetas.QR_TAMANHO, etiquetas.QR_TAMANHO)), (275, etiquetas.QR_Y))
+        for largura in LARGURAS_FOTO:
+            foto = img.resize((largura, largura * img.height // img.width)).filter(ImageFilter.GaussianBlur(1))
+            if any(r.data.decode() == esperado for r in decode(foto)):
+                acertos[largura] += 1
+    return {largura: qtd / n for largura, qtd in acertos.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=50, help="etiquetas por formato")
+    args = parser.parse_args()
+
+    for nome, codificar in (("legado (JSON)", payload.codificar_legado), ("compacto", payload.codificar)):
+        exemplo = codificar(unidade(1), PRODUTO)
+        versao = etiquetas.montar_qr(exemplo).version
+        ms = medir_geracao(codificar, args.n)
+        print(f"{nome}: {len(exemplo.encode())} bytes, QR versão {versao}, {ms:.1f} ms/QR")
+        leitura = medir_leitura(codificar, args.n)
+        if leitura is None:
+            print("  leitura: pyzbar/zbar indisponível, não medida")
+        else:
+            for largura, taxa in leitura.items():
+                print(f"  leitura com foto de {largura}px: {taxa:.0%}")
+
+
+if __name__ == "__main__":
+    main()
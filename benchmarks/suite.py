@@ -0,0 +1,311 @@
+"""
+Suíte de desempenho dos caminhos quentes: QR, etiqueta, PNG, PDF (imagem e
+vetorial), ZPL, leitura com pyzbar, contagem de vencimentos da barra
+lateral e as tabelas de Relatórios.
+
+Os dados são sintéticos e determinísticos: lotes de 10, 100 e 1.000
+etiquetas e estoques de 1k, 10k e 100k unidades. Cada caso informa o tempo
+(mediana das repetições), a vazão em itens/s e a memória numa rodada à
+parte, para não distorcer o tempo: o pico alocado pelo Python e pelo numpy
+(tracemalloc) e, no Linux, quanto a memória residente subiu, que inclui os
+buffers do PIL e do ReportLab que o tracemalloc não vê.
+
+Os resultados são gravados em JSON e comparados com uma baseline salva:
+casos mais lentos ou que usam mais memória que a tolerância são marcados
+como regressão e o comando sai com código 1.
+
+Uso: python -m benchmarks.suite [--casos qr pdf ...] [--rapido] [--repeticoes 3]
+                                [--baseline benchmarks/baseline.json] [--salvar-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime
+
+from benchmarks.bench_exportacao import popular
+from estoque import etiquetas, zpl
+from estoque.banco import BancoEstoque
+from estoque.catalogo import Catalogo, PRODUTOS_PADRAO
+from estoque.relatorios import estoque_atual, tabela_validades
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PADRAO = os.path.join(PASTA, "baseline.json")
+PASTA_RESULTADOS = os.path.join(PASTA, "resultados")
+
+LOTES = [10, 100, 1_000]
+ESTOQUES = [1_000, 10_000, 100_000]
+TOLERANCIA = 0.25
+# Folga absoluta para casos muito rápidos ou com pouca memória, onde o ruído domina
+FOLGA_SEGUNDOS = 0.005
+FOLGA_MIB = 1.0
+FOLGA_RSS_MIB = 4.0
+INTERVALO_RSS = 0.005
+# Data fixa: a contagem de vencimentos não muda com o dia em que a suíte roda
+HOJE = date(2026, 6, 1)
+LINHAS_PAGINA = 50
+
+CATALOGO = Catalogo(PRODUTOS_PADRAO)
+
+# nome -> (tamanhos, preparar(tamanho, contexto) -> (função medida, itens por chamada))
+CASOS = {}
+
+
+def caso(nome, tamanhos):
+    def registrar(preparar):
+        CASOS[nome] = (tamanhos, preparar)
+        return preparar
+    return registrar
+
+
+def unidades_etiqueta(quantidade):
+    return [{"numero": n, "produto_id": PRODUTOS_PADRAO[n % len(PRODUTOS_PADRAO)]["id"], "validade": "31/12/2027",
+             "lote": f"2025-{n % 40:02d}", "data_cadastro": "01/01/2025 08:00", "status": "em_estoque"}
+            for n in range(1, quantidade + 1)]
+
+
+def _com_produto(quantidade):
+    return [(un, CATALOGO.buscar(un["produto_id"])) for un in unidades_etiqueta(quantidade)]
+
+
+# ---------------- Etiquetas ----------------
+@caso("qr", LOTES)
+def _qr(quantidade, contexto):
+    tarefas = _com_produto(quantidade)
+    return lambda: [etiquetas.gerar_qr_code(etiquetas.dados_qr(un, p)) for un, p in tarefas], quantidade
+
+
+@caso("etiqueta", LOTES)
+def _etiqueta(quantidade, contexto):
+    tarefas = _com_produto(quantidade)
+    return lambda: [etiquetas.gerar_etiqueta(un, p) for un, p in tarefas], quantidade
+
+
+@caso("png", LOTES)
+def _png(quantidade, contexto):
+    # Uma imagem só: mil etiquetas de 1200x1500 em memória ocupariam gigabytes
+    img = etiquetas.gerar_etiqueta(*_com_produto(1)[0])
+    return lambda: [etiquetas.imagem_para_bytes(img) for _ in range(quantidade)], quantidade
+
+
+@caso("pdf", LOTES)
+def _pdf(quantidade, contexto):
+    unidades = unidades_etiqueta(quantidade)
+    return lambda: etiquetas.gerar_pdf_etiquetas(unidades, CATALOGO), quantidade
+
+
+@caso("pdf_vetorial", LOTES)
+def _pdf_vetorial(quantidade, contexto):
+    unidades = unidades_etiqueta(quantidade)
+    return lambda: etiquetas.gerar_pdf_etiquetas_vetorial(unidades, CATALOGO), quantidade
+
+
+@caso("zpl", LOTES)
+def _zpl(quantidade, contexto):
+    unidades = unidades_etiqueta(quantidade)
+    return lambda: "".join(zpl.gerar_zpl_etiquetas(unidades, CATALOGO)), quantidade
+
+
+@caso("decodificar", LOTES)
+def _decodificar(quantidade, contexto):
+    """Leitura de fotos de etiquetas; levanta ImportError sem o pyzbar/zbar."""
+    from estoque.leitor import decodificar_imagem, obter_decodificador
+
+    decodificar = obter_decodificador()
+    img = etiquetas.gerar_etiqueta(*_com_produto(1)[0])
+    return lambda: [decodificar_imagem(img, decodificar) for _ in range(quantidade)], quantidade
+
+
+# ---------------- Estoque ----------------
+def _banco(unidades, contexto):
+    """Banco com ``unidades`` em faixas de 10, reaproveitado entre os casos do mesmo tamanho."""
+    if unidades not in contexto["bancos"]:
+        caminho = os.path.join(contexto["pasta"], f"estoque-{unidades}.db")
+        popular(caminho, unidades, 10)
+        contexto["bancos"][unidades] = BancoEstoque(caminho)
+    return contexto["bancos"][unidades]
+
+
+@caso("vencimentos", ESTOQUES)
+def _vencimentos(unidades, contexto):
+    """A recontagem no banco da barra lateral (a primeira do dia; depois vêm dos contadores)."""
+    banco = _banco(unidades, contexto)
+    return lambda: banco._calcular_vencimentos(HOJE), unidades
+
+
+@caso("relatorio_estoque", ESTOQUES)
+def _relatorio_estoque(unidades, contexto):
+    banco = _banco(unidades, contexto)
+    return lambda: estoque_atual(banco.contagem_por_produto(), CATALOGO), unidades
+
+
+@caso("relatorio_validades", ESTOQUES)
+def _relatorio_validades(unidades, contexto):
+    """Aba de validades logo após uma alteração: colunas refeitas, ordenação e a primeira página."""
+    banco = _banco(unidades, contexto)
+
+    def relatorio():
+        banco._colunar = None
+        colunas = banco.unidades_colunares()
+        posicoes = colunas.consultar("validade")[:LINHAS_PAGINA]
+        return tabela_validades(colunas, CATALOGO, posicoes, HOJE)
+
+    return relatorio, unidades
+
+
+def _rss_mib():
+    """Memória residente do processo (Linux); None onde não há /proc."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        return None
+
+
+def medir(funcao, repeticoes, aquecer=True):
+    """(mediana dos segundos, pico de MiB no tracemalloc, MiB de RSS a mais ou None).
+
+    A memória vem de uma rodada extra, com tracemalloc e uma thread
+    amostrando a RSS a cada ``INTERVALO_RSS`` segundos.
+    """
+    if aquecer:
+        funcao()  # caches de fonte, fundo da etiqueta, imports
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    inicial = _rss_mib()
+    picos = [inicial]
+    terminou = threading.Event()
+
+    def amostrar():
+        while not terminou.wait(INTERVALO_RSS):
+            picos[0] = max(picos[0], _rss_mib())
+
+    amostrador = threading.Thread(target=amostrar, daemon=True) if inicial is not None else None
+    if amostrador:
+        amostrador.start()
+    tracemalloc.start()
+    try:
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        terminou.set()
+    if amostrador:
+        amostrador.join()
+        picos[0] = max(picos[0], _rss_mib())
+    return statistics.median(tempos), pico / 2 ** 20, None if inicial is None else picos[0] - inicial
+
+
+def ambiente():
+    versoes = {}
+    for modulo in ("numpy", "pandas", "PIL", "qrcode", "reportlab", "pyarrow"):
+        try:
+            versoes[modulo] = getattr(__import__(modulo), "__version__", "?")
+        except ImportError:
+            continue
+    return {"python": platform.python_version(), "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(), "cpus": os.cpu_count(), **versoes}
+
+
+def rodar(nomes, rapido=False, repeticoes=3, saida=print):
+    """{"caso/tamanho": {caso, tamanho, segundos, itens_por_s, pico_mib, rss_mib}} dos casos pedidos.
+
+    Casos cuja dependência não está instalada ficam de fora, com aviso.
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        contexto = {"pasta": pasta, "bancos": {}}
+        try:
+            for nome in nomes:
+                tamanhos, preparar = CASOS[nome]
+                for i, tamanho in enumerate(tamanhos[:2] if rapido else tamanhos):
+                    try:
+                        funcao, itens = preparar(tamanho, contexto)
+                    except ImportError as e:
+                        saida(f"{nome}: ignorado ({e})")
+                        break
+                    # Os tamanhos seguintes já encontram os caches quentes
+                    segundos, pico, rss = medir(funcao, repeticoes, aquecer=i == 0)
+                    resultados[f"{nome}/{tamanho}"] = {"caso": nome, "tamanho": tamanho, "segundos": segundos,
+                                                       "itens_por_s": itens / segundos, "pico_mib": pico,
+                                                       "rss_mib": rss}
+                    saida(f"{nome:>20} {tamanho:>8} {segundos:>10.4f} {itens / segundos:>12.0f} {pico:>9.1f} "
+                          f"{'-' if rss is None else f'{rss:.1f}':>8}")
+        finally:
+            for banco in contexto["bancos"].values():
+                banco.fechar()
+    return resultados
+
+
+def regressoes(resultados, baseline, tolerancia=TOLERANCIA):
+    """[(chave, descrição)] dos casos que pioraram mais que ``tolerancia`` em tempo ou memória."""
+    encontradas = []
+    for chave, atual in resultados.items():
+        base = baseline.get(chave)
+        if base is None:
+            continue
+        if atual["segundos"] > base["segundos"] * (1 + tolerancia) + FOLGA_SEGUNDOS:
+            encontradas.append((chave, f"tempo {base['segundos']:.4f}s -> {atual['segundos']:.4f}s "
+                                       f"({atual['segundos'] / base['segundos']:.2f}x)"))
+        if atual["pico_mib"] > base["pico_mib"] * (1 + tolerancia) + FOLGA_MIB:
+            encontradas.append((chave, f"memória {base['pico_mib']:.1f} -> {atual['pico_mib']:.1f} MiB"))
+        if (atual.get("rss_mib") is not None and base.get("rss_mib") is not None
+                and atual["rss_mib"] > base["rss_mib"] * (1 + tolerancia) + FOLGA_RSS_MIB):
+            encontradas.append((chave, f"RSS +{base['rss_mib']:.1f} -> +{atual['rss_mib']:.1f} MiB"))
+    return encontradas
+
+
+def gravar(caminho, resultados):
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump({"criado": datetime.now().isoformat(timespec="seconds"), "ambiente": ambiente(),
+                   "resultados": resultados}, arquivo, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--rapido", action="store_true", help="só os dois menores tamanhos de cada caso")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--saida", help="JSON com os resultados (padrão: benchmarks/resultados/<data>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO)
+    parser.add_argument("--salvar-baseline", action="store_true", help="grava os resultados como a nova baseline")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA, help="piora aceita (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    print(f"{'caso':>20} {'tamanho':>8} {'segundos':>10} {'itens/s':>12} {'pico MiB':>9} {'+RSS MiB':>8}")
+    resultados = rodar(args.casos, args.rapido, args.repeticoes)
+    saida = args.saida or os.path.join(PASTA_RESULTADOS, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    gravar(saida, resultados)
+    print(f"\nResultados em {saida}")
+
+    if args.salvar_baseline:
+        gravar(args.baseline, resultados)
+        print(f"Baseline gravada em {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("Sem baseline para comparar; rode com --salvar-baseline para criar uma.")
+        return
+    with open(args.baseline, encoding="utf-8") as arquivo:
+        baseline = json.load(arquivo)["resultados"]
+    encontradas = regressoes(resultados, baseline, args.tolerancia)
+    for chave, descricao in encontradas:
+        print(f"REGRESSÃO {chave}: {descricao}")
+    if encontradas:
+        sys.exit(1)
+    print(f"Nenhuma regressão contra a baseline ({len(set(resultados) & set(baseline))} casos comparados).")
+
+
+if __name__ == "__main__":
+    main()
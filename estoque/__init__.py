@@ -0,0 +1,3 @@
+"""
+Núcleo do sistema de controle de estoque CAMDA.
+"""
@@ -0,0 +1,86 @@
+"""
+Contagens de unidades mantidas em memória, por (produto, lote, status).
+
+O painel, a barra lateral e os relatórios leem daqui em vez de agregar o
+banco a cada execução. Cada escrita do ``BancoEstoque`` soma a sua
+diferença às contagens (O(1) por chave) ao confirmar a transação; volume
+e categoria são derivados pelo catálogo na leitura, sobre as poucas
+chaves existentes.
+"""
+
+from operator import itemgetter
+
+from estoque.derivados import DerivadoDoBanco
+
+PRODUTO, PRODUTO_E_LOTE, STATUS = itemgetter(0), itemgetter(0, 1), itemgetter(2)
+
+
+class AgregadosEstoque(DerivadoDoBanco):
+    """Quantidade de unidades por (produto_id, lote, status).
+
+    O estado é {(produto_id, lote, status): quantidade}; as mudanças de
+    cada transação são pares (chave, delta).
+    """
+
+    def _aplicar(self, contagens, diferencas):
+        for chave, delta in diferencas:
+            total = contagens.get(chave, 0) + delta
+            if total:
+                contagens[chave] = total
+            else:
+                contagens.pop(chave, None)
+        return contagens
+
+    def contagens(self):
+        """Cópia de {(produto_id, lote, status): quantidade}."""
+        with self._lock:
+            return dict(self._atualizado())
+
+    def verificar(self, recontar):
+        """{chave: (mantida, recontada)} onde as contagens diferem de ``recontar()``.
+
+        A recontagem roda com o lock: nenhuma transação deste processo é
+        confirmada no meio.
+        """
+        with self._lock:
+            return divergencias(self._atualizado(), recontar())
+
+    def _somar(self, agrupar, status=None):
+        """{agrupar(chave): quantidade}, opcionalmente só as unidades com ``status``."""
+        with self._lock:
+            itens = list(self._atualizado().items())
+        soma = {}
+        for chave, quantidade in itens:
+            if status is None or STATUS(chave) == status:
+                grupo = agrupar(chave)
+                soma[grupo] = soma.get(grupo, 0) + quantidade
+        return soma
+
+    def total(self, status=None):
+        return sum(self._somar(STATUS, status).values())
+
+    def por_produto(self, status=None):
+        return self._somar(PRODUTO, status)
+
+    def por_lote(self, status=None):
+        """{(produto_id, lote): quantidade}; o mesmo lote pode existir em produtos diferentes."""
+        return self._somar(PRODUTO_E_LOTE, status)
+
+    def por_status(self):
+        return self._somar(STATUS)
+
+    def por_campo_do_produto(self, catalogo, campo, status=None, padrao=None):
+        """Soma por um campo do cadastro do produto (``volume``, ``categoria``...)."""
+        mapa = catalogo.mapa(campo)
+        soma = {}
+        for produto_id, quantidade in self.por_produto(status).items():
+            valor = mapa.get(produto_id, padrao)
+            soma[valor] = soma.get(valor, 0) + quantidade
+        return soma
+
+
+def divergencias(materializadas, recalculadas):
+    """{chave: (materializada, recalculada)} onde as duas contagens diferem."""
+    return {chave: (materializadas.get(chave, 0), recalculadas.get(chave, 0))
+            for chave in materializadas.keys() | recalculadas.keys()
+            if materializadas.get(chave, 0) != recalculadas.get(chave, 0)}
@@ -0,0 +1,384 @@
+"""
+API HTTP (JSON) para leitores de mão e para o ERP, sem passar pelo Streamlit.
+
+Usa o mesmo ``BancoEstoque``, o mesmo formato de QR (``payload``), a
+mesma conferência de pedidos e os mesmos geradores de etiqueta da
+interface. Todas as rotas de escrita recebem lotes e gravam cada lote em
+uma transação. A exportação e o snapshot vão em ``Transfer-Encoding:
+chunked`` à medida que são gerados: nem o arquivo inteiro nem uma cópia
+dele ficam na memória.
+
+    POST /unidades                  {"cadastros": [{"produto_id", "quantidade", "validade", "lote"}, ...]}
+    POST /leituras                  {"codigos": ["C1:...", {"codigo": "C1:...", "horario": "..."}, ...]}
+    GET  /etiquetas.pdf             ?numero_de=&numero_ate=&produto_id=&status=&formato=vetorial|raster
+    GET  /estoque.csv, /estoque.parquet
+    GET  /snapshot.jsonl.gz
+    GET  /pedidos/<id>/conferencia
+    POST /pedidos/<id>/conferencia  {"codigos": [...]}
+    POST /pedidos/<id>/expedicao    {"parcial": false}
+    GET  /saude
+
+Com ``CAMDA_API_PORTA`` definida, a interface sobe a API em uma thread do
+próprio processo, compartilhando a instância do banco (e os contadores,
+catálogo e conferências em memória). Sem a interface, rode à parte:
+
+    python -m estoque.api --porta 8765
+
+Se ``CAMDA_API_TOKEN`` estiver definida, toda requisição precisa do
+cabeçalho ``Authorization: Bearer <token>``.
+"""
+
+import argparse
+import hmac
+import io
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from estoque import payload
+from estoque.banco import CAMINHO_PADRAO, BancoEstoque, validade_iso
+from estoque.catalogo import PRODUTOS_PADRAO
+from estoque.conferencia import ACEITA, EXPEDIDA
+
+PORTA_PADRAO = 8765
+MAX_CORPO = 32 * 2 ** 20
+MAX_UNIDADES_CADASTRO = 100_000
+MAX_ETIQUETAS = 5_000
+FORMATOS_PDF = ("vetorial", "raster")
+# Respostas em partes são juntadas neste tamanho antes de ir para o socket
+TAMANHO_PARTE = 64 * 1024
+
+ROTA_CONFERENCIA = r"/pedidos/(\d+)/conferencia"
+ROTA_EXPEDICAO = r"/pedidos/(\d+)/expedicao"
+
+
+class ErroRequisicao(Exception):
+    """Erro do cliente: vira uma resposta JSON ``{"erro": ...}`` com o status informado."""
+
+    def __init__(self, mensagem, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(mensagem)
+        self.status = status
+
+
+def _horario_agora():
+    return datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+
+
+def ler_codigos(codigos, catalogo):
+    """Decodifica códigos de QR em leituras; retorna (leituras, inválidos).
+
+    Cada código é o texto da etiqueta ou ``{"codigo", "horario"}``.
+    ``inválidos`` lista ``{"indice", "erro"}`` dos que não são etiquetas
+    do sistema; os demais seguem para o banco.
+    """
+    if not isinstance(codigos, list):
+        raise ErroRequisicao("'codigos' deve ser uma lista")
+    agora = _horario_agora()
+    leituras, invalidos = [], []
+    for i, codigo in enumerate(codigos):
+        horario = agora
+        if isinstance(codigo, dict):
+            horario = str(codigo.get("horario") or agora)
+            codigo = codigo.get("codigo")
+        try:
+            if not isinstance(codigo, str):
+                raise ValueError("código ausente")
+            dados = payload.resolver(payload.decodificar(codigo), catalogo)
+            numero = dados.get("n")
+            leituras.append({"numero": int(numero) if numero is not None else None, "produto_id": dados.get("p"),
+                             "nome": dados.get("nome"), "horario": horario})
+        except (ValueError, TypeError) as e:
+            invalidos.append({"indice": i, "erro": f"código não reconhecido ({e})"})
+    return leituras, invalidos
+
+
+def estado_conferencia(conferencia):
+    return {
+        "completa": conferencia.completa,
+        "conferidas": len(conferencia.numeros),
+        "itens": [{"produto_id": pid, "lidos": lidos, "esperados": esperados}
+                  for pid, lidos, esperados in conferencia.itens()],
+        "faltando": conferencia.faltando,
+        "excedentes": conferencia.excedentes,
+        "inesperados": conferencia.inesperados,
+    }
+
+
+class _Partes(io.RawIOBase):
+    """Escreve cada bloco recebido como uma parte de ``Transfer-Encoding: chunked``."""
+
+    def __init__(self, saida):
+        self._saida = saida
+
+    def writable(self):
+        return True
+
+    def write(self, dados):
+        if dados:
+            self._saida.write(b"%x\r\n%s\r\n" % (len(dados), bytes(dados)))
+        return len(dados)
+
+
+class ServidorApi(ThreadingHTTPServer):
+    """Servidor HTTP com uma thread por conexão, ligado a um ``BancoEstoque``."""
+
+    daemon_threads = True
+
+    def __init__(self, endereco, banco, token=None):
+        super().__init__(endereco, ManipuladorApi)
+        self.banco = banco
+        self.token = token
+
+
+class ManipuladorApi(BaseHTTPRequestHandler):
+    # Mantém a conexão aberta entre lotes (leitores mandam um atrás do outro)
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        pass
+
+    @property
+    def banco(self):
+        return self.server.banco
+
+    # ---------------- Protocolo ----------------
+    def _responder(self, status, corpo, tipo="application/json"):
+        if callable(corpo):
+            self._responder_em_partes(status, corpo, tipo)
+            return
+        if tipo == "application/json":
+            corpo = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _responder_em_partes(self, status, escrever, tipo):
+        """Resposta de tamanho desconhecido: ``escrever(saida)`` grava num arquivo binário que sai em partes.
+
+        Um erro no meio só pode fechar a conexão: o cliente vê a resposta
+        sem a parte final e sabe que ela está incompleta.
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            with io.BufferedWriter(_Partes(self.wfile), TAMANHO_PARTE) as saida:
+                escrever(saida)
+        except Exception:
+            self.close_connection = True
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _corpo_json(self):
+        try:
+            tamanho = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0:
+            raise ErroRequisicao("Content-Length inválido")
+        if tamanho > MAX_CORPO:
+            raise ErroRequisicao("Corpo grande demais", HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        try:
+            dados = json.loads(self.rfile.read(tamanho) or b"{}")
+        except ValueError:
+            raise ErroRequisicao("JSON inválido")
+        if not isinstance(dados, dict):
+            raise ErroRequisicao("O corpo deve ser um objeto JSON")
+        return dados
+
+    def _autorizado(self):
+        token = self.server.token
+        if not token:
+            return True
+        enviado = self.headers.get("Authorization", "")
+        return hmac.compare_digest(enviado.encode(), f"Bearer {token}".encode())
+
+    def _despachar(self, rotas):
+        url = urlsplit(self.path)
+        try:
+            if not self._autorizado():
+                raise ErroRequisicao("Token inválido", HTTPStatus.UNAUTHORIZED)
+            self.banco.sincronizar()
+            for padrao, metodo in rotas:
+                encontrado = re.fullmatch(padrao, url.path)
+                if encontrado:
+                    status, corpo, *tipo = metodo(parse_qs(url.query), *encontrado.groups())
+                    self._responder(status, corpo, *tipo)
+                    return
+            raise ErroRequisicao(f"Rota desconhecida: {url.path}", HTTPStatus.NOT_FOUND)
+        except ErroRequisicao as e:
+            # O corpo pode não ter sido lido: não reaproveita a conexão
+            self.close_connection = True
+            self._responder(e.status, {"erro": str(e)})
+        except Exception as e:
+            self.close_connection = True
+            self._responder(HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        self._despachar([
+            (r"/saude", self._saude),
+            (r"/etiquetas\.pdf", self._etiquetas_pdf),
+            (ROTA_CONFERENCIA, self._consultar_conferencia),
+            (r"/estoque\.(csv|parquet)", self._exportar_estoque),
+            (r"/snapshot\.jsonl\.gz", self._snapshot),
+        ])
+
+    def do_POST(self):
+        self._despachar([
+            (r"/unidades", self._cadastrar_unidades),
+            (r"/leituras", self._registrar_leituras),
+            (ROTA_CONFERENCIA, self._conferir),
+            (ROTA_EXPEDICAO, self._expedir),
+        ])
+
+    # ---------------- Rotas ----------------
+    def _saude(self, consulta):
+        return HTTPStatus.OK, {"ok": True, "unidades": self.banco.contar_unidades(),
+                               "proximo_numero": self.banco.proximo_numero()}
+
+    def _cadastrar_unidades(self, consulta):
+        dados = self._corpo_json()
+        cadastros = dados.get("cadastros", [dados] if "produto_id" in dados else None)
+        if not isinstance(cadastros, list) or not cadastros:
+            raise ErroRequisicao("Informe 'cadastros' com ao menos um item")
+        validados = []
+        for i, c in enumerate(cadastros):
+            produto_id = c.get("produto_id") if isinstance(c, dict) else None
+            # Checa o tipo antes: uma lista nem pode ser procurada no catálogo
+            if not isinstance(produto_id, str) or produto_id not in self.banco.catalogo:
+                raise ErroRequisicao(f"cadastros[{i}]: produto desconhecido")
+            quantidade = c.get("quantidade")
+            if type(quantidade) is not int or not 1 <= quantidade <= MAX_UNIDADES_CADASTRO:
+                raise ErroRequisicao(f"cadastros[{i}]: quantidade deve ser inteira entre 1 e {MAX_UNIDADES_CADASTRO}")
+            validade = c.get("validade")
+            if validade and validade_iso(validade) is None:
+                raise ErroRequisicao(f"cadastros[{i}]: validade inválida")
+            if validade and validade_iso(validade) < payload.DATA_BASE.isoformat():
+                raise ErroRequisicao(f"cadastros[{i}]: validade anterior a {payload.DATA_BASE:%d/%m/%Y}")
+            lote = c.get("lote") or "N/I"
+            if not isinstance(lote, str):
+                raise ErroRequisicao(f"cadastros[{i}]: lote deve ser texto")
+            validados.append((produto_id, quantidade, validade, lote))
+        # Só cadastra depois de validar o lote inteiro, e tudo numa transação
+        faixas = self.banco.cadastrar_lote(validados)
+        return HTTPStatus.CREATED, {"faixas": [f.como_dict() for f in faixas]}
+
+    def _registrar_leituras(self, consulta):
+        leituras, invalidos = ler_codigos(self._corpo_json().get("codigos"), self.banco.catalogo)
+        alertas = self.banco.registrar_leituras(leituras) if leituras else {}
+        return HTTPStatus.OK, {"registradas": len(leituras), "invalidos": invalidos,
+                               "alertas": [{"numero": n, "alerta": a} for n, a in sorted(alertas.items())]}
+
+    def _conferencia(self, pedido_id):
+        try:
+            return self.banco.conferencia(int(pedido_id))
+        except KeyError:
+            raise ErroRequisicao(f"Pedido {pedido_id} não encontrado", HTTPStatus.NOT_FOUND)
+
+    def _consultar_conferencia(self, consulta, pedido_id):
+        return HTTPStatus.OK, estado_conferencia(self._conferencia(pedido_id))
+
+    def _conferir(self, consulta, pedido_id):
+        conferencia = self._conferencia(pedido_id)
+        leituras, invalidos = ler_codigos(self._corpo_json().get("codigos"), self.banco.catalogo)
+        try:
+            resultados = self.banco.conferir(int(pedido_id), leituras)
+        except ValueError as e:
+            raise ErroRequisicao(str(e), HTTPStatus.CONFLICT)
+        rejeitadas = [{"numero": l["numero"], "resultado": r} for l, r in zip(leituras, resultados) if r != ACEITA]
+        return HTTPStatus.OK, {"aceitas": resultados.count(ACEITA), "rejeitadas": rejeitadas,
+                               "invalidos": invalidos, **estado_conferencia(conferencia)}
+
+    def _expedir(self, consulta, pedido_id):
+        """Expede as unidades conferidas do pedido; 409 se já foi expedido ou a conferência não está completa."""
+        self._conferencia(pedido_id)
+        parcial = self._corpo_json().get("parcial", False)
+        if not isinstance(parcial, bool):
+            raise ErroRequisicao("'parcial' deve ser true ou false")
+        try:
+            resultados = self.banco.confirmar_pedido(int(pedido_id), parcial=parcial)
+        except ValueError as e:
+            raise ErroRequisicao(str(e), HTTPStatus.CONFLICT)
+        rejeitadas = [{"numero": n, "resultado": r} for n, r in sorted(resultados.items()) if r != EXPEDIDA]
+        return HTTPStatus.OK, {"expedidas": len(resultados) - len(rejeitadas), "rejeitadas": rejeitadas}
+
+    def _exportar_estoque(self, consulta, formato):
+        from estoque.exportacao import FORMATOS as FORMATOS_EXPORTACAO, exportar, parquet_disponivel
+
+        if formato == "parquet" and not parquet_disponivel():
+            raise ErroRequisicao("Parquet indisponível: instale o pyarrow", HTTPStatus.NOT_IMPLEMENTED)
+        return HTTPStatus.OK, lambda saida: exportar(self.banco, formato, saida), FORMATOS_EXPORTACAO[formato][0]
+
+    def _snapshot(self, consulta):
+        return HTTPStatus.OK, self.banco.exportar_snapshot, "application/gzip"
+
+    def _etiquetas_pdf(self, consulta):
+        from estoque.etiquetas import gerar_pdf_etiquetas, gerar_pdf_etiquetas_vetorial
+
+        def parametro(nome, converter=str):
+            valores = consulta.get(nome)
+            if not valores:
+                return None
+            try:
+                return converter(valores[0])
+            except ValueError:
+                raise ErroRequisicao(f"Parâmetro inválido: {nome}")
+
+        formato = parametro("formato") or "vetorial"
+        if formato not in FORMATOS_PDF:
+            raise ErroRequisicao(f"formato deve ser um de {', '.join(FORMATOS_PDF)}")
+        filtros = {"produto_id": parametro("produto_id"), "status": parametro("status"),
+                   "numero_de": parametro("numero_de", int), "numero_ate": parametro("numero_ate", int)}
+        filtros = {k: v for k, v in filtros.items() if v is not None}
+        total = self.banco.contar_unidades(**filtros)
+        if not total:
+            raise ErroRequisicao("Nenhuma unidade no filtro", HTTPStatus.NOT_FOUND)
+        if total > MAX_ETIQUETAS:
+            raise ErroRequisicao(f"{total} etiquetas; peça no máximo {MAX_ETIQUETAS} por PDF (use numero_de/numero_ate)")
+        unidades = self.banco.listar_unidades(**filtros)
+        if formato == "vetorial":
+            pdf = gerar_pdf_etiquetas_vetorial(unidades, self.banco.catalogo)
+        else:
+            pdf = gerar_pdf_etiquetas(unidades, self.banco.catalogo, processos=os.cpu_count() or 1)
+        return HTTPStatus.OK, pdf, "application/pdf"
+
+
+def iniciar(banco, host="127.0.0.1", porta=PORTA_PADRAO, token=None):
+    """Sobe a API em uma thread de fundo e retorna o servidor (``shutdown()`` para parar).
+
+    ``porta=0`` escolhe uma porta livre (veja ``servidor.server_address``).
+    """
+    servidor = ServidorApi((host, porta), banco, token)
+    threading.Thread(target=servidor.serve_forever, name="camda-api", daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API HTTP do estoque CAMDA")
+    parser.add_argument("--banco", default=CAMINHO_PADRAO, help="arquivo SQLite")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=int(os.environ.get("CAMDA_API_PORTA", PORTA_PADRAO)))
+    args = parser.parse_args()
+
+    banco = BancoEstoque(args.banco, produtos_iniciais=PRODUTOS_PADRAO)
+    servidor = ServidorApi((args.host, args.porta), banco, os.environ.get("CAMDA_API_TOKEN"))
+    print(f"API do estoque em http://{args.host}:{servidor.server_address[1]} (banco {args.banco})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        banco.fechar()
+
+
+if __name__ == "__main__":
+    main()
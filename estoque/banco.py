@@ -0,0 +1,972 @@
+"""
+Armazenamento persistente do estoque em SQLite (modo WAL).
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+from bisect import bisect_right
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from datetime import date, datetime, timedelta
+
+from estoque.agregados import AgregadosEstoque
+from estoque.catalogo import Catalogo
+from estoque.conferencia import ACEITA, DESCONHECIDA, EXPEDIDA, JA_EXPEDIDA, ConferenciaPedido
+from estoque.diario import TABELAS as TABELAS_SNAPSHOT, Diario, escrever_snapshot, ler_snapshot, listar_snapshots, nome_snapshot
+from estoque.faixas import EM_ESTOQUE, EXPEDIDO, FaixaUnidades, comprimir
+from estoque.indice import IndiceUnidades
+from estoque.instrumentacao import medir
+from estoque.validades import DIAS_ALERTA, ContadoresValidade
+
+CAMINHO_PADRAO = os.environ.get("CAMDA_DB", "estoque.db")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS produtos (
+    id TEXT PRIMARY KEY,
+    nome TEXT NOT NULL,
+    volume TEXT NOT NULL,
+    categoria TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS faixas (
+    inicio INTEGER PRIMARY KEY,
+    fim INTEGER NOT NULL,
+    produto_id TEXT NOT NULL,
+    validade TEXT,
+    lote TEXT NOT NULL,
+    data_cadastro TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_faixas_produto ON faixas(produto_id);
+CREATE INDEX IF NOT EXISTS idx_faixas_validade ON faixas(validade);
+CREATE INDEX IF NOT EXISTS idx_faixas_lote ON faixas(lote);
+CREATE TABLE IF NOT EXISTS situacoes (
+    numero INTEGER PRIMARY KEY,
+    faixa INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    horario TEXT,
+    pedido_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_situacoes_faixa ON situacoes(faixa);
+CREATE INDEX IF NOT EXISTS idx_situacoes_status ON situacoes(status);
+CREATE TABLE IF NOT EXISTS pedidos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cliente TEXT NOT NULL,
+    itens TEXT NOT NULL,
+    data TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pendente'
+);
+CREATE INDEX IF NOT EXISTS idx_pedidos_status ON pedidos(status);
+CREATE TABLE IF NOT EXISTS leituras (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    numero INTEGER,
+    produto_id TEXT,
+    nome TEXT,
+    horario TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_leituras_produto ON leituras(produto_id);
+CREATE TABLE IF NOT EXISTS conferencias (
+    pedido_id INTEGER NOT NULL,
+    numero INTEGER NOT NULL,
+    produto_id TEXT,
+    horario TEXT NOT NULL,
+    PRIMARY KEY (pedido_id, numero)
+);
+"""
+
+# Validade é gravada em ISO (ordenável/indexável) e exibida como dd/mm/aaaa
+COLUNAS_FAIXA = """inicio, fim, produto_id, strftime('%d/%m/%Y', validade) AS validade,
+    lote, data_cadastro"""
+
+# Limites usados quando a consulta não restringe o intervalo de números
+MENOR_NUMERO = 0
+MAIOR_NUMERO = 2 ** 62
+BLOCO_FAIXAS = 256
+
+# Quanto uma escrita espera pelo lock de escrita do SQLite antes de desistir
+ESPERA_ESCRITA_S = 30
+
+# Snapshot automático a cada tantos eventos no diário; os mais antigos são apagados
+EVENTOS_POR_SNAPSHOT = 10_000
+SNAPSHOTS_MANTIDOS = 3
+
+
+def validade_iso(valor):
+    """Converte date, 'dd/mm/aaaa' ou 'aaaa-mm-dd' para ISO; None se inválida."""
+    if isinstance(valor, date):
+        return valor.isoformat()
+    for formato in ("%d/%m/%Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(str(valor), formato).date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def _intervalo(numero_de=None, numero_ate=None):
+    return (MENOR_NUMERO if numero_de is None else int(numero_de),
+            MAIOR_NUMERO if numero_ate is None else int(numero_ate))
+
+
+def _filtros_faixas(produto_id=None, numero_de=None, numero_ate=None):
+    """WHERE para as faixas (alias ``f``) que têm unidades no intervalo de números."""
+    de, ate = _intervalo(numero_de, numero_ate)
+    condicoes, params = ["f.inicio <= ?", "f.fim >= ?"], [ate, de]
+    if produto_id is not None:
+        condicoes.append("f.produto_id = ?")
+        params.append(produto_id)
+    return f"WHERE {' AND '.join(condicoes)}", params
+
+
+def _filtros_situacoes(produto_id=None, status=None, numero_de=None, numero_ate=None):
+    """WHERE para as situações (``s``) unidas às suas faixas (``f``)."""
+    de, ate = _intervalo(numero_de, numero_ate)
+    condicoes, params = ["s.numero BETWEEN ? AND ?"], [de, ate]
+    if produto_id is not None:
+        condicoes.append("f.produto_id = ?")
+        params.append(produto_id)
+    if status is not None:
+        condicoes.append("s.status = ?")
+        params.append(status)
+    return f"WHERE {' AND '.join(condicoes)}", params
+
+
+def _faixa(row):
+    return FaixaUnidades(row["inicio"], row["fim"], row["produto_id"], row["validade"],
+                         row["lote"], row["data_cadastro"])
+
+
+class BancoEstoque:
+    """Produtos, unidades, pedidos e leituras persistidos em um arquivo SQLite.
+
+    Uma instância é compartilhada por todas as sessões (estações) do
+    processo. Cada operação usa uma conexão própria de um pool: leituras
+    rodam em paralelo (WAL) e escritas são serializadas pelo próprio SQLite
+    com ``BEGIN IMMEDIATE``, o que também vale entre processos. Os locks
+    Python só protegem os estados em memória, cada um com o seu.
+    """
+
+    def __init__(self, caminho=CAMINHO_PADRAO, produtos_iniciais=(), caminho_diario=None, pasta_snapshots=None):
+        self.caminho = caminho
+        self.diario = Diario(caminho_diario or os.environ.get("CAMDA_DIARIO") or caminho + ".diario.jsonl")
+        self.pasta_snapshots = pasta_snapshots or os.environ.get("CAMDA_SNAPSHOTS") or caminho + ".snapshots"
+        self._livres = queue.SimpleQueue()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._lock_colunar = threading.Lock()
+        self._lock_conferencias = threading.RLock()
+        self._lock_snapshot = threading.Lock()
+        self._seq_snapshot = 0
+        self.agregados = AgregadosEstoque(self._recalcular_agregados, self._seq_diario)
+        self.indice = IndiceUnidades(self._recalcular_indice, self._seq_diario)
+        self.validades = ContadoresValidade(self._calcular_vencimentos, self._seq_diario)
+        # Estados mantidos a cada transação confirmada, na ordem em que os seus locks são presos
+        self._derivados = (self.agregados, self.indice, self.validades)
+        self.catalogo = Catalogo()
+        self._versao_produtos = None
+        with self._conexao() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(ESQUEMA)
+        with self._transacao() as cur:
+            self._migrar_unidades(cur)
+            self._migrar_situacoes(cur)
+            # Banco novo sobre um diário existente (ex.: após perder o arquivo) continua a numeração
+            cur.execute("INSERT OR IGNORE INTO meta (chave, valor) VALUES ('diario', ?)", (self.diario.ultimo_seq(),))
+            cur.execute("INSERT OR IGNORE INTO meta (chave, valor) VALUES ('versao_unidades', 0), ('versao_produtos', 0)")
+            novo = cur.execute("SELECT 1 FROM meta WHERE chave = 'proximo_numero'").fetchone() is None
+            if novo:
+                cur.execute("INSERT INTO meta (chave, valor) VALUES ('proximo_numero', 1)")
+                self._executar(cur, "produtos", list(produtos_iniciais))
+        self._carregar_catalogo()
+        self._conferencias = {}
+        self._colunar = None
+        snapshots = listar_snapshots(self.pasta_snapshots)
+        self._seq_snapshot = snapshots[-1][0] if snapshots else self.gravar_snapshot()
+
+    def _abrir(self):
+        conn = sqlite3.connect(self.caminho, timeout=ESPERA_ESCRITA_S, isolation_level=None,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _conexao(self):
+        """Empresta uma conexão do pool (abre outra se todas estiverem em uso)."""
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            conn = self._abrir()
+        try:
+            yield conn
+        finally:
+            self._livres.put(conn)
+
+    @contextmanager
+    def _transacao(self):
+        """Transação de escrita; ``BEGIN IMMEDIATE`` pega o lock de escrita já no início."""
+        with self._conexao() as conn:
+            cur = conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            self._local.primeiro_seq = None
+            self._local.mudancas = {derivado: [] for derivado in self._derivados}
+            try:
+                yield cur
+            except BaseException:
+                cur.execute("ROLLBACK")
+                self._local.seq = None
+                raise
+            if getattr(self._local, "seq", None) is None:
+                cur.execute("COMMIT")
+            else:
+                primeiro, ultimo, mudancas = self._local.primeiro_seq, self._local.seq, self._local.mudancas
+                with ExitStack() as confirmacoes:
+                    for derivado in self._derivados:
+                        confirmacoes.enter_context(derivado.confirmando(
+                            primeiro, ultimo, None if mudancas is None else mudancas[derivado]))
+                    cur.execute("COMMIT")
+        seq, self._local.seq = getattr(self._local, "seq", None), None
+        if seq is not None and seq - self._seq_snapshot >= EVENTOS_POR_SNAPSHOT:
+            threading.Thread(target=self._snapshot_automatico, name="camda-snapshot", daemon=True).start()
+
+    def _consultar(self, sql, params=()):
+        with self._conexao() as conn:
+            return [dict(r) for r in conn.execute(sql, params)]
+
+    def _escalar(self, sql, params=()):
+        with self._conexao() as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def _linhas(self, sql, params=()):
+        with self._conexao() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def _executar(self, cur, tipo, dados):
+        """Aplica um evento ao banco e o acrescenta ao diário, na transação ``cur``."""
+        resultado = self._aplicar_evento(cur, tipo, dados)
+        self._local.seq = cur.execute(
+            "UPDATE meta SET valor = valor + 1 WHERE chave = 'diario' RETURNING valor").fetchone()[0]
+        if self._local.primeiro_seq is None:
+            self._local.primeiro_seq = self._local.seq
+        self.diario.acrescentar(self._local.seq, tipo, dados)
+        return resultado
+
+    def _aplicar_evento(self, cur, tipo, dados):
+        """A escrita de cada tipo de evento; a mesma na operação original e ao reaplicar o diário."""
+        if tipo == "produtos":
+            inseridos = self._inserir_produtos(cur, dados)
+            if inseridos:
+                self._versao_mudou(cur, "versao_produtos")
+            return inseridos
+        if tipo == "cadastro":
+            self._aplicar_cadastro(cur, dados)
+        elif tipo == "cadastros":
+            for faixa in dados:
+                self._aplicar_cadastro(cur, faixa)
+        elif tipo == "pedido":
+            cur.execute("INSERT INTO pedidos (id, cliente, itens, data, status) VALUES (?, ?, ?, ?, ?)",
+                        (dados.get("id"), dados["cliente"], json.dumps(dados["itens"]), dados["data"],
+                         dados["status"]))
+            dados["id"] = cur.lastrowid
+        elif tipo == "conferencia":
+            cur.executemany("INSERT INTO conferencias (pedido_id, numero, produto_id, horario) VALUES (?, ?, ?, ?)",
+                            [(dados["pedido_id"], *l) for l in dados["leituras"]])
+        elif tipo == "leituras":
+            cur.executemany("INSERT INTO leituras (numero, produto_id, nome, horario) VALUES (?, ?, ?, ?)",
+                            dados)
+        elif tipo == "limpar_leituras":
+            cur.execute("DELETE FROM leituras")
+        elif tipo == "expedicao":
+            return self._aplicar_expedicao(cur, dados)
+        else:
+            raise ValueError(f"Evento desconhecido no diário: {tipo}")
+
+    def _aplicar_cadastro(self, cur, dados):
+        """Grava uma faixa cadastrada e avança ``proximo_numero`` até depois dela."""
+        cur.execute("INSERT INTO faixas (inicio, fim, produto_id, validade, lote, data_cadastro) "
+                    "VALUES (:inicio, :fim, :produto_id, :validade, :lote, :data_cadastro)", dados)
+        cur.execute("UPDATE meta SET valor = MAX(valor, ?) WHERE chave = 'proximo_numero'", (dados["fim"] + 1,))
+        self._versao_mudou(cur, "versao_unidades")
+        quantidade = dados["fim"] - dados["inicio"] + 1
+        validade = date.fromisoformat(dados["validade"]) if dados["validade"] else None
+        self._anotar(self.agregados, ((dados["produto_id"], dados["lote"], EM_ESTOQUE), quantidade))
+        self._anotar(self.validades, (validade, quantidade))
+        self._anotar(self.indice, ("cadastro", FaixaUnidades(
+            dados["inicio"], dados["fim"], dados["produto_id"],
+            validade.strftime("%d/%m/%Y") if validade else None, dados["lote"], dados["data_cadastro"])))
+
+    def _anotar(self, derivado, mudanca):
+        """Anota uma mudança num dos ``_derivados``, aplicada quando a transação for confirmada."""
+        mudancas = getattr(self._local, "mudancas", None)
+        if mudancas is not None:
+            mudancas[derivado].append(mudanca)
+
+    @staticmethod
+    def _versao_mudou(cur, chave):
+        """Incrementa um contador de versão em ``meta``; fica no banco, então vale entre processos."""
+        cur.execute("UPDATE meta SET valor = valor + 1 WHERE chave = ?", (chave,))
+
+    @property
+    def versao(self):
+        """Versão das unidades: muda a cada cadastro, expedição ou restauração, de qualquer processo."""
+        return self._escalar("SELECT valor FROM meta WHERE chave = 'versao_unidades'")
+
+    def fechar(self):
+        while True:
+            try:
+                self._livres.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # ---------------- Produtos ----------------
+    @staticmethod
+    def _inserir_produtos(cur, produtos):
+        antes = cur.execute("SELECT COUNT(*) FROM produtos").fetchone()[0]
+        cur.executemany(
+            "INSERT OR IGNORE INTO produtos (id, nome, volume, categoria) VALUES (?, ?, ?, ?)",
+            [(p["id"], p["nome"], p["volume"], p["categoria"]) for p in produtos]
+        )
+        return cur.execute("SELECT COUNT(*) FROM produtos").fetchone()[0] - antes
+
+    def adicionar_produtos(self, produtos):
+        """Insere os produtos novos em uma única transação; retorna quantos entraram."""
+        produtos = [p for p in produtos if p["id"] not in self.catalogo]
+        with self._transacao() as cur:
+            count = self._executar(cur, "produtos", produtos)
+        with self._lock:
+            self.catalogo.adicionar_varios(produtos)
+        return count
+
+    def _carregar_catalogo(self):
+        """Troca o catálogo em memória pelos produtos do banco, com a versão em que foram lidos."""
+        with self._conexao() as conn:
+            conn.execute("BEGIN")
+            try:
+                versao = conn.execute("SELECT valor FROM meta WHERE chave = 'versao_produtos'").fetchone()[0]
+                produtos = [dict(r) for r in conn.execute("SELECT id, nome, volume, categoria FROM produtos ORDER BY rowid")]
+            finally:
+                conn.execute("COMMIT")
+        with self._lock:
+            self.catalogo.substituir(produtos)
+            self._versao_produtos = versao
+
+    def sincronizar(self):
+        """Recarrega o catálogo se outro processo mudou os produtos; custa uma leitura de ``meta``.
+
+        As unidades, contagens e vencimentos se atualizam sozinhos na
+        leitura; o catálogo é lido direto pelas páginas e pela API, que
+        chamam isto no início de cada execução/requisição.
+        """
+        if self._escalar("SELECT valor FROM meta WHERE chave = 'versao_produtos'") != self._versao_produtos:
+            self._carregar_catalogo()
+
+    # ---------------- Unidades ----------------
+    @staticmethod
+    def _inserir_faixas(cur, faixas, situacoes):
+        """Grava faixas (validade em ISO) e as situações das unidades que estão nelas."""
+        cur.executemany(
+            "INSERT INTO faixas (inicio, fim, produto_id, validade, lote, data_cadastro) VALUES (?, ?, ?, ?, ?, ?)",
+            [(f.inicio, f.fim, f.produto_id, f.validade, f.lote, f.data_cadastro) for f in faixas]
+        )
+        faixas = sorted(faixas, key=lambda f: f.inicio)
+        inicios = [f.inicio for f in faixas]
+        linhas = []
+        for numero, status in situacoes:
+            i = bisect_right(inicios, numero) - 1
+            if i >= 0 and numero in faixas[i] and status != EM_ESTOQUE:
+                linhas.append((numero, faixas[i].inicio, status))
+        cur.executemany("INSERT OR REPLACE INTO situacoes (numero, faixa, status) VALUES (?, ?, ?)", linhas)
+
+    def _migrar_unidades(self, cur):
+        """Converte a tabela antiga de uma linha por unidade em faixas."""
+        existe = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'unidades'").fetchone()
+        if existe is None:
+            return
+        colunas = ("numero", "produto_id", "validade", "lote", "data_cadastro", "status")
+        unidades = [dict(zip(colunas, row)) for row in cur.execute(f"SELECT {', '.join(colunas)} FROM unidades")]
+        self._inserir_faixas(cur, *comprimir(unidades))
+        cur.execute("DROP TABLE unidades")
+
+    @staticmethod
+    def _migrar_situacoes(cur):
+        """Acrescenta horário e pedido da expedição às situações de bancos anteriores a eles."""
+        colunas = {row[1] for row in cur.execute("PRAGMA table_info(situacoes)")}
+        for coluna, tipo in (("horario", "TEXT"), ("pedido_id", "INTEGER")):
+            if coluna not in colunas:
+                cur.execute(f"ALTER TABLE situacoes ADD COLUMN {coluna} {tipo}")
+
+    def proximo_numero(self):
+        return self._escalar("SELECT valor FROM meta WHERE chave = 'proximo_numero'")
+
+    def cadastrar_unidades(self, produto_id, quantidade, validade, lote):
+        """Reserva ``quantidade`` números e grava o cadastro como uma única faixa."""
+        return self.cadastrar_lote([(produto_id, quantidade, validade, lote)])[0]
+
+    def cadastrar_lote(self, cadastros):
+        """Cadastra vários (produto_id, quantidade, validade, lote) numa única transação e evento.
+
+        As faixas saem contíguas, na ordem de ``cadastros``; se algo
+        falhar, nenhuma fica gravada. Retorna a lista de ``FaixaUnidades``.
+        """
+        data_cadastro = datetime.now().strftime("%d/%m/%Y %H:%M")
+        faixas = []
+        with self._transacao() as cur:
+            inicio = cur.execute("SELECT valor FROM meta WHERE chave = 'proximo_numero'").fetchone()[0]
+            for produto_id, quantidade, validade, lote in cadastros:
+                faixas.append({"inicio": inicio, "fim": inicio + quantidade - 1, "produto_id": produto_id,
+                               "validade": validade_iso(validade), "lote": lote, "data_cadastro": data_cadastro})
+                inicio += quantidade
+            self._executar(cur, "cadastros", faixas)
+        return [FaixaUnidades(f["inicio"], f["fim"], f["produto_id"],
+                              date.fromisoformat(f["validade"]).strftime("%d/%m/%Y") if f["validade"] else None,
+                              f["lote"], data_cadastro) for f in faixas]
+
+    def _situacoes_da_faixa(self, inicio):
+        return dict(self._linhas("SELECT numero, status FROM situacoes WHERE faixa = ?", (inicio,)))
+
+    def buscar_unidade(self, numero):
+        """A unidade pelo ``indice`` em memória; None se o número não existe."""
+        if numero is None:
+            return None
+        return self.indice.buscar(int(numero))
+
+    def contar_unidades(self, status=None, **filtros):
+        """Conta pelas faixas; só as unidades com situação própria são contadas uma a uma.
+
+        Sem filtros de número, a contagem sai dos ``agregados``.
+        """
+        if filtros.get("numero_de") is None and filtros.get("numero_ate") is None:
+            if filtros.get("produto_id") is None:
+                return self.agregados.total(status)
+            return self.agregados.por_produto(status).get(filtros["produto_id"], 0)
+        de, ate = _intervalo(filtros.get("numero_de"), filtros.get("numero_ate"))
+        if status is None or status == EM_ESTOQUE:
+            where, params = _filtros_faixas(**filtros)
+            total = self._escalar(
+                f"SELECT COALESCE(SUM(MIN(f.fim, ?) - MAX(f.inicio, ?) + 1), 0) FROM faixas f {where}",
+                [ate, de] + params)
+            if status is None:
+                return total
+        where, params = _filtros_situacoes(status=None if status == EM_ESTOQUE else status, **filtros)
+        fora = self._escalar(
+            f"SELECT COUNT(*) FROM situacoes s JOIN faixas f ON f.inicio = s.faixa {where}", params)
+        return total - fora if status == EM_ESTOQUE else fora
+
+    def _faixas_em_ordem(self, recentes_primeiro=False, **filtros):
+        """Faixas filtradas lidas do banco em blocos, para quem só precisa das primeiras."""
+        where, params = _filtros_faixas(**filtros)
+        ordem, comparacao = ("DESC", "<") if recentes_primeiro else ("ASC", ">")
+        ultima = None
+        while True:
+            continuacao, extra = ("", []) if ultima is None else (f" AND f.inicio {comparacao} ?", [ultima])
+            rows = self._consultar(
+                f"SELECT {COLUNAS_FAIXA} FROM faixas f {where}{continuacao} ORDER BY inicio {ordem} LIMIT ?",
+                params + extra + [BLOCO_FAIXAS])
+            yield from rows
+            if len(rows) < BLOCO_FAIXAS:
+                return
+            ultima = rows[-1]["inicio"]
+
+    def _expandir(self, recentes_primeiro=False, status=None, **filtros):
+        de, ate = _intervalo(filtros.get("numero_de"), filtros.get("numero_ate"))
+        if status is not None and status != EM_ESTOQUE:
+            # Só existem como situação própria: dispensa expandir as faixas
+            where, params = _filtros_situacoes(status=status, **filtros)
+            sql = (f"SELECT s.numero, s.status, {COLUNAS_FAIXA} FROM situacoes s "
+                   f"JOIN faixas f ON f.inicio = s.faixa {where} ORDER BY s.numero")
+            for row in self._consultar(sql + (" DESC" if recentes_primeiro else ""), params):
+                yield _faixa(row).unidade(row["numero"], row["status"])
+            return
+        for row in self._faixas_em_ordem(recentes_primeiro, **filtros):
+            faixa = _faixa(row)
+            situacoes = self._situacoes_da_faixa(faixa.inicio)
+            numeros = range(max(faixa.inicio, de), min(faixa.fim, ate) + 1)
+            for numero in (reversed(numeros) if recentes_primeiro else numeros):
+                situacao = situacoes.get(numero, EM_ESTOQUE)
+                if status is None or situacao == status:
+                    yield faixa.unidade(numero, situacao)
+
+    def listar_unidades(self, limite=None, recentes_primeiro=False, **filtros):
+        """Unidades expandidas das faixas, parando em ``limite``."""
+        unidades = self._expandir(recentes_primeiro=recentes_primeiro, **filtros)
+        return list(unidades if limite is None else islice(unidades, int(limite)))
+
+    def listar_faixas(self, **filtros):
+        """Faixas com unidades no intervalo, sem expandir (filtros de produto e números)."""
+        where, params = _filtros_faixas(**filtros)
+        return [_faixa(row) for row in self._consultar(f"SELECT {COLUNAS_FAIXA} FROM faixas f {where} ORDER BY inicio",
+                                                       params)]
+
+    def faixas_em_blocos(self, faixas_por_bloco=4 * BLOCO_FAIXAS):
+        """Todas as faixas (validade em ISO) em blocos, por ordem de número, para quem não quer tudo na memória.
+
+        Cada bloco vem com as situações (numero, status) das suas unidades,
+        ordenadas por número. Tudo é lido na mesma transação de leitura.
+        """
+        with self._conexao() as conn:
+            conn.execute("BEGIN")
+            try:
+                ultima = MENOR_NUMERO - 1
+                while True:
+                    faixas = [dict(r) for r in conn.execute(
+                        "SELECT inicio, fim, produto_id, validade, lote, data_cadastro FROM faixas "
+                        "WHERE inicio > ? ORDER BY inicio LIMIT ?", (ultima, faixas_por_bloco))]
+                    if not faixas:
+                        return
+                    situacoes = [tuple(r) for r in conn.execute(
+                        "SELECT numero, status FROM situacoes WHERE numero BETWEEN ? AND ? ORDER BY numero",
+                        (faixas[0]["inicio"], faixas[-1]["fim"]))]
+                    yield faixas, situacoes
+                    ultima = faixas[-1]["inicio"]
+            finally:
+                conn.execute("COMMIT")
+
+    def unidades_colunares(self):
+        """Todas as unidades em colunas (``UnidadesColunares``); refeitas só quando ``versao`` muda."""
+        from estoque.colunar import UnidadesColunares
+
+        with self._lock_colunar:
+            versao = self.versao
+            if self._colunar is None or self._colunar[0] != versao:
+                with medir("tabela_colunar") as medicao:
+                    faixas = self._consultar(
+                        "SELECT inicio, fim, produto_id, validade, lote, data_cadastro FROM faixas ORDER BY inicio")
+                    situacoes = [tuple(r) for r in self._linhas("SELECT numero, status FROM situacoes")]
+                    self._colunar = (versao, UnidadesColunares.de_faixas(faixas, situacoes))
+                    medicao.tamanho = self._colunar[1].memoria()
+            return self._colunar[1]
+
+    def faixa_numeros(self, **filtros):
+        """(menor, maior) número entre as unidades filtradas; (None, None) se não houver."""
+        primeira = next(self._expandir(**filtros), None)
+        ultima = next(self._expandir(recentes_primeiro=True, **filtros), None)
+        if primeira is None:
+            return None, None
+        return primeira["numero"], ultima["numero"]
+
+    def contagem_por_produto(self, status=None):
+        """{produto_id: quantidade}, dos ``agregados`` (sem consultar as faixas)."""
+        return self.agregados.por_produto(status)
+
+    def _seq_diario(self):
+        return self._escalar("SELECT valor FROM meta WHERE chave = 'diario'")
+
+    def _recalcular_agregados(self):
+        """(seq do diário, {(produto_id, lote, status): quantidade}) agregados no banco, numa só leitura."""
+        contagens = {}
+        with self._conexao() as conn:
+            conn.execute("BEGIN")
+            try:
+                seq = conn.execute("SELECT valor FROM meta WHERE chave = 'diario'").fetchone()[0]
+                for produto_id, lote, quantidade in conn.execute(
+                        "SELECT produto_id, lote, SUM(fim - inicio + 1) FROM faixas GROUP BY produto_id, lote"):
+                    contagens[produto_id, lote, EM_ESTOQUE] = quantidade
+                for produto_id, lote, status, quantidade in conn.execute(
+                        "SELECT f.produto_id, f.lote, s.status, COUNT(*) FROM situacoes s "
+                        "JOIN faixas f ON f.inicio = s.faixa GROUP BY f.produto_id, f.lote, s.status"):
+                    contagens[produto_id, lote, EM_ESTOQUE] -= quantidade
+                    contagens[produto_id, lote, status] = contagens.get((produto_id, lote, status), 0) + quantidade
+            finally:
+                conn.execute("COMMIT")
+        return seq, {chave: quantidade for chave, quantidade in contagens.items() if quantidade}
+
+    def _recalcular_indice(self):
+        """(seq do diário, faixas em ordem, {numero: (status, horario, pedido_id)}) lidos numa só leitura."""
+        with self._conexao() as conn:
+            conn.execute("BEGIN")
+            try:
+                seq = conn.execute("SELECT valor FROM meta WHERE chave = 'diario'").fetchone()[0]
+                faixas = [_faixa(row) for row in conn.execute(f"SELECT {COLUNAS_FAIXA} FROM faixas ORDER BY inicio")]
+                situacoes = {numero: (status, horario, pedido_id) for numero, status, horario, pedido_id in
+                             conn.execute("SELECT numero, status, horario, pedido_id FROM situacoes")}
+            finally:
+                conn.execute("COMMIT")
+        return seq, faixas, situacoes
+
+    def _recontar_unidades(self):
+        """{(produto_id, lote, status): quantidade} expandindo todas as unidades, sem usar agregação do banco."""
+        import numpy as np
+
+        from estoque.colunar import UnidadesColunares
+
+        colunas = UnidadesColunares.de_faixas(
+            self._consultar("SELECT inicio, fim, produto_id, validade, lote, data_cadastro FROM faixas ORDER BY inicio"),
+            [tuple(r) for r in self._linhas("SELECT numero, status FROM situacoes")])
+        categorias = (colunas.produto_id, colunas.lote, colunas.status)
+        chaves, quantidades = np.unique(np.stack([c.codes.astype(np.int64) for c in categorias]), axis=1,
+                                        return_counts=True)
+        return {tuple(c.categories[i] for c, i in zip(categorias, chave)): int(quantidade)
+                for chave, quantidade in zip(chaves.T.tolist(), quantidades.tolist())}
+
+    def verificar_agregados(self):
+        """Confere os ``agregados`` com uma recontagem do zero; {chave: (mantida, recontada)} das diferenças.
+
+        Vazio quando tudo bate. As escritas deste processo esperam a conferência terminar.
+        """
+        return self.agregados.verificar(self._recontar_unidades)
+
+    @staticmethod
+    def _contar_em_estoque(conn, condicao, params):
+        """Unidades em estoque nas faixas que atendem ``condicao`` (sobre ``f``)."""
+        total = conn.execute(
+            f"SELECT COALESCE(SUM(f.fim - f.inicio + 1), 0) FROM faixas f WHERE {condicao}", params).fetchone()[0]
+        fora = conn.execute(
+            f"SELECT COUNT(*) FROM situacoes s JOIN faixas f ON f.inicio = s.faixa WHERE {condicao}",
+            params).fetchone()[0]
+        return total - fora
+
+    def _calcular_vencimentos(self, hoje):
+        """(seq do diário, vencidas, vencem em até ``DIAS_ALERTA`` dias) numa só leitura."""
+        limite = hoje + timedelta(days=DIAS_ALERTA)
+        with self._conexao() as conn:
+            conn.execute("BEGIN")
+            try:
+                seq = conn.execute("SELECT valor FROM meta WHERE chave = 'diario'").fetchone()[0]
+                vencidos = self._contar_em_estoque(conn, "f.validade < ?", (hoje.isoformat(),))
+                proximos = self._contar_em_estoque(conn, "f.validade >= ? AND f.validade <= ?",
+                                                   (hoje.isoformat(), limite.isoformat()))
+            finally:
+                conn.execute("COMMIT")
+        return seq, vencidos, proximos
+
+    def contar_vencimentos(self, hoje=None):
+        """(vencidas, vencem em até 30 dias) entre as unidades em estoque.
+
+        Consulta o banco uma vez por dia, ou quando outro processo escreveu;
+        no resto do tempo lê os contadores mantidos a cada cadastro/saída.
+        """
+        return self.validades.obter(hoje)
+
+    # ---------------- Pedidos ----------------
+    def salvar_pedido(self, cliente, itens):
+        pedido = {"cliente": cliente, "itens": itens,
+                  "data": datetime.now().strftime("%d/%m/%Y %H:%M"), "status": "pendente"}
+        with self._transacao() as cur:
+            self._executar(cur, "pedido", pedido)
+        return pedido
+
+    def listar_pedidos(self, status=None):
+        sql = "SELECT id, cliente, itens, data, status FROM pedidos"
+        params = ()
+        if status is not None:
+            sql += " WHERE status = ?"
+            params = (status,)
+        pedidos = self._consultar(sql + " ORDER BY id", params)
+        for p in pedidos:
+            p["itens"] = json.loads(p["itens"])
+        return pedidos
+
+    def conferencia(self, pedido_id):
+        """Conferência do pedido, montada do banco na primeira consulta e mantida em memória.
+
+        É remontada se o banco tiver outras leituras conferidas que ela (de outro processo).
+        """
+        with self._lock_conferencias:
+            conferencia = self._conferencias.get(pedido_id)
+            if conferencia is not None and len(conferencia.numeros) != self._escalar(
+                    "SELECT COUNT(*) FROM conferencias WHERE pedido_id = ?", (pedido_id,)):
+                del self._conferencias[pedido_id]
+            if pedido_id not in self._conferencias:
+                rows = self._linhas("SELECT itens FROM pedidos WHERE id = ?", (pedido_id,))
+                if not rows:
+                    raise KeyError(pedido_id)
+                conferencia = ConferenciaPedido(json.loads(rows[0][0]))
+                for numero, produto_id in self._linhas(
+                        "SELECT numero, produto_id FROM conferencias WHERE pedido_id = ?", (pedido_id,)):
+                    conferencia.registrar(numero, produto_id)
+                self._conferencias[pedido_id] = conferencia
+            return self._conferencias[pedido_id]
+
+    def conferir(self, pedido_id, leituras):
+        """Registra leituras (dicts como os de ``registrar_leituras``) na conferência do pedido.
+
+        Retorna o resultado de cada leitura (aceita, duplicada, sem número,
+        unidade desconhecida, já expedida); só as aceitas são gravadas. O
+        produto de cada unidade vem do ``indice``, não do QR. Levanta
+        ``ValueError`` se o pedido já foi expedido.
+        """
+        with self._lock_conferencias:
+            with self._conexao() as conn:
+                self._exigir_pendente(conn, pedido_id)
+            conferencia = self.conferencia(pedido_id)
+            resultados, aceitas = [], []
+            numeros = [l.get("numero") for l in leituras]
+            alertas = self._alertas(numeros)
+            produtos = self.indice.produtos(n for n in numeros if n is not None and n not in alertas)
+            for l in leituras:
+                numero = l.get("numero")
+                produto_id = produtos.get(numero, l.get("produto_id"))
+                resultado = alertas.get(numero) or conferencia.registrar(numero, produto_id)
+                resultados.append(resultado)
+                if resultado == ACEITA:
+                    aceitas.append((numero, produto_id, l["horario"]))
+            try:
+                if aceitas:
+                    with self._transacao() as cur:
+                        self._exigir_pendente(cur, pedido_id)
+                        self._executar(cur, "conferencia", {"pedido_id": pedido_id, "leituras": aceitas})
+            except BaseException:
+                # Descarta o estado em memória; será remontado do banco
+                self._conferencias.pop(pedido_id, None)
+                raise
+        return resultados
+
+    def confirmar_pedido(self, pedido_id, parcial=False):
+        """Expede de uma vez todas as unidades conferidas do pedido e o marca como expedido.
+
+        Levanta ``ValueError`` se o pedido já foi expedido, se houver
+        unidades a mais ou fora do pedido, ou se faltarem unidades (a não
+        ser com ``parcial``, que só admite faltas).
+        Retorna o resultado de ``expedir``.
+        """
+        with self._lock_conferencias:
+            conferencia = self.conferencia(pedido_id)
+            if conferencia.excedentes or conferencia.inesperados:
+                raise ValueError(f"A conferência do pedido {pedido_id} tem unidades a mais ou fora do pedido")
+            if not (parcial or conferencia.completa):
+                raise ValueError(f"A conferência do pedido {pedido_id} não está completa")
+            return self.expedir(sorted(conferencia.numeros), pedido_id=pedido_id, concluir=True)
+
+    @staticmethod
+    def _exigir_pendente(conn, pedido_id):
+        """Levanta ``ValueError`` se o pedido já foi expedido (``conn`` pode ser o cursor da transação)."""
+        row = conn.execute("SELECT status FROM pedidos WHERE id = ?", (pedido_id,)).fetchone()
+        if row is not None and row[0] == EXPEDIDO:
+            raise ValueError(f"O pedido {pedido_id} já foi expedido")
+
+    # ---------------- Expedição ----------------
+    def _alertas(self, numeros):
+        """{numero: DESCONHECIDA ou JA_EXPEDIDA} dos números que o ``indice`` barra; os demais ficam de fora."""
+        situacoes = self.indice.situacoes({n for n in numeros if n is not None})
+        return {numero: DESCONHECIDA if situacao is None else JA_EXPEDIDA
+                for numero, situacao in situacoes.items() if situacao is None or situacao == EXPEDIDO}
+
+    def _aplicar_expedicao(self, cur, dados):
+        """Marca os ``numeros`` do evento como expedidos; retorna [(numero, validade ISO, status anterior)] dos que mudaram.
+
+        Cada número acha a sua faixa pela chave primária, num único SELECT;
+        os que não existem ou já foram expedidos ficam de fora.
+        """
+        linhas = [tuple(row) for row in cur.execute(
+            "SELECT j.value, f.inicio, f.produto_id, f.lote, f.validade, COALESCE(s.status, ?) FROM json_each(?) j "
+            "JOIN faixas f ON f.inicio = (SELECT MAX(inicio) FROM faixas WHERE inicio <= j.value) AND f.fim >= j.value "
+            "LEFT JOIN situacoes s ON s.numero = j.value", (EM_ESTOQUE, json.dumps(dados["numeros"])))]
+        linhas = [linha for linha in linhas if linha[5] != EXPEDIDO]
+        horario, pedido_id = dados["horario"], dados.get("pedido_id")
+        cur.executemany("INSERT OR REPLACE INTO situacoes (numero, faixa, status, horario, pedido_id) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [(numero, faixa, EXPEDIDO, horario, pedido_id) for numero, faixa, *_ in linhas])
+        if dados.get("concluir"):
+            cur.execute("UPDATE pedidos SET status = ? WHERE id = ?", (EXPEDIDO, pedido_id))
+        saidas = Counter((produto_id, lote, status) for _, _, produto_id, lote, _, status in linhas)
+        for (produto_id, lote, status), quantidade in saidas.items():
+            self._anotar(self.agregados, ((produto_id, lote, status), -quantidade))
+            self._anotar(self.agregados, ((produto_id, lote, EXPEDIDO), quantidade))
+        for validade, quantidade in Counter(l[4] for l in linhas if l[5] == EM_ESTOQUE).items():
+            self._anotar(self.validades, (date.fromisoformat(validade) if validade else None, -quantidade))
+        self._anotar(self.indice, ("situacoes", [(numero, EXPEDIDO, horario, pedido_id) for numero, *_ in linhas]))
+        if linhas:
+            self._versao_mudou(cur, "versao_unidades")
+        return [(numero, validade, status) for numero, _, _, _, validade, status in linhas]
+
+    def expedir(self, numeros, pedido_id=None, horario=None, concluir=False):
+        """Marca as unidades como expedidas numa única transação (um evento, um INSERT em lote).
+
+        Com ``concluir`` o pedido ``pedido_id`` também passa a expedido
+        (``ValueError`` se ele já estava).
+        Retorna {numero: EXPEDIDA, JA_EXPEDIDA ou DESCONHECIDA}.
+        """
+        numeros = list(dict.fromkeys(int(n) for n in numeros))
+        resultados = self._alertas(numeros)
+        pendentes = [n for n in numeros if n not in resultados]
+        if not pendentes and not concluir:
+            return resultados
+        evento = {"pedido_id": pedido_id, "horario": horario or datetime.now().strftime("%d/%m/%Y %H:%M"),
+                  "numeros": pendentes, "concluir": concluir}
+        with self._transacao() as cur:
+            if concluir:
+                # Checado com o lock de escrita: dois processos não concluem o mesmo pedido
+                self._exigir_pendente(cur, pedido_id)
+            expedidas = self._executar(cur, "expedicao", evento)
+        # O índice pode estar atrás de outro processo: o que a transação não mudou já tinha saído
+        resultados.update(dict.fromkeys(pendentes, JA_EXPEDIDA))
+        resultados.update((numero, EXPEDIDA) for numero, _, _ in expedidas)
+        return resultados
+
+    # ---------------- Leituras ----------------
+    def registrar_leituras(self, leituras):
+        """Grava as leituras; retorna {numero: DESCONHECIDA ou JA_EXPEDIDA} das que merecem alerta."""
+        with self._transacao() as cur:
+            self._executar(cur, "leituras",
+                           [(l.get("numero"), l.get("produto_id"), l.get("nome"), l["horario"]) for l in leituras])
+        return self._alertas(l.get("numero") for l in leituras)
+
+    def listar_leituras(self):
+        return self._consultar("SELECT numero, produto_id, nome, horario FROM leituras ORDER BY id")
+
+    def contar_leituras(self):
+        return self._escalar("SELECT COUNT(*) FROM leituras")
+
+    def leituras_por_produto(self):
+        rows = self._linhas("SELECT COALESCE(produto_id, ''), COUNT(*) FROM leituras GROUP BY produto_id")
+        return {pid: qtd for pid, qtd in rows}
+
+    def limpar_leituras(self):
+        with self._transacao() as cur:
+            self._executar(cur, "limpar_leituras", {})
+
+    # ---------------- Diário e snapshots ----------------
+    def _cabecalho_snapshot(self, conn):
+        seq, proximo = conn.execute(
+            "SELECT MAX(CASE WHEN chave = 'diario' THEN valor END), "
+            "MAX(CASE WHEN chave = 'proximo_numero' THEN valor END) FROM meta").fetchone()
+        return {"seq": seq, "proximo_numero": proximo}
+
+    def exportar_snapshot(self, saida):
+        """Grava o banco inteiro em ``saida`` (arquivo binário) como snapshot comprimido; retorna a sequência."""
+        with self._conexao() as conn:
+            # Uma transação de leitura: todas as tabelas vistas no mesmo instante
+            conn.execute("BEGIN")
+            try:
+                cabecalho = self._cabecalho_snapshot(conn)
+                escrever_snapshot(conn, saida, cabecalho)
+            finally:
+                conn.execute("COMMIT")
+        return cabecalho["seq"]
+
+    def _gravar_na_pasta(self, conn):
+        """Snapshot de ``conn`` na pasta de snapshots (arquivo temporário + rename)."""
+        os.makedirs(self.pasta_snapshots, exist_ok=True)
+        cabecalho = self._cabecalho_snapshot(conn)
+        destino = os.path.join(self.pasta_snapshots, nome_snapshot(cabecalho["seq"]))
+        with open(destino + ".tmp", "wb") as saida:
+            escrever_snapshot(conn, saida, cabecalho)
+        os.replace(destino + ".tmp", destino)
+        return cabecalho["seq"]
+
+    def gravar_snapshot(self):
+        """Tira um snapshot na pasta, apaga os que passaram de ``SNAPSHOTS_MANTIDOS`` e compacta o diário."""
+        with self._lock_snapshot:
+            with self._conexao() as conn:
+                conn.execute("BEGIN")
+                try:
+                    seq = self._gravar_na_pasta(conn)
+                finally:
+                    conn.execute("COMMIT")
+            self._seq_snapshot = max(self._seq_snapshot, seq)
+            snapshots = listar_snapshots(self.pasta_snapshots)
+            for _, caminho in snapshots[:-SNAPSHOTS_MANTIDOS]:
+                os.remove(caminho)
+            # O diário só precisa cobrir o que vem depois do snapshot mais antigo mantido
+            with self._transacao():
+                self.diario.compactar(snapshots[-SNAPSHOTS_MANTIDOS:][0][0])
+            return seq
+
+    def _snapshot_automatico(self):
+        if self._lock_snapshot.locked():
+            return  # outro snapshot já está sendo gravado
+        self.gravar_snapshot()
+
+    def _carregar_snapshot(self, cur, arquivo):
+        """Troca o conteúdo de todas as tabelas pelo do snapshot, bloco a bloco; retorna o cabeçalho."""
+        blocos = ler_snapshot(arquivo)
+        cabecalho = next(blocos)
+        for tabela in TABELAS_SNAPSHOT:
+            cur.execute(f"DELETE FROM {tabela}")
+        for tabela, colunas, linhas in blocos:
+            cur.executemany(f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+                            linhas)
+        cur.execute("UPDATE meta SET valor = ? WHERE chave = 'proximo_numero'", (int(cabecalho["proximo_numero"]),))
+        return cabecalho
+
+    def _concluir_restauracao(self, cur, origem):
+        """Registra a restauração no diário e tira o snapshot dela ainda com o lock de escrita.
+
+        Assim quem recuperar um ponto posterior parte desse snapshot, e não
+        precisa reaplicar a restauração.
+        """
+        atual = cur.execute("SELECT valor FROM meta WHERE chave = 'diario'").fetchone()[0]
+        # Depois de perder o banco o diário pode estar à frente do contador
+        ultimo = max(self.diario.ultimo_seq(), atual)
+        cur.execute("UPDATE meta SET valor = ? WHERE chave = 'diario'", (ultimo + 1,))
+        self._local.seq = ultimo + 1
+        self.diario.acrescentar(ultimo + 1, "restauracao", {"origem": origem})
+        self._versao_mudou(cur, "versao_unidades")
+        self._versao_mudou(cur, "versao_produtos")
+        # Tudo foi trocado: os estados derivados são recalculados
+        self._local.mudancas = None
+        self._seq_snapshot = self._gravar_na_pasta(cur.connection)
+
+    def _recarregar(self):
+        """Refaz os estados em memória depois de trocar o conteúdo do banco."""
+        self._carregar_catalogo()
+        with self._lock_conferencias:
+            self._conferencias.clear()
+        for derivado in self._derivados:
+            derivado.invalidar()
+
+    def restaurar_snapshot(self, arquivo):
+        """Substitui todo o banco pelo snapshot (caminho ou arquivo binário), lido em blocos."""
+        with self._transacao() as cur:
+            cabecalho = self._carregar_snapshot(cur, arquivo)
+            self._concluir_restauracao(cur, f"snapshot {cabecalho.get('criado', '')}".strip())
+        self._recarregar()
+
+    def recuperar(self, ate=None):
+        """Volta o banco ao estado logo após o evento ``ate`` do diário (o mais recente se None).
+
+        Carrega o último snapshot da pasta que não passa de ``ate`` e reaplica
+        os eventos seguintes do diário. Retorna a sequência recuperada.
+        """
+        snapshots = [(seq, caminho) for seq, caminho in listar_snapshots(self.pasta_snapshots)
+                     if ate is None or seq <= ate]
+        if not snapshots:
+            raise ValueError("Nenhum snapshot anterior a esse ponto")
+        seq_snapshot, caminho = snapshots[-1]
+        with self._transacao() as cur:
+            self._carregar_snapshot(cur, caminho)
+            recuperado = seq_snapshot
+            for evento in self.diario.eventos(depois_de=seq_snapshot, ate=ate):
+                if evento["tipo"] == "restauracao":
+                    raise ValueError(f"O evento {evento['seq']} é uma restauração sem snapshot na pasta")
+                self._aplicar_evento(cur, evento["tipo"], evento["dados"])
+                recuperado = evento["seq"]
+            self._concluir_restauracao(cur, f"recuperação até o evento {recuperado}")
+        self._recarregar()
+        return recuperado
+
+    def restaurar_backup(self, dados):
+        """Substitui produtos, unidades, pedidos e numeração pelo backup JSON dos formatos antigos.
+
+        Aceita backups com ``faixas`` ou com a lista de ``unidades``.
+        """
+        produtos = dados.get("produtos", [])
+        if "faixas" in dados:
+            faixas = [FaixaUnidades(int(f["inicio"]), int(f["fim"]), f["produto_id"], validade_iso(f.get("validade")),
+                                    f.get("lote", "N/I"), f.get("data_cadastro", "")) for f in dados["faixas"]]
+            situacoes = [(int(s["numero"]), s["status"]) for s in dados.get("situacoes", [])]
+        else:
+            faixas, situacoes = comprimir(
+                dict(u, validade=validade_iso(u.get("validade")), lote=u.get("lote", "N/I"),
+                     data_cadastro=u.get("data_cadastro", ""))
+                for u in dados.get("unidades", []))
+        with self._transacao() as cur:
+            for tabela in TABELAS_SNAPSHOT:
+                cur.execute(f"DELETE FROM {tabela}")
+            self._inserir_produtos(cur, produtos)
+            self._inserir_faixas(cur, faixas, situacoes)
+            cur.executemany(
+                "INSERT INTO pedidos (cliente, itens, data, status) VALUES (?, ?, ?, ?)",
+                [(p["cliente"], json.dumps(p.get("itens", [])), p.get("data", ""), p.get("status", "pendente"))
+                 for p in dados.get("pedidos", [])]
+            )
+            cur.execute("UPDATE meta SET valor = ? WHERE chave = 'proximo_numero'",
+                        (int(dados.get("proximo_numero", 1)),))
+            self._concluir_restauracao(cur, "backup JSON")
+        self._recarregar()
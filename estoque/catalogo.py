@@ -0,0 +1,94 @@
+"""
+Catálogo de produtos indexado pelo código do produto.
+"""
+
+COLUNAS_PRODUTO = ["id", "nome", "volume", "categoria"]
+
+# Produtos com que um banco novo começa
+PRODUTOS_PADRAO = [
+    {"id": "ENGEO20", "nome": "Inseticida Engeo Pleno S", "volume": "20L", "categoria": "Inseticida"},
+    {"id": "ACTARA5", "nome": "Inseticida Actara 750 SG", "volume": "5kg", "categoria": "Inseticida"},
+    {"id": "FRONDEO5", "nome": "Inseticida Frondeo", "volume": "5L", "categoria": "Inseticida"},
+    {"id": "SPERTO5", "nome": "Inseticida Sperto", "volume": "5kg", "categoria": "Inseticida"},
+    {"id": "PRIORI20", "nome": "Fungicida Priori Xtra", "volume": "20L", "categoria": "Fungicida"},
+    {"id": "REVERB5", "nome": "Fungicida Microbiológico Reverb", "volume": "5L", "categoria": "Fungicida"},
+    {"id": "ROUNDUP20", "nome": "Herbicida Roundup Transorb R", "volume": "20L", "categoria": "Herbicida"},
+    {"id": "GLIFO20", "nome": "Herbicida Glifosato 72 WG Alamos", "volume": "20kg", "categoria": "Herbicida"},
+    {"id": "AGEFIX20", "nome": "Óleo Mineral Agefix E8", "volume": "20L", "categoria": "Adjuvante"},
+    {"id": "ALTACOR5", "nome": "Inseticida Altacor", "volume": "5kg", "categoria": "Inseticida"},
+    {"id": "METOMIL20", "nome": "Inseticida Metomil 215 SL", "volume": "20L", "categoria": "Inseticida"},
+]
+
+
+class Catalogo:
+    """Produtos indexados por código, com mapas prontos para joins vetorizados.
+
+    Alterações montam um dict novo e trocam a referência, então quem estiver
+    iterando o catálogo em outra sessão continua vendo a versão anterior.
+    """
+
+    def __init__(self, produtos=()):
+        self._por_id = {}
+        self._mapas = {}
+        self.adicionar_varios(produtos)
+
+    def __len__(self):
+        return len(self._por_id)
+
+    def __iter__(self):
+        return iter(self._por_id.values())
+
+    def __contains__(self, produto_id):
+        return produto_id in self._por_id
+
+    def buscar(self, produto_id):
+        return self._por_id.get(produto_id)
+
+    def adicionar(self, produto):
+        """Adiciona o produto; retorna False se o código já existir."""
+        return self.adicionar_varios([produto]) == 1
+
+    def adicionar_varios(self, produtos):
+        por_id = dict(self._por_id)
+        for produto in produtos:
+            por_id.setdefault(produto["id"], produto)
+        count = len(por_id) - len(self._por_id)
+        if count:
+            self._por_id, self._mapas = por_id, {}
+        return count
+
+    def substituir(self, produtos):
+        por_id = {}
+        for produto in produtos:
+            por_id.setdefault(produto["id"], produto)
+        self._por_id, self._mapas = por_id, {}
+
+    def como_lista(self):
+        return list(self._por_id.values())
+
+    def opcoes(self, com_volume=False):
+        """Rótulos 'código - nome [volume]' para os seletores; refeitos só quando o catálogo muda."""
+        chave = ("opcoes", com_volume)
+        if chave not in self._mapas:
+            self._mapas[chave] = [
+                f"{p['id']} - {p['nome']} {p['volume']}" if com_volume else f"{p['id']} - {p['nome']}"
+                for p in self._por_id.values()
+            ]
+        return self._mapas[chave]
+
+    def como_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.como_lista(), columns=COLUNAS_PRODUTO)
+
+    def mapa(self, campo):
+        """Dicionário código -> campo, para uso com ``Series.map``."""
+        if campo not in self._mapas:
+            self._mapas[campo] = {pid: p.get(campo) for pid, p in self._por_id.items()}
+        return self._mapas[campo]
+
+    def nomes(self, produto_ids, padrao="?"):
+        """Resolve uma série de códigos para nomes de produto de uma só vez."""
+        import pandas as pd
+
+        return pd.Series(produto_ids).map(self.mapa("nome")).fillna(padrao)
@@ -0,0 +1,184 @@
+"""
+Unidades em colunas NumPy/pandas, para tabelas e relatórios grandes.
+
+Em vez de um dict de strings por unidade: números em int64, produto,
+lote, data de cadastro e status como categorias (códigos int8/int16) e a
+validade como ordinal do dia (int32, 0 = sem data). Um milhão de unidades
+ocupa poucos MB e vira DataFrame sem recriar as colunas.
+"""
+
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from estoque.faixas import EM_ESTOQUE
+
+SEM_DATA = 0
+CONSULTAS_GUARDADAS = 16
+ORDENACOES = ("numero", "produto_id", "validade", "lote", "status")
+
+
+def _ordinal(iso):
+    return date.fromisoformat(iso).toordinal() if iso else SEM_DATA
+
+
+def _categorias(valores, repeticoes):
+    codigos, categorias = pd.factorize(pd.Series(valores, dtype=object), use_na_sentinel=False)
+    return pd.Categorical.from_codes(np.repeat(codigos, repeticoes), categories=categorias)
+
+
+class UnidadesColunares:
+    """Colunas das unidades, ordenadas por número.
+
+    ``numero`` (int64), ``validade`` (ordinal int32) e as categorias
+    ``produto_id``, ``lote``, ``data_cadastro`` e ``status``.
+    """
+
+    __slots__ = ("numero", "produto_id", "validade", "lote", "data_cadastro", "status", "_consultas")
+
+    def __init__(self, numero, produto_id, validade, lote, data_cadastro, status):
+        self.numero = numero
+        self.produto_id = produto_id
+        self.validade = validade
+        self.lote = lote
+        self.data_cadastro = data_cadastro
+        self.status = status
+        # As colunas não mudam depois de criadas: consultas repetidas saem daqui
+        self._consultas = OrderedDict()
+
+    @classmethod
+    def de_faixas(cls, faixas, situacoes=()):
+        """Expande faixas (dicts com ``inicio``, ``fim`` e validade em ISO) sem laço por unidade.
+
+        ``faixas`` deve estar ordenada por ``inicio``; ``situacoes`` são
+        pares (numero, status) das unidades fora de estoque.
+        """
+        inicios = np.fromiter((f["inicio"] for f in faixas), dtype=np.int64, count=len(faixas))
+        fins = np.fromiter((f["fim"] for f in faixas), dtype=np.int64, count=len(faixas))
+        tamanhos = fins - inicios + 1
+        total = int(tamanhos.sum())
+        # Número = posição na saída + deslocamento da faixa onde a posição cai
+        deslocamentos = inicios - (np.cumsum(tamanhos) - tamanhos)
+        numero = np.arange(total, dtype=np.int64) + np.repeat(deslocamentos, tamanhos)
+        validade = np.repeat(np.fromiter((_ordinal(f["validade"]) for f in faixas), dtype=np.int32,
+                                         count=len(faixas)), tamanhos)
+
+        situacoes = list(situacoes)
+        nomes_status = [EM_ESTOQUE] + sorted({s for _, s in situacoes} - {EM_ESTOQUE})
+        codigos_status = np.zeros(total, dtype=np.int8)
+        if situacoes:
+            numeros = np.array([n for n, _ in situacoes], dtype=np.int64)
+            posicoes = np.searchsorted(numero, numeros).clip(max=max(total - 1, 0))
+            encontrados = numero[posicoes] == numeros if total else np.zeros(len(numeros), dtype=bool)
+            codigos = np.array([nomes_status.index(s) for _, s in situacoes], dtype=np.int8)
+            codigos_status[posicoes[encontrados]] = codigos[encontrados]
+
+        return cls(
+            numero=numero,
+            produto_id=_categorias([f["produto_id"] for f in faixas], tamanhos),
+            validade=validade,
+            lote=_categorias([f["lote"] for f in faixas], tamanhos),
+            data_cadastro=_categorias([f["data_cadastro"] for f in faixas], tamanhos),
+            status=pd.Categorical.from_codes(codigos_status, categories=nomes_status),
+        )
+
+    def __len__(self):
+        return len(self.numero)
+
+    def datas_validade(self, posicoes=slice(None)):
+        """Validade como datetime64[D], NaT onde não há data."""
+        ordinais = self.validade[posicoes]
+        datas = (ordinais.astype(np.int64) - date(1970, 1, 1).toordinal()).astype("datetime64[D]")
+        datas[ordinais == SEM_DATA] = np.datetime64("NaT")
+        return datas
+
+    def dias_restantes(self, hoje, posicoes=slice(None)):
+        """Dias até a validade (float, NaN onde não há data)."""
+        ordinais = self.validade[posicoes]
+        dias = (ordinais - hoje.toordinal()).astype(np.float64)
+        dias[ordinais == SEM_DATA] = np.nan
+        return dias
+
+    @staticmethod
+    def _igual(coluna, valor):
+        codigo = coluna.categories.get_indexer([valor])[0]
+        return coluna.codes == codigo if codigo >= 0 else np.zeros(len(coluna), dtype=bool)
+
+    def filtrar(self, produto_id=None, status=None, lote=None, validade_de=None, validade_ate=None,
+                numero_de=None, numero_ate=None):
+        """Posições das unidades que atendem a todos os filtros informados."""
+        mascara = np.ones(len(self), dtype=bool)
+        if produto_id is not None:
+            mascara &= self._igual(self.produto_id, produto_id)
+        if status is not None:
+            mascara &= self._igual(self.status, status)
+        if lote:
+            mascara &= self._igual(self.lote, lote)
+        if validade_de is not None:
+            mascara &= self.validade >= validade_de.toordinal()
+        if validade_ate is not None:
+            mascara &= (self.validade <= validade_ate.toordinal()) & (self.validade != SEM_DATA)
+        if numero_de is not None:
+            mascara &= self.numero >= int(numero_de)
+        if numero_ate is not None:
+            mascara &= self.numero <= int(numero_ate)
+        return np.flatnonzero(mascara)
+
+    def _chave_ordem(self, coluna, posicoes):
+        if coluna == "numero":
+            return self.numero[posicoes]
+        if coluna == "validade":
+            # Sem data vai para o fim
+            return np.where(self.validade[posicoes] == SEM_DATA, np.iinfo(np.int32).max, self.validade[posicoes])
+        categorias = getattr(self, coluna)
+        posto = np.empty(len(categorias.categories), dtype=np.int64)
+        posto[categorias.categories.astype(str).argsort()] = np.arange(len(categorias.categories))
+        return posto[categorias.codes[posicoes]]
+
+    def consultar(self, ordem="numero", decrescente=False, **filtros):
+        """Posições filtradas e ordenadas (empates pelo número); guarda as últimas consultas."""
+        if ordem not in ORDENACOES:
+            raise ValueError(f"Ordenação desconhecida: {ordem}")
+        chave = (ordem, decrescente, tuple(sorted(filtros.items())))
+        if chave in self._consultas:
+            self._consultas.move_to_end(chave)
+            return self._consultas[chave]
+        posicoes = self.filtrar(**filtros)
+        if ordem != "numero" or decrescente:
+            valores = self._chave_ordem(ordem, posicoes)
+            posicoes = posicoes[np.argsort(-valores if decrescente else valores, kind="stable")]
+        self._consultas[chave] = posicoes
+        if len(self._consultas) > CONSULTAS_GUARDADAS:
+            self._consultas.popitem(last=False)
+        return posicoes
+
+    def linhas(self, posicoes):
+        """DataFrame só com as unidades nas ``posicoes`` (ex.: uma página da tabela)."""
+        return pd.DataFrame({
+            "numero": self.numero[posicoes],
+            "produto_id": self.produto_id[posicoes],
+            "validade": self.datas_validade(posicoes),
+            "lote": self.lote[posicoes],
+            "data_cadastro": self.data_cadastro[posicoes],
+            "status": self.status[posicoes],
+        })
+
+    def como_dataframe(self):
+        """DataFrame com as mesmas colunas, sem copiar os arrays."""
+        return pd.DataFrame({
+            "numero": self.numero,
+            "produto_id": self.produto_id,
+            "validade": self.datas_validade(),
+            "lote": self.lote,
+            "data_cadastro": self.data_cadastro,
+            "status": self.status,
+        }, copy=False)
+
+    def memoria(self):
+        """Bytes ocupados pelas colunas."""
+        return sum(
+            c.nbytes if isinstance(c, np.ndarray) else c.codes.nbytes + c.categories.memory_usage(deep=True)
+            for c in (self.numero, self.produto_id, self.validade, self.lote, self.data_cadastro, self.status)
+        )
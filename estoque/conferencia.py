@@ -0,0 +1,62 @@
+"""
+Conferência do carregamento de um pedido contra as unidades escaneadas.
+"""
+
+from collections import Counter
+
+ACEITA = "aceita"
+DUPLICADA = "duplicada"
+SEM_NUMERO = "sem número"
+# Leituras barradas pelo índice de unidades antes de entrar na conferência
+DESCONHECIDA = "unidade desconhecida"
+JA_EXPEDIDA = "já expedida"
+# Resultado de cada unidade na expedição
+EXPEDIDA = "expedida"
+
+
+class ConferenciaPedido:
+    """Estado da conferência de um pedido, atualizado a cada unidade lida.
+
+    Guarda os números já lidos (cada unidade conta uma vez só) e a contagem
+    por produto. ``faltando``, ``excedentes`` e ``inesperados`` ficam sempre
+    prontos como {produto_id: quantidade}, sem varrer itens nem leituras.
+    """
+
+    def __init__(self, itens):
+        self.esperado = Counter()
+        for item in itens:
+            self.esperado[item["produto_id"]] += int(item["quantidade"])
+        self.numeros = set()
+        self.lidos = Counter()
+        self.faltando = {pid: qtd for pid, qtd in self.esperado.items() if qtd > 0}
+        self.excedentes = {}
+        self.inesperados = {}
+
+    def registrar(self, numero, produto_id):
+        """Conta uma unidade lida; retorna ACEITA, DUPLICADA ou SEM_NUMERO."""
+        if numero is None:
+            return SEM_NUMERO
+        if numero in self.numeros:
+            return DUPLICADA
+        self.numeros.add(numero)
+        self.lidos[produto_id] += 1
+        esperado = self.esperado.get(produto_id)
+        if esperado is None:
+            self.inesperados[produto_id] = self.lidos[produto_id]
+            return ACEITA
+        diferenca = esperado - self.lidos[produto_id]
+        if diferenca > 0:
+            self.faltando[produto_id] = diferenca
+        else:
+            self.faltando.pop(produto_id, None)
+            if diferenca < 0:
+                self.excedentes[produto_id] = -diferenca
+        return ACEITA
+
+    @property
+    def completa(self):
+        return not (self.faltando or self.excedentes or self.inesperados)
+
+    def itens(self):
+        """(produto_id, lidos, esperados) de cada item do pedido."""
+        return [(pid, self.lidos[pid], qtd) for pid, qtd in self.esperado.items()]
@@ -0,0 +1,56 @@
+"""
+Estado em memória derivado do banco e mantido a cada transação confirmada.
+
+A subclasse sabe recalcular o estado do zero e aplicar as mudanças de
+uma transação sobre ele. O estado guarda o número do último evento do
+diário que reflete: se o banco avançou sem passar por aqui (outro processo
+escreveu, ou uma restauração trocou tudo), a próxima leitura recalcula.
+"""
+
+import abc
+import threading
+from contextlib import contextmanager
+
+
+class DerivadoDoBanco(abc.ABC):
+    """``recalcular()`` devolve (seq do diário, estado) lidos numa mesma
+    transação; ``seq_atual()`` devolve só o seq do banco agora.
+    """
+
+    def __init__(self, recalcular, seq_atual):
+        self._recalcular = recalcular
+        self._seq_atual = seq_atual
+        self._lock = threading.Lock()
+        self._estado = None
+        self._seq = None
+
+    def _atualizado(self):
+        """O estado em dia com o banco; chamar com ``_lock``."""
+        if self._estado is None or self._seq_atual() != self._seq:
+            self._seq, self._estado = self._recalcular()
+        return self._estado
+
+    @abc.abstractmethod
+    def _aplicar(self, estado, mudancas):
+        """Devolve o estado com as ``mudancas`` de uma transação aplicadas."""
+
+    @contextmanager
+    def confirmando(self, primeiro_seq, seq, mudancas):
+        """Envolve o COMMIT da transação com os eventos ``primeiro_seq``..``seq`` do diário.
+
+        O lock fica preso do COMMIT até as ``mudancas`` (None para "mudou
+        tudo") serem aplicadas: um recálculo nunca lê o banco já com a
+        transação e o estado ainda sem ela. Se o COMMIT falhar, nada é aplicado.
+        """
+        with self._lock:
+            yield
+            if self._estado is None or mudancas is None or primeiro_seq != self._seq + 1:
+                # Outro processo escreveu no meio, ou a transação trocou tudo: recalcula na próxima leitura
+                self._estado = None
+                return
+            self._estado = self._aplicar(self._estado, mudancas)
+            self._seq = seq
+
+    def invalidar(self):
+        with self._lock:
+            self._estado = None
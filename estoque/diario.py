@@ -0,0 +1,198 @@
+"""
+Diário de alterações (só acrescenta) e snapshots comprimidos do banco.
+
+Cada escrita do ``BancoEstoque`` vira um evento numerado em sequência,
+acrescentado ao diário como uma linha JSON dentro da própria transação,
+com o lock de escrita do SQLite: a ordem das linhas é a ordem dos commits,
+inclusive entre processos.
+
+Um snapshot é o banco inteiro em JSON Lines comprimido (gzip): um
+cabeçalho com a sequência em que foi tirado e, para cada tabela, uma linha
+com as colunas seguida de uma linha por registro. Restaurar é carregar o
+snapshot e reaplicar os eventos do diário posteriores a ele; os dois são
+lidos linha a linha, então a memória não cresce com o histórico.
+"""
+
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+
+FORMATO = "camda-snapshot"
+VERSAO_FORMATO = 2
+LINHAS_POR_BLOCO = 5_000
+NIVEL_GZIP = 6
+
+_codificar = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+# Tabelas do snapshot, na ordem em que são gravadas e carregadas
+TABELAS = {
+    "produtos": ("id", "nome", "volume", "categoria"),
+    "faixas": ("inicio", "fim", "produto_id", "validade", "lote", "data_cadastro"),
+    "situacoes": ("numero", "faixa", "status", "horario", "pedido_id"),
+    "pedidos": ("id", "cliente", "itens", "data", "status"),
+    "conferencias": ("pedido_id", "numero", "produto_id", "horario"),
+    "leituras": ("id", "numero", "produto_id", "nome", "horario"),
+}
+
+# Colunas que mudaram desde a versão 1 do formato; as que faltam ficam nulas ao carregar
+COLUNAS_VERSAO_1 = {"situacoes": ("numero", "faixa", "status")}
+
+_NOME_SNAPSHOT = re.compile(r"^snapshot-(\d+)\.jsonl\.gz$")
+
+
+def nome_snapshot(seq):
+    return f"snapshot-{seq:012d}.jsonl.gz"
+
+
+def listar_snapshots(pasta):
+    """[(seq, caminho)] dos snapshots da pasta, do mais antigo ao mais recente."""
+    if not os.path.isdir(pasta):
+        return []
+    encontrados = ((_NOME_SNAPSHOT.match(nome), nome) for nome in os.listdir(pasta))
+    return sorted((int(m.group(1)), os.path.join(pasta, nome)) for m, nome in encontrados if m)
+
+
+class Diario:
+    """Arquivo JSON Lines de eventos ``{"seq", "horario", "tipo", "dados"}``."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+
+    def acrescentar(self, seq, tipo, dados):
+        linha = _codificar({"seq": seq, "horario": datetime.now().isoformat(timespec="seconds"),
+                            "tipo": tipo, "dados": dados}) + "\n"
+        # Reaberto a cada evento: continua valendo depois que outro processo compacta o arquivo
+        fd = os.open(self.caminho, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, linha.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def eventos(self, depois_de=0, ate=None):
+        """Eventos com ``depois_de < seq <= ate``, em ordem.
+
+        Se o COMMIT de uma transação falhar, a linha dela fica no diário e a
+        transação seguinte reusa o número: para o mesmo ``seq`` vale a última.
+        """
+        if not os.path.exists(self.caminho):
+            return
+        anterior = None
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for texto in arquivo:
+                try:
+                    evento = json.loads(texto)
+                except ValueError:
+                    continue  # linha cortada por uma queda no meio da escrita
+                if anterior is not None and evento["seq"] != anterior["seq"]:
+                    if depois_de < anterior["seq"] and (ate is None or anterior["seq"] <= ate):
+                        yield anterior
+                anterior = evento
+        if anterior is not None and depois_de < anterior["seq"] and (ate is None or anterior["seq"] <= ate):
+            yield anterior
+
+    def _do_fim(self):
+        """Eventos do último para o primeiro, lendo o arquivo de trás para frente em blocos."""
+        try:
+            arquivo = open(self.caminho, "rb")
+        except FileNotFoundError:
+            return
+        with arquivo:
+            fim = arquivo.seek(0, os.SEEK_END)
+            resto = b""
+            while fim > 0:
+                inicio = max(0, fim - 2 ** 16)
+                arquivo.seek(inicio)
+                linhas = (arquivo.read(fim - inicio) + resto).split(b"\n")
+                fim = inicio
+                # A primeira pode estar pela metade enquanto não chegamos ao começo do arquivo
+                resto = linhas.pop(0) if inicio > 0 else b""
+                for linha in reversed(linhas):
+                    try:
+                        yield json.loads(linha)
+                    except ValueError:
+                        continue  # vazia ou cortada
+
+    def ultimos(self, quantidade):
+        """Os ``quantidade`` eventos mais recentes, em ordem, sem ler o diário inteiro."""
+        eventos = []
+        for evento in self._do_fim():
+            if len(eventos) == quantidade:
+                break
+            if not eventos or evento["seq"] != eventos[-1]["seq"]:
+                eventos.append(evento)
+        return eventos[::-1]
+
+    def ultimo_seq(self):
+        return next((evento["seq"] for evento in self._do_fim()), 0)
+
+    def compactar(self, ate):
+        """Descarta os eventos com ``seq <= ate`` (já cobertos por um snapshot).
+
+        Chamar com o lock de escrita do banco, para nenhum evento entrar no meio.
+        """
+        if not os.path.exists(self.caminho):
+            return
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as saida:
+            for evento in self.eventos(depois_de=ate):
+                saida.write(_codificar(evento) + "\n")
+        os.replace(temporario, self.caminho)
+
+
+def escrever_snapshot(conn, saida, cabecalho):
+    """Grava as ``TABELAS`` lidas de ``conn`` em ``saida`` (arquivo binário) como JSON Lines + gzip.
+
+    Rodar dentro de uma transação para o snapshot ser consistente; as
+    linhas vão direto do cursor para o arquivo.
+    """
+    with gzip.open(saida, "wt", encoding="utf-8", compresslevel=NIVEL_GZIP) as texto:
+        texto.write(_codificar({"formato": FORMATO, "versao": VERSAO_FORMATO,
+                                "criado": datetime.now().isoformat(timespec="seconds"), **cabecalho}) + "\n")
+        cur = conn.cursor()
+        cur.row_factory = None
+        for tabela, colunas in TABELAS.items():
+            texto.write(_codificar({"tabela": tabela, "colunas": colunas}) + "\n")
+            cur.execute(f"SELECT {', '.join(colunas)} FROM {tabela}")
+            while bloco := cur.fetchmany(LINHAS_POR_BLOCO):
+                texto.write("\n".join(map(_codificar, bloco)) + "\n")
+
+
+def ler_snapshot(arquivo, linhas_por_bloco=LINHAS_POR_BLOCO):
+    """Lê um snapshot (caminho ou arquivo binário): primeiro o cabeçalho, depois (tabela, colunas, linhas) em blocos.
+
+    Levanta ``ValueError`` se o arquivo não for um snapshot do estoque.
+    """
+    with gzip.open(arquivo, "rt", encoding="utf-8") as entrada:
+        try:
+            cabecalho = json.loads(next(entrada, "null"))
+        except ValueError:
+            cabecalho = None
+        if not isinstance(cabecalho, dict) or cabecalho.get("formato") != FORMATO:
+            raise ValueError("O arquivo não é um snapshot do estoque")
+        versao = cabecalho.get("versao")
+        if versao not in (1, VERSAO_FORMATO):
+            raise ValueError(f"Versão de snapshot não suportada: {versao}")
+        antigas = COLUNAS_VERSAO_1 if versao == 1 else {}
+        yield cabecalho
+
+        tabela, colunas, bloco = None, None, []
+        for texto in entrada:
+            registro = json.loads(texto)
+            if isinstance(registro, dict):
+                if bloco:
+                    yield tabela, colunas, bloco
+                    bloco = []
+                tabela, colunas = registro.get("tabela"), tuple(registro.get("colunas", ()))
+                if colunas not in (TABELAS.get(tabela), antigas.get(tabela)):
+                    raise ValueError(f"Tabela inesperada no snapshot: {tabela}")
+            elif tabela is None:
+                raise ValueError("Registro antes da primeira tabela do snapshot")
+            else:
+                bloco.append(registro)
+                if len(bloco) >= linhas_por_bloco:
+                    yield tabela, colunas, bloco
+                    bloco = []
+        if bloco:
+            yield tabela, colunas, bloco
@@ -0,0 +1,328 @@
+"""
+Geração de QR codes e etiquetas das unidades.
+"""
+
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+
+import qrcode
+from PIL import Image, ImageDraw, ImageFont
+
+from estoque import payload
+from estoque.instrumentacao import medido
+
+FONTE_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONTE_NEGRITO = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+# Posição e lado do QR code dentro da etiqueta (em pixels)
+QR_Y = 230
+QR_TAMANHO = 650
+
+
+def montar_qr(dados, tamanho_box=15, border=4):
+    """``qrcode.QRCode`` já codificado; base tanto da imagem quanto do PDF vetorial.
+
+    ``dados`` é o texto do QR; um dict é gravado como JSON.
+    """
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=qrcode.constants.ERROR_CORRECT_H,
+        box_size=tamanho_box,
+        border=border,
+    )
+    qr.add_data(dados if isinstance(dados, str) else json.dumps(dados, ensure_ascii=False))
+    qr.make(fit=True)
+    return qr
+
+
+def gerar_qr_code(dados, tamanho_box=15, border=4):
+    qr = montar_qr(dados, tamanho_box, border)
+    return qr.make_image(fill_color="black", back_color="white").convert("RGB")
+
+
+def dados_qr(unidade, produto):
+    return payload.codificar(unidade, produto)
+
+
+def linhas_info(unidade, produto):
+    return [
+        f"Produto: {produto['nome']}",
+        f"Volume: {produto['volume']}",
+        f"Categoria: {produto['categoria']}",
+        f"Validade: {unidade['validade']}",
+        f"Lote: {unidade.get('lote', 'N/I')}",
+        f"Cadastro: {unidade['data_cadastro']}",
+    ]
+
+
+@lru_cache(maxsize=None)
+def _fontes():
+    """Fontes da etiqueta, carregadas uma única vez por processo."""
+    try:
+        return {
+            "titulo": ImageFont.truetype(FONTE_NEGRITO, 48),
+            "info": ImageFont.truetype(FONTE_REGULAR, 36),
+            "numero": ImageFont.truetype(FONTE_NEGRITO, 72),
+            "pequena": ImageFont.truetype(FONTE_REGULAR, 28),
+        }
+    except OSError:
+        padrao = ImageFont.load_default()
+        return {"titulo": padrao, "info": padrao, "numero": padrao, "pequena": padrao}
+
+
+@lru_cache(maxsize=8)
+def _fundo_etiqueta(largura, altura):
+    """Camada fixa (borda, cabeçalho e barra do rodapé), desenhada uma vez por tamanho."""
+    img = Image.new("RGB", (largura, altura), "white")
+    draw = ImageDraw.Draw(img)
+
+    # Borda
+    draw.rectangle([10, 10, largura - 10, altura - 10], outline="black", width=4)
+
+    # Cabeçalho
+    draw.rectangle([10, 10, largura - 10, 100], fill="#1a5276")
+    draw.text((largura // 2, 55), "CAMDA - CONTROLE DE ESTOQUE",
+              fill="white", font=_fontes()["titulo"], anchor="mm")
+
+    # Rodapé
+    draw.rectangle([10, altura - 60, largura - 10, altura - 10], fill="#2ecc71")
+    return img
+
+
+@medido("etiqueta")
+def gerar_etiqueta(unidade, produto, largura=1200, altura=1500):
+    fontes = _fontes()
+    img = _fundo_etiqueta(largura, altura).copy()
+    draw = ImageDraw.Draw(img)
+
+    # Número grande
+    numero_str = f"#{unidade['numero']:04d}"
+    draw.text((largura // 2, 170), numero_str,
+              fill="#e74c3c", font=fontes["numero"], anchor="mm")
+
+    # QR Code
+    # Módulo com número inteiro de pixels, centralizado no espaço do QR (sem reamostragem)
+    qr = montar_qr(dados_qr(unidade, produto), tamanho_box=1)
+    qr.box_size = max(1, QR_TAMANHO // (qr.modules_count + 2 * qr.border))
+    qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
+    folga = (QR_TAMANHO - qr_img.size[0]) // 2
+    img.paste(qr_img, ((largura - QR_TAMANHO) // 2 + folga, QR_Y + folga))
+
+    # Informações
+    y_info = QR_Y + QR_TAMANHO + 30
+    for line in linhas_info(unidade, produto):
+        draw.text((largura // 2, y_info), line,
+                  fill="black", font=fontes["info"], anchor="mm")
+        y_info += 50
+
+    # Texto do rodapé
+    draw.text((largura // 2, altura - 35), f"Código: {produto['id']} | Unidade: {numero_str}",
+              fill="white", font=fontes["pequena"], anchor="mm")
+
+    return img
+
+
+@medido("png", tamanho=len)
+def imagem_para_bytes(img, formato="PNG"):
+    buffer = BytesIO()
+    img.save(buffer, format=formato)
+    return buffer.getvalue()
+
+
+def _renderizar_png(tarefa):
+    unidade, produto = tarefa
+    return imagem_para_bytes(gerar_etiqueta(unidade, produto))
+
+
+def _etiquetas_para_pdf(tarefas, processos):
+    """Gera as etiquetas já prontas para o ReportLab, na mesma ordem das tarefas.
+
+    Com ``processos > 1`` a renderização e o PNG são feitos em um pool de
+    processos; os resultados chegam em ordem conforme ficam prontos.
+    """
+    from reportlab.lib.utils import ImageReader
+
+    if processos > 1 and len(tarefas) > 1:
+        # spawn evita herdar as threads do servidor Streamlit via fork
+        contexto = multiprocessing.get_context("spawn")
+        processos = min(processos, len(tarefas))
+        chunksize = max(1, len(tarefas) // (processos * 4))
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as pool:
+            for png in pool.map(_renderizar_png, tarefas, chunksize=chunksize):
+                yield ImageReader(BytesIO(png))
+    else:
+        for unidade, produto in tarefas:
+            yield ImageReader(gerar_etiqueta(unidade, produto))
+
+
+def _tarefas_etiquetas(unidades, catalogo):
+    tarefas = []
+    for un in unidades:
+        produto = catalogo.buscar(un["produto_id"])
+        if produto:
+            tarefas.append((un, produto))
+    return tarefas
+
+
+def _posicao_na_pagina(largura, altura, page_w, page_h, margin=40):
+    """Escala e origem para centralizar uma etiqueta largura×altura na página."""
+    ratio = min((page_w - 2 * margin) / largura, (page_h - 2 * margin) / altura)
+    x = (page_w - largura * ratio) / 2
+    y = (page_h - altura * ratio) / 2
+    return x, y, ratio
+
+
+@medido("pdf", tamanho=len)
+def gerar_pdf_etiquetas(unidades_selecionadas, catalogo, processos=1, progresso=None):
+    """PDF A4 com uma etiqueta por página.
+
+    ``progresso(feitas, total)`` é chamado a cada etiqueta adicionada ao PDF.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    tarefas = _tarefas_etiquetas(unidades_selecionadas, catalogo)
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    page_w, page_h = A4
+
+    for i, img_reader in enumerate(_etiquetas_para_pdf(tarefas, processos)):
+        if i > 0:
+            c.showPage()
+
+        img_w, img_h = img_reader.getSize()
+        x, y, ratio = _posicao_na_pagina(img_w, img_h, page_w, page_h)
+        c.drawImage(img_reader, x, y, img_w * ratio, img_h * ratio)
+
+        if progresso:
+            progresso(i + 1, len(tarefas))
+
+    c.save()
+    return buffer.getvalue()
+
+
+# ============================================================
+# PDF VETORIAL
+# ============================================================
+@lru_cache(maxsize=None)
+def _fontes_pdf():
+    """Registra as fontes DejaVu no ReportLab; Helvetica se não estiverem instaladas."""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    try:
+        pdfmetrics.registerFont(TTFont("DejaVuSans", FONTE_REGULAR))
+        pdfmetrics.registerFont(TTFont("DejaVuSans-Bold", FONTE_NEGRITO))
+        return {"regular": "DejaVuSans", "negrito": "DejaVuSans-Bold"}
+    except Exception:
+        return {"regular": "Helvetica", "negrito": "Helvetica-Bold"}
+
+
+def _texto_centralizado(c, texto, x, y, fonte, tamanho):
+    """Equivalente ao ``anchor="mm"`` do PIL: (x, y) é o centro do texto."""
+    from reportlab.pdfbase import pdfmetrics
+
+    ascent, descent = pdfmetrics.getAscentDescent(fonte, tamanho)
+    c.setFont(fonte, tamanho)
+    c.drawCentredString(x, y - (ascent + descent) / 2, texto)
+
+
+def _desenhar_qr_vetorial(c, qr, x, y, lado):
+    """Módulos escuros como retângulos preenchidos, unindo sequências da mesma linha."""
+    matriz = qr.get_matrix()
+    modulo = lado / len(matriz)
+    path = c.beginPath()
+    for i, linha in enumerate(matriz):
+        topo = y + lado - (i + 1) * modulo
+        j = 0
+        while j < len(linha):
+            if linha[j]:
+                inicio = j
+                while j < len(linha) and linha[j]:
+                    j += 1
+                path.rect(x + inicio * modulo, topo, (j - inicio) * modulo, modulo)
+            else:
+                j += 1
+    c.setFillColor("white")
+    c.rect(x, y, lado, lado, stroke=0, fill=1)
+    c.setFillColor("black")
+    c.drawPath(path, stroke=0, fill=1)
+
+
+def desenhar_etiqueta_vetorial(c, unidade, produto, largura=1200, altura=1500):
+    """Mesmo layout de ``gerar_etiqueta``, desenhado no canvas em unidades da etiqueta.
+
+    A origem é o canto inferior esquerdo da etiqueta; quem chama posiciona e
+    escala o canvas antes.
+    """
+    fontes = _fontes_pdf()
+
+    def y(py):
+        return altura - py
+
+    # Borda
+    c.setStrokeColor("black")
+    c.setLineWidth(4)
+    c.rect(10, 10, largura - 20, altura - 20, stroke=1, fill=0)
+
+    # Cabeçalho
+    c.setFillColor("#1a5276")
+    c.rect(10, y(100), largura - 20, 90, stroke=0, fill=1)
+    c.setFillColor("white")
+    _texto_centralizado(c, "CAMDA - CONTROLE DE ESTOQUE", largura / 2, y(55), fontes["negrito"], 48)
+
+    # Número grande
+    numero_str = f"#{unidade['numero']:04d}"
+    c.setFillColor("#e74c3c")
+    _texto_centralizado(c, numero_str, largura / 2, y(170), fontes["negrito"], 72)
+
+    # QR Code
+    qr = montar_qr(dados_qr(unidade, produto), tamanho_box=12)
+    _desenhar_qr_vetorial(c, qr, (largura - QR_TAMANHO) / 2, y(QR_Y + QR_TAMANHO), QR_TAMANHO)
+
+    # Informações
+    c.setFillColor("black")
+    y_info = QR_Y + QR_TAMANHO + 30
+    for line in linhas_info(unidade, produto):
+        _texto_centralizado(c, line, largura / 2, y(y_info), fontes["regular"], 36)
+        y_info += 50
+
+    # Rodapé
+    c.setFillColor("#2ecc71")
+    c.rect(10, 10, largura - 20, 50, stroke=0, fill=1)
+    c.setFillColor("white")
+    _texto_centralizado(c, f"Código: {produto['id']} | Unidade: {numero_str}",
+                        largura / 2, y(altura - 35), fontes["regular"], 28)
+
+
+@medido("pdf_vetorial", tamanho=len)
+def gerar_pdf_etiquetas_vetorial(unidades_selecionadas, catalogo, progresso=None, largura=1200, altura=1500):
+    """PDF A4 com as etiquetas em vetor (QR e textos nativos do PDF), sem imagens."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    tarefas = _tarefas_etiquetas(unidades_selecionadas, catalogo)
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    page_w, page_h = A4
+    x, y, ratio = _posicao_na_pagina(largura, altura, page_w, page_h)
+
+    for i, (un, produto) in enumerate(tarefas):
+        if i > 0:
+            c.showPage()
+        c.saveState()
+        c.translate(x, y)
+        c.scale(ratio, ratio)
+        desenhar_etiqueta_vetorial(c, un, produto, largura, altura)
+        c.restoreState()
+
+        if progresso:
+            progresso(i + 1, len(tarefas))
+
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,155 @@
+"""
+Exportação de todas as unidades, com o nome do produto, em CSV ou Parquet.
+
+As faixas são lidas do banco em blocos, expandidas em colunas
+(``UnidadesColunares``) e gravadas no arquivo bloco a bloco: a memória
+usada não cresce com o estoque. O Parquet (pyarrow, opcional) leva a
+validade como data, a data de cadastro como timestamp e os textos
+repetidos (produto, lote, status) como colunas de dicionário.
+"""
+
+import io
+from bisect import bisect_right
+from datetime import date
+
+from estoque.colunar import SEM_DATA, UnidadesColunares
+
+UNIDADES_POR_BLOCO = 65_536
+COLUNAS = ["numero", "produto_id", "validade", "lote", "data_cadastro", "status", "produto_nome"]
+
+# formato -> (tipo MIME, extensão)
+FORMATOS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def parquet_disponivel():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def blocos_colunares(banco, unidades_por_bloco=UNIDADES_POR_BLOCO):
+    """``UnidadesColunares`` de até ``unidades_por_bloco`` unidades cada, em ordem de número.
+
+    Faixas maiores que o bloco são divididas; uma faixa pequena nunca é
+    expandida junto com o estoque inteiro.
+    """
+    pendentes, situacoes, total = [], [], 0
+
+    def montar():
+        # As situações chegam ordenadas: passa só as do trecho e descarta as já usadas
+        corte = bisect_right(situacoes, pendentes[-1]["fim"], key=lambda s: s[0])
+        colunas = UnidadesColunares.de_faixas(pendentes, situacoes[:corte])
+        del situacoes[:corte]
+        return colunas
+
+    for faixas, situacoes_bloco in banco.faixas_em_blocos():
+        situacoes += situacoes_bloco
+        for faixa in faixas:
+            inicio = faixa["inicio"]
+            while inicio <= faixa["fim"]:
+                fim = min(faixa["fim"], inicio + unidades_por_bloco - total - 1)
+                pendentes.append(dict(faixa, inicio=inicio, fim=fim))
+                total += fim - inicio + 1
+                inicio = fim + 1
+                if total == unidades_por_bloco:
+                    yield montar()
+                    pendentes, total = [], 0
+    if pendentes:
+        yield montar()
+
+
+def _validades_texto(ordinais):
+    """Ordinais de validade como categorias 'dd/mm/aaaa' (vazio sem data), formatando cada dia uma vez só."""
+    import numpy as np
+    import pandas as pd
+
+    dias, codigos = np.unique(ordinais, return_inverse=True)
+    textos = [date.fromordinal(d).strftime("%d/%m/%Y") if d != SEM_DATA else "" for d in dias.tolist()]
+    return pd.Categorical.from_codes(codigos.astype(np.int32), categories=textos)
+
+
+def exportar_csv(banco, saida, unidades_por_bloco=UNIDADES_POR_BLOCO):
+    """Grava o CSV (UTF-8) em ``saida`` (arquivo binário); retorna quantas unidades foram exportadas."""
+    texto = io.TextIOWrapper(saida, encoding="utf-8", newline="")
+    texto.write(",".join(COLUNAS) + "\n")
+    total = 0
+    for colunas in blocos_colunares(banco, unidades_por_bloco):
+        df = colunas.como_dataframe()
+        df["validade"] = _validades_texto(colunas.validade)
+        df["produto_nome"] = banco.catalogo.nomes(df["produto_id"])
+        df.to_csv(texto, index=False, header=False)
+        total += len(df)
+    texto.flush()
+    texto.detach()
+    return total
+
+
+def esquema_parquet():
+    import pyarrow as pa
+
+    texto = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("numero", pa.int64()),
+        ("produto_id", texto),
+        ("validade", pa.date32()),
+        ("lote", texto),
+        ("data_cadastro", pa.timestamp("s")),
+        ("status", texto),
+        ("produto_nome", texto),
+    ])
+
+
+def _dicionario(categorias):
+    """Categorical do pandas -> DictionaryArray, reaproveitando os códigos."""
+    import numpy as np
+    import pyarrow as pa
+
+    return pa.DictionaryArray.from_arrays(categorias.codes.astype(np.int32),
+                                          pa.array(categorias.categories.astype(str), pa.string()))
+
+
+def _tabela_arrow(colunas, catalogo):
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+    # Poucos valores distintos: converte as categorias e espalha pelos códigos
+    cadastros = pd.to_datetime(pd.Series(colunas.data_cadastro.categories), format="%d/%m/%Y %H:%M", errors="coerce")
+    nomes = catalogo.nomes(pd.Series(colunas.produto_id.categories, dtype=object)).astype(str)
+    return pa.Table.from_arrays([
+        pa.array(colunas.numero),
+        _dicionario(colunas.produto_id),
+        pa.array(colunas.datas_validade(), pa.date32(), from_pandas=True),
+        _dicionario(colunas.lote),
+        pa.array(cadastros.to_numpy("datetime64[s]")[colunas.data_cadastro.codes], pa.timestamp("s"), from_pandas=True),
+        _dicionario(colunas.status),
+        pa.array(nomes.to_numpy(object)[colunas.produto_id.codes], pa.string()).dictionary_encode(),
+    ], schema=esquema_parquet())
+
+
+def exportar_parquet(banco, saida, unidades_por_bloco=UNIDADES_POR_BLOCO):
+    """Grava o Parquet em ``saida`` (caminho ou arquivo binário), um row group por bloco.
+
+    Levanta ``ImportError`` se o pyarrow não estiver instalado.
+    """
+    import pyarrow.parquet as pq
+
+    total = 0
+    with pq.ParquetWriter(saida, esquema_parquet(), compression="zstd") as escritor:
+        for colunas in blocos_colunares(banco, unidades_por_bloco):
+            escritor.write_table(_tabela_arrow(colunas, banco.catalogo))
+            total += len(colunas)
+    return total
+
+
+def exportar(banco, formato, saida, unidades_por_bloco=UNIDADES_POR_BLOCO):
+    """Exporta no ``formato`` ("csv" ou "parquet") para ``saida``; retorna o total de unidades."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de exportação desconhecido: {formato}")
+    exportar_formato = exportar_csv if formato == "csv" else exportar_parquet
+    return exportar_formato(banco, saida, unidades_por_bloco)
@@ -0,0 +1,81 @@
+"""
+Faixas de unidades cadastradas juntas.
+
+Um cadastro de N unidades vira um único registro com o intervalo de
+números e os atributos em comum (produto, validade, lote, data). A lista
+de unidades só é expandida quando alguém precisa delas uma a uma; o status
+de cada unidade é ``EM_ESTOQUE`` a menos que tenha sido registrado à parte.
+"""
+
+from collections.abc import Sequence
+
+EM_ESTOQUE = "em_estoque"
+EXPEDIDO = "expedido"
+CAMPOS = ("produto_id", "validade", "lote", "data_cadastro")
+
+
+class FaixaUnidades(Sequence):
+    """Unidades ``inicio``..``fim`` (inclusive) com os mesmos atributos.
+
+    Funciona como uma lista de dicts de unidade (len, índice, fatias,
+    iteração), mas cada dict só é criado quando acessado.
+    """
+
+    __slots__ = ("inicio", "fim", "produto_id", "validade", "lote", "data_cadastro")
+
+    def __init__(self, inicio, fim, produto_id, validade, lote, data_cadastro):
+        self.inicio = inicio
+        self.fim = fim
+        self.produto_id = produto_id
+        self.validade = validade
+        self.lote = lote
+        self.data_cadastro = data_cadastro
+
+    @property
+    def numeros(self):
+        return range(self.inicio, self.fim + 1)
+
+    def __len__(self):
+        return self.fim - self.inicio + 1
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.unidade(n) for n in self.numeros[indice]]
+        return self.unidade(self.numeros[indice])
+
+    def __contains__(self, numero):
+        return isinstance(numero, int) and self.inicio <= numero <= self.fim
+
+    def unidade(self, numero, status=EM_ESTOQUE):
+        return {"numero": numero, "produto_id": self.produto_id, "validade": self.validade,
+                "lote": self.lote, "data_cadastro": self.data_cadastro, "status": status}
+
+    def como_dict(self):
+        return {"inicio": self.inicio, "fim": self.fim, **{c: getattr(self, c) for c in CAMPOS}}
+
+    def __repr__(self):
+        return f"FaixaUnidades({self.inicio}..{self.fim}, {self.produto_id!r}, {self.validade!r}, {self.lote!r})"
+
+
+def comprimir(unidades):
+    """Agrupa dicts de unidade em faixas de números consecutivos com os mesmos atributos.
+
+    Retorna (faixas, situacoes), onde ``situacoes`` lista (numero, status)
+    das unidades que não estão em estoque.
+    """
+    faixas, situacoes = [], []
+    atual = None
+    for u in sorted(unidades, key=lambda u: int(u["numero"])):
+        numero = int(u["numero"])
+        if atual is not None and numero <= atual.fim:
+            continue  # número repetido: vale a primeira ocorrência
+        chave = tuple(u.get(c) for c in CAMPOS)
+        if atual is not None and numero == atual.fim + 1 and chave == tuple(getattr(atual, c) for c in CAMPOS):
+            atual.fim = numero
+        else:
+            atual = FaixaUnidades(numero, numero, *chave)
+            faixas.append(atual)
+        status = u.get("status") or EM_ESTOQUE
+        if status != EM_ESTOQUE:
+            situacoes.append((numero, status))
+    return faixas, situacoes
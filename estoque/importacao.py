@@ -0,0 +1,120 @@
+"""
+Importação de produtos de planilhas (CSV ou XLSX) grandes.
+
+O arquivo é lido em blocos; cada bloco é normalizado e validado com
+operações vetorizadas do pandas, sem laço por linha. Linhas recusadas
+vão para um relatório com o número da linha na planilha e o motivo; as
+aceitas são gravadas de uma vez só no fim.
+"""
+
+from itertools import islice
+
+from estoque.catalogo import COLUNAS_PRODUTO
+
+TAMANHO_BLOCO = 10_000
+MAX_CODIGO = 20
+CATEGORIA_PADRAO = "Outro"
+COLUNAS_OBRIGATORIAS = ("id", "nome", "volume")
+COLUNAS_RELATORIO = ["linha", "id", "erro"]
+
+
+def _normalizar_colunas(df):
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    faltando = [c for c in COLUNAS_OBRIGATORIAS if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+    if "categoria" not in df.columns:
+        df["categoria"] = ""
+    return df
+
+
+def _blocos_xlsx(arquivo, tamanho_bloco):
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    planilha = load_workbook(arquivo, read_only=True, data_only=True).active
+    linhas = planilha.iter_rows(values_only=True)
+    cabecalho = next(linhas, None)
+    if cabecalho is None:
+        return
+    while True:
+        bloco = list(islice(linhas, tamanho_bloco))
+        if not bloco:
+            return
+        yield pd.DataFrame(bloco, columns=[str(c) for c in cabecalho], dtype=object)
+
+
+def ler_planilha(arquivo, nome, tamanho_bloco=TAMANHO_BLOCO):
+    """Blocos (DataFrames de texto) de um CSV ou XLSX, sem carregar o arquivo inteiro."""
+    import pandas as pd
+
+    if nome.lower().endswith(".csv"):
+        # Separador detectado (vírgula ou ponto e vírgula, como exporta o Excel em português)
+        yield from pd.read_csv(arquivo, dtype=str, keep_default_na=False, chunksize=tamanho_bloco,
+                               sep=None, engine="python", encoding="utf-8-sig", encoding_errors="replace")
+    elif nome.lower().endswith(".xlsx"):
+        yield from _blocos_xlsx(arquivo, tamanho_bloco)
+    else:
+        raise ValueError("Formato não suportado: envie CSV ou XLSX")
+
+
+def validar_bloco(df, primeira_linha, cadastrados, vistos):
+    """Separa um bloco em (produtos aceitos, DataFrame de erros).
+
+    ``primeira_linha`` é a linha da planilha onde o bloco começa (a
+    primeira de dados é a 2). ``cadastrados`` são os códigos do catálogo e
+    ``vistos`` os aceitos em blocos anteriores; é atualizado aqui.
+    """
+    import numpy as np
+    import pandas as pd
+
+    df = _normalizar_colunas(df)
+    texto = {c: df[c].fillna("").astype(str).str.strip() for c in COLUNAS_PRODUTO}
+    texto["id"] = texto["id"].str.upper()
+    texto["categoria"] = texto["categoria"].mask(texto["categoria"] == "", CATEGORIA_PADRAO)
+
+    # isin contra sets Python é bem mais rápido em object do que em strings Arrow
+    ids = texto["id"].astype(object)
+    erro = np.select(
+        [ids == "", ids.str.len() > MAX_CODIGO, texto["nome"] == "", texto["volume"] == "", ids.isin(cadastrados)],
+        ["código vazio", f"código com mais de {MAX_CODIGO} caracteres", "nome vazio", "volume vazio",
+         "código já cadastrado"],
+        default="",
+    ).astype(object)
+    # Repetição só conta contra linhas válidas: vale a primeira ocorrência aceita
+    validas = erro == ""
+    repetidas = validas & (ids.isin(vistos) | ids.where(validas).duplicated()).to_numpy()
+    erro[repetidas] = "código repetido na planilha"
+    aceitos = erro == ""
+    vistos.update(ids[aceitos])
+
+    erros = pd.DataFrame({
+        "linha": np.arange(primeira_linha, primeira_linha + len(df))[~aceitos],
+        "id": ids[~aceitos].to_numpy(),
+        "erro": erro[~aceitos],
+    })
+    colunas = (texto[c][aceitos].tolist() for c in COLUNAS_PRODUTO)
+    produtos = [dict(zip(COLUNAS_PRODUTO, linha)) for linha in zip(*colunas)]
+    return produtos, erros
+
+
+def importar_produtos(banco, blocos):
+    """Valida todos os blocos e grava os produtos aceitos em uma única transação.
+
+    Retorna (quantidade importada, relatório de erros como DataFrame com
+    ``linha``, ``id`` e ``erro``). Colunas obrigatórias ausentes levantam
+    ``ValueError`` antes de gravar qualquer coisa.
+    """
+    import pandas as pd
+
+    cadastrados = {p["id"] for p in banco.catalogo}
+    vistos = set()
+    aceitos, erros = [], []
+    linha = 2
+    for bloco in blocos:
+        produtos, erros_bloco = validar_bloco(bloco, linha, cadastrados, vistos)
+        aceitos += produtos
+        erros.append(erros_bloco)
+        linha += len(bloco)
+    relatorio = pd.concat(erros, ignore_index=True) if erros else pd.DataFrame(columns=COLUNAS_RELATORIO)
+    return banco.adicionar_produtos(aceitos) if aceitos else 0, relatorio
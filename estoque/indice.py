@@ -0,0 +1,133 @@
+"""
+Índice das unidades por número, para resolver uma leitura sem ir ao banco.
+
+Um array ``numero -> faixa`` (int32, 4 bytes por número) acha a faixa de
+uma unidade em O(1); as unidades fora de estoque ficam num dict à parte
+com a situação, o horário e o pedido. Cadastros e expedições atualizam o
+índice ao confirmar a transação, como os ``AgregadosEstoque``.
+"""
+
+from bisect import bisect_right, insort
+
+from estoque.derivados import DerivadoDoBanco
+from estoque.faixas import EM_ESTOQUE, EXPEDIDO
+
+# Com números muito espalhados (ex.: backup com saltos enormes) o array não compensa: usa busca binária
+MAX_POSICOES_POR_UNIDADE = 4
+MIN_POSICOES = 1 << 20
+
+
+class _Estado:
+    __slots__ = ("faixas", "inicios", "posicao", "situacoes", "total")
+
+    def __init__(self, faixas, situacoes):
+        self.faixas = faixas  # FaixaUnidades (validade dd/mm/aaaa), em ordem de início
+        self.inicios = [f.inicio for f in faixas]
+        self.situacoes = situacoes  # numero -> (status, horario, pedido_id)
+        self.total = sum(len(f) for f in faixas)
+        self.posicao = self._posicoes(max((f.fim for f in faixas), default=0) + 1)
+
+    def _posicoes(self, tamanho):
+        """Array número -> índice em ``faixas`` (-1 sem unidade), ou None se ficaria grande demais."""
+        if tamanho > max(MIN_POSICOES, MAX_POSICOES_POR_UNIDADE * self.total):
+            return None
+        import numpy as np
+
+        posicao = np.full(tamanho, -1, dtype=np.int32)
+        inicios = np.array(self.inicios, dtype=np.int64)
+        tamanhos = np.array([len(f) for f in self.faixas], dtype=np.int64)
+        # Mesma expansão sem laço por unidade de ``UnidadesColunares.de_faixas``
+        numeros = np.arange(self.total, dtype=np.int64) + np.repeat(inicios - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+        posicao[numeros] = np.repeat(np.arange(len(self.faixas), dtype=np.int32), tamanhos)
+        return posicao
+
+    def acrescentar(self, faixa):
+        self.total += len(faixa)
+        if self.inicios and faixa.inicio < self.inicios[-1]:
+            # Fora de ordem (não acontece com a numeração do banco): refaz o array
+            insort(self.faixas, faixa, key=lambda f: f.inicio)
+            self.inicios = [f.inicio for f in self.faixas]
+            self.posicao = self._posicoes(max(f.fim for f in self.faixas) + 1)
+            return
+        self.faixas.append(faixa)
+        self.inicios.append(faixa.inicio)
+        if self.posicao is None:
+            return
+        if faixa.fim >= len(self.posicao):
+            tamanho = max(faixa.fim + 1, 2 * len(self.posicao))
+            if tamanho > max(MIN_POSICOES, MAX_POSICOES_POR_UNIDADE * self.total):
+                self.posicao = None
+                return
+            import numpy as np
+
+            self.posicao = np.concatenate([self.posicao, np.full(tamanho - len(self.posicao), -1, dtype=np.int32)])
+        self.posicao[faixa.inicio:faixa.fim + 1] = len(self.faixas) - 1
+
+    def faixa(self, numero):
+        if self.posicao is not None:
+            if 0 <= numero < len(self.posicao):
+                i = self.posicao[numero]
+                return self.faixas[i] if i >= 0 else None
+            return None
+        i = bisect_right(self.inicios, numero) - 1
+        return self.faixas[i] if i >= 0 and numero <= self.faixas[i].fim else None
+
+
+class IndiceUnidades(DerivadoDoBanco):
+    """Unidades por número.
+
+    ``recalcular()`` devolve (seq, faixas em ordem de início, {numero:
+    (status, horario, pedido_id)}). As mudanças de cada transação são
+    ``("cadastro", FaixaUnidades)`` e ``("situacoes", [(numero, status,
+    horario, pedido_id)])``.
+    """
+
+    def __init__(self, recalcular, seq_atual):
+        def recalcular_estado():
+            seq, faixas, situacoes = recalcular()
+            return seq, _Estado(faixas, situacoes)
+
+        super().__init__(recalcular_estado, seq_atual)
+
+    def _aplicar(self, estado, mudancas):
+        for tipo, dados in mudancas:
+            if tipo == "cadastro":
+                estado.acrescentar(dados)
+            elif tipo == "situacoes":
+                for numero, status, horario, pedido_id in dados:
+                    if status == EM_ESTOQUE:
+                        estado.situacoes.pop(numero, None)
+                    else:
+                        estado.situacoes[numero] = (status, horario, pedido_id)
+        return estado
+
+    def buscar(self, numero):
+        """A unidade como dict (com ``expedido_em`` e ``pedido_id`` se expedida), ou None se não existe."""
+        with self._lock:
+            estado = self._atualizado()
+            faixa = estado.faixa(numero)
+            if faixa is None:
+                return None
+            situacao = estado.situacoes.get(numero)
+        if situacao is None:
+            return faixa.unidade(numero)
+        status, horario, pedido_id = situacao
+        unidade = faixa.unidade(numero, status)
+        if status == EXPEDIDO:
+            unidade.update(expedido_em=horario, pedido_id=pedido_id)
+        return unidade
+
+    def situacoes(self, numeros):
+        """{numero: status} das unidades; None para números que não existem."""
+        with self._lock:
+            estado = self._atualizado()
+            return {numero: (None if estado.faixa(numero) is None
+                             else estado.situacoes.get(numero, (EM_ESTOQUE,))[0])
+                    for numero in numeros}
+
+    def produtos(self, numeros):
+        """{numero: produto_id} das unidades que existem."""
+        with self._lock:
+            estado = self._atualizado()
+            faixas = {numero: estado.faixa(numero) for numero in numeros}
+        return {numero: faixa.produto_id for numero, faixa in faixas.items() if faixa is not None}
@@ -0,0 +1,226 @@
+"""
+Medição leve de tempo por etapa (barra lateral, montagem de tabelas,
+etiquetas, PDF, leitura de QR, execução de cada página).
+
+Cada medição vira um registro (etapa, horário, segundos, bytes) num buffer
+circular em memória: só as ``CAPACIDADE`` mais recentes ficam guardadas,
+e delas saem os quantis (p50, p95). Contagem, tempo total e bytes por
+etapa também são acumulados desde o início do processo, como o Prometheus
+espera de um summary. Os dois alimentam a página de Diagnósticos e a
+exportação no formato texto do Prometheus.
+
+Desligada (``CAMDA_DIAGNOSTICO=0`` ou ``ativar(False)``), ``medir``
+devolve sempre o mesmo contexto vazio e ``medido`` só testa uma flag.
+Com ``CAMDA_METRICAS`` definida, o app grava as métricas nesse arquivo
+a cada ``INTERVALO_EXPORTACAO`` segundos.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+CAPACIDADE = 10_000
+QUANTIS = (0.5, 0.95)
+PREFIXO_PROMETHEUS = "camda"
+INTERVALO_EXPORTACAO = 15
+
+_registros = deque(maxlen=CAPACIDADE)
+# etapa -> [contagem, segundos, bytes] desde o início do processo
+_acumulado = {}
+_lock = threading.Lock()
+_lock_arquivo = threading.Lock()
+_ativa = os.environ.get("CAMDA_DIAGNOSTICO", "1") != "0"
+_ultima_exportacao = float("-inf")
+
+
+def ativa():
+    return _ativa
+
+
+def ativar(ligada=True):
+    global _ativa
+    _ativa = ligada
+
+
+def limpar():
+    with _lock:
+        _registros.clear()
+        _acumulado.clear()
+
+
+def _anotar(etapa, segundos, tamanho):
+    with _lock:
+        _registros.append((etapa, time.time(), segundos, tamanho))
+        acumulado = _acumulado.get(etapa)
+        if acumulado is None:
+            acumulado = _acumulado[etapa] = [0, 0.0, 0]
+        acumulado[0] += 1
+        acumulado[1] += segundos
+        if tamanho is not None:
+            acumulado[2] += tamanho
+
+
+def registrar(etapa, segundos, tamanho=None):
+    """Acrescenta uma medição feita por fora (ex.: em outro processo)."""
+    if _ativa:
+        _anotar(etapa, segundos, tamanho)
+
+
+class _Medicao:
+    """Contexto de uma medição; ``tamanho`` (bytes) pode ser preenchido dentro do bloco."""
+
+    __slots__ = ("etapa", "tamanho", "_inicio")
+
+    def __init__(self, etapa, tamanho):
+        self.etapa = etapa
+        self.tamanho = tamanho
+
+    def __enter__(self):
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *erro):
+        _anotar(self.etapa, time.perf_counter() - self._inicio, self.tamanho)
+        return False
+
+
+class _Nula:
+    __slots__ = ()
+    tamanho = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *erro):
+        return False
+
+    def __setattr__(self, nome, valor):
+        pass  # ``tamanho`` atribuído com a medição desligada é descartado
+
+
+_NULA = _Nula()
+
+
+def medir(etapa, tamanho=None):
+    """``with medir("pdf") as m: ...; m.tamanho = len(dados)``."""
+    return _Medicao(etapa, tamanho) if _ativa else _NULA
+
+
+def medido(etapa, tamanho=None):
+    """Decorador: mede cada chamada; ``tamanho(resultado)`` dá os bytes da saída."""
+    def decorar(funcao):
+        @wraps(funcao)
+        def medida(*args, **kwargs):
+            if not _ativa:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            resultado = funcao(*args, **kwargs)
+            _anotar(etapa, time.perf_counter() - inicio, tamanho(resultado) if tamanho else None)
+            return resultado
+        return medida
+    return decorar
+
+
+def registros():
+    """Cópia dos registros (etapa, horário, segundos, bytes), do mais antigo ao mais recente."""
+    with _lock:
+        return list(_registros)
+
+
+def acumulado():
+    """{etapa: (contagem, segundos, bytes)} desde o início do processo (ou do último ``limpar``)."""
+    with _lock:
+        return {etapa: tuple(valores) for etapa, valores in _acumulado.items()}
+
+
+def _quantil(ordenados, q):
+    """Quantil por interpolação linear de uma lista já ordenada."""
+    posicao = (len(ordenados) - 1) * q
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(ordenados) - 1)
+    return ordenados[abaixo] + (ordenados[acima] - ordenados[abaixo]) * (posicao - abaixo)
+
+
+def resumo():
+    """Por etapa, das medições no buffer, ordenado pelo tempo total.
+
+    Lista de dicts com ``etapa``, ``contagem``, ``total_s``, ``p50_s``,
+    ``p95_s``, ``max_s``, ``bytes_total`` e ``bytes_medio`` (None se a
+    etapa não informa tamanho).
+    """
+    por_etapa = {}
+    for etapa, _, segundos, tamanho in registros():
+        tempos, tamanhos = por_etapa.setdefault(etapa, ([], []))
+        tempos.append(segundos)
+        if tamanho is not None:
+            tamanhos.append(tamanho)
+    linhas = []
+    for etapa, (tempos, tamanhos) in por_etapa.items():
+        tempos.sort()
+        linhas.append({
+            "etapa": etapa,
+            "contagem": len(tempos),
+            "total_s": sum(tempos),
+            "p50_s": _quantil(tempos, 0.5),
+            "p95_s": _quantil(tempos, 0.95),
+            "max_s": tempos[-1],
+            "bytes_total": sum(tamanhos) if tamanhos else None,
+            "bytes_medio": sum(tamanhos) / len(tamanhos) if tamanhos else None,
+        })
+    return sorted(linhas, key=lambda linha: linha["total_s"], reverse=True)
+
+
+def _rotulo(valor):
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus(prefixo=PREFIXO_PROMETHEUS):
+    """Formato texto de exposição do Prometheus.
+
+    Um summary por etapa (quantis das medições no buffer; ``_sum`` e
+    ``_count`` acumulados) e um counter de bytes.
+    """
+    segundos, tamanhos = f"{prefixo}_etapa_segundos", f"{prefixo}_etapa_bytes_total"
+    quantis = {linha["etapa"]: linha for linha in resumo()}
+    totais = acumulado()
+    linhas = [f"# HELP {segundos} Duração das etapas medidas; quantis das últimas {CAPACIDADE} medições.",
+              f"# TYPE {segundos} summary"]
+    for etapa, (contagem, total, _) in sorted(totais.items()):
+        rotulo = _rotulo(etapa)
+        if etapa in quantis:
+            for q in QUANTIS:
+                valor = quantis[etapa][f"p{round(q * 100)}_s"]
+                linhas.append(f'{segundos}{{etapa="{rotulo}",quantile="{q}"}} {valor:.6f}')
+        linhas.append(f'{segundos}_sum{{etapa="{rotulo}"}} {total:.6f}')
+        linhas.append(f'{segundos}_count{{etapa="{rotulo}"}} {contagem}')
+    linhas += [f"# HELP {tamanhos} Bytes produzidos ou lidos pelas etapas que informam tamanho.",
+               f"# TYPE {tamanhos} counter"]
+    for etapa, (_, _, bytes_total) in sorted(totais.items()):
+        if bytes_total:
+            linhas.append(f'{tamanhos}{{etapa="{_rotulo(etapa)}"}} {bytes_total}')
+    return "\n".join(linhas) + "\n"
+
+
+def exportar_prometheus(caminho, prefixo=PREFIXO_PROMETHEUS):
+    """Grava ``prometheus()`` em ``caminho`` de uma vez (arquivo temporário + rename).
+
+    Serve para o coletor textfile do node_exporter, que nunca vê o arquivo pela metade.
+    """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with _lock_arquivo:
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(prometheus(prefixo))
+        os.replace(temporario, caminho)
+
+
+def exportar_periodicamente(caminho, intervalo=INTERVALO_EXPORTACAO):
+    """``exportar_prometheus`` no máximo uma vez a cada ``intervalo`` segundos; True se gravou."""
+    global _ultima_exportacao
+    agora = time.monotonic()
+    if agora - _ultima_exportacao < intervalo:
+        return False
+    _ultima_exportacao = agora
+    exportar_prometheus(caminho)
+    return True
@@ -0,0 +1,161 @@
+"""
+Leitura de QR codes em fotos: pré-processamento e decodificação em lote.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageFilter, ImageOps
+
+from estoque import payload
+from estoque.instrumentacao import medido
+
+# Lado maior da primeira tentativa, já suficiente para etiquetas fotografadas de perto
+LADO_REDUZIDO = 1024
+ANGULOS_EXTRAS = (30, 60)
+
+# Blocos da foto do palete: a sobreposição deve ser maior que o lado de um QR na foto
+LADO_BLOCO = 1024
+SOBREPOSICAO_BLOCO = 320
+
+
+def obter_decodificador():
+    """Função imagem -> lista de textos usando o pyzbar; ImportError se indisponível."""
+    from pyzbar.pyzbar import ZBarSymbol, decode
+
+    def decodificar(img):
+        return [r.data.decode("utf-8", "replace") for r in decode(img, symbols=[ZBarSymbol.QRCODE])]
+
+    return decodificar
+
+
+def preparar_imagem(img):
+    """Aplica a orientação EXIF e converte para tons de cinza."""
+    return ImageOps.exif_transpose(img).convert("L")
+
+
+def _reduzir(img, lado=LADO_REDUZIDO):
+    if max(img.size) <= lado:
+        return None
+    reduzida = img.copy()
+    reduzida.thumbnail((lado, lado))
+    return reduzida
+
+
+def limiar_adaptativo(img, raio=15, margem=10):
+    """Binariza comparando cada pixel com a média da vizinhança (resiste a reflexos)."""
+    pixels = np.asarray(img, dtype=np.int16)
+    media = np.asarray(img.filter(ImageFilter.BoxBlur(raio)), dtype=np.int16)
+    return Image.fromarray(np.where(pixels > media - margem, 255, 0).astype(np.uint8))
+
+
+def _tentativas(img):
+    """Da mais barata para a mais cara; só avança se a anterior não achou nada."""
+    reduzida = _reduzir(img)
+    if reduzida is not None:
+        yield "reduzida", reduzida
+    yield "original", img
+    yield "limiar adaptativo", limiar_adaptativo(reduzida if reduzida is not None else img)
+    for angulo in ANGULOS_EXTRAS:
+        yield f"rotação {angulo}°", img.rotate(angulo, expand=True, fillcolor=255)
+
+
+@medido("leitura_qr", tamanho=lambda r: r["largura"] * r["altura"])
+def decodificar_imagem(img, decodificar=None):
+    """Textos dos QR codes da imagem e estatísticas da leitura.
+
+    Retorna dict com ``textos``, ``etapa`` (tentativa que achou, ou None),
+    ``tempo_ms``, ``largura`` e ``altura``.
+    """
+    decodificar = decodificar or obter_decodificador()
+    inicio = time.perf_counter()
+    img = preparar_imagem(img)
+    textos, etapa = [], None
+    for nome, tentativa in _tentativas(img):
+        textos = list(dict.fromkeys(decodificar(tentativa)))
+        if textos:
+            etapa = nome
+            break
+    return {
+        "textos": textos,
+        "etapa": etapa,
+        "tempo_ms": (time.perf_counter() - inicio) * 1000,
+        "largura": img.width,
+        "altura": img.height,
+    }
+
+
+def decodificar_lote(arquivos, decodificar=None, max_workers=None):
+    """Decodifica várias fotos em paralelo (threads), mantendo a ordem de entrada.
+
+    ``arquivos`` é uma sequência de (nome, arquivo ou caminho).
+    """
+    decodificar = decodificar or obter_decodificador()
+
+    def ler(item):
+        nome, arquivo = item
+        with Image.open(arquivo) as img:
+            resultado = decodificar_imagem(img, decodificar)
+        resultado["arquivo"] = nome
+        return resultado
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(ler, arquivos))
+
+
+def _posicoes(total, lado, passo):
+    posicoes = list(range(0, max(total - lado, 0) + 1, passo))
+    if posicoes[-1] + lado < total:
+        posicoes.append(total - lado)
+    return posicoes
+
+
+def dividir_em_blocos(largura, altura, lado=LADO_BLOCO, sobreposicao=SOBREPOSICAO_BLOCO):
+    """Caixas (x0, y0, x1, y1) de blocos sobrepostos cobrindo a imagem inteira."""
+    passo = max(1, lado - sobreposicao)
+    return [(x, y, min(x + lado, largura), min(y + lado, altura))
+            for y in _posicoes(altura, lado, passo)
+            for x in _posicoes(largura, lado, passo)]
+
+
+@medido("leitura_palete", tamanho=lambda r: r["largura"] * r["altura"])
+def decodificar_palete(img, decodificar=None, lado_bloco=LADO_BLOCO, sobreposicao=SOBREPOSICAO_BLOCO,
+                       max_workers=None):
+    """Lê todas as etiquetas de uma foto com muitas unidades (ex.: face de um palete).
+
+    A foto é dividida em blocos sobrepostos decodificados em paralelo, além
+    de uma passada na imagem reduzida para QRs grandes. As leituras são
+    unidas pelo número da unidade ``n``.
+
+    Retorna dict com ``por_numero`` ({n: dados}), ``invalidos`` (textos que
+    não são etiquetas do sistema), ``blocos``, ``tempo_ms``, ``largura`` e
+    ``altura``.
+    """
+    decodificar = decodificar or obter_decodificador()
+    inicio = time.perf_counter()
+    img = preparar_imagem(img)
+    partes = [img.crop(caixa) for caixa in dividir_em_blocos(img.width, img.height, lado_bloco, sobreposicao)]
+    reduzida = _reduzir(img)
+    if reduzida is not None:
+        partes.append(reduzida)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        por_parte = list(pool.map(decodificar, partes))
+
+    por_numero, invalidos = {}, []
+    for texto in dict.fromkeys(t for textos in por_parte for t in textos):
+        try:
+            dados = payload.decodificar(texto)
+        except ValueError:
+            invalidos.append(texto)
+            continue
+        por_numero.setdefault(dados.get("n"), dados)
+    return {
+        "por_numero": por_numero,
+        "invalidos": invalidos,
+        "blocos": len(partes),
+        "tempo_ms": (time.perf_counter() - inicio) * 1000,
+        "largura": img.width,
+        "altura": img.height,
+    }
@@ -0,0 +1,111 @@
+"""
+Conteúdo dos QR codes das etiquetas.
+
+Formato compacto (versão 1), só com caracteres do modo alfanumérico do QR:
+
+    C1:<número>:<código do produto>:<validade>
+
+A validade vai em base 36, como dias desde 01/01/2000. Nome, volume, lote
+e data de cadastro não viajam no QR: são resolvidos no servidor pelo
+catálogo e pelo número da unidade. Etiquetas antigas (JSON completo)
+continuam sendo aceitas na leitura.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+
+PREFIXO = "C1"
+SEPARADOR = ":"
+DATA_BASE = date(2000, 1, 1)
+_DIGITOS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _base36(valor):
+    texto = ""
+    while True:
+        valor, resto = divmod(valor, 36)
+        texto = _DIGITOS[resto] + texto
+        if not valor:
+            return texto
+
+
+def _data_compacta(validade):
+    """'dd/mm/aaaa' -> dias desde DATA_BASE em base 36; vazio se não houver data.
+
+    Levanta ``ValueError`` para datas anteriores a ``DATA_BASE``, que o formato não representa.
+    """
+    try:
+        dia = datetime.strptime(validade, "%d/%m/%Y").date()
+    except (TypeError, ValueError):
+        return ""
+    if dia < DATA_BASE:
+        raise ValueError(f"Validade {validade} anterior a {DATA_BASE:%d/%m/%Y} não cabe no QR compacto")
+    return _base36((dia - DATA_BASE).days)
+
+
+def _data_expandida(texto):
+    if not texto:
+        return None
+    return (DATA_BASE + timedelta(days=int(texto, 36))).strftime("%d/%m/%Y")
+
+
+def codificar(unidade, produto):
+    return SEPARADOR.join([
+        PREFIXO,
+        str(unidade["numero"]),
+        produto["id"],
+        _data_compacta(unidade.get("validade")),
+    ])
+
+
+def codificar_legado(unidade, produto):
+    """JSON completo usado pelas etiquetas anteriores ao formato compacto."""
+    return json.dumps({
+        "n": unidade["numero"],
+        "p": produto["id"],
+        "nome": produto["nome"],
+        "vol": produto["volume"],
+        "val": unidade["validade"],
+        "lote": unidade.get("lote", ""),
+        "dt": unidade["data_cadastro"]
+    }, ensure_ascii=False)
+
+
+def decodificar(texto):
+    """Lê o conteúdo de um QR (compacto ou JSON legado) como dict com ao menos ``n`` e ``p``.
+
+    Levanta ``ValueError`` se o texto não for de uma etiqueta do sistema.
+    """
+    texto = texto.strip()
+    if texto.startswith(PREFIXO + SEPARADOR):
+        partes = texto.split(SEPARADOR)
+        if len(partes) < 4:
+            raise ValueError("QR compacto com campos faltando")
+        # O código do produto fica no meio e pode conter o separador
+        numero, produto_id, validade = partes[1], SEPARADOR.join(partes[2:-1]), partes[-1]
+        dados = {"n": int(numero), "p": produto_id, "val": _data_expandida(validade)}
+    else:
+        dados = json.loads(texto)
+        if not isinstance(dados, dict):
+            raise ValueError("QR sem os dados da unidade")
+    # bool é subclasse de int, mas não é número de unidade
+    if type(dados.get("n")) is not int or dados["n"] < 0:
+        raise ValueError("QR sem um número de unidade válido")
+    if not isinstance(dados.get("p"), str) or not dados["p"]:
+        raise ValueError("QR sem o código do produto")
+    return dados
+
+
+def resolver(dados, catalogo, unidade=None):
+    """Completa os campos descritivos a partir do catálogo e do cadastro da unidade."""
+    completo = dict(dados)
+    produto = catalogo.buscar(dados.get("p"))
+    if produto:
+        completo.setdefault("nome", produto["nome"])
+        completo.setdefault("vol", produto["volume"])
+    if unidade:
+        completo.setdefault("lote", unidade.get("lote"))
+        completo.setdefault("dt", unidade.get("data_cadastro"))
+        if not completo.get("val"):
+            completo["val"] = unidade.get("validade")
+    return completo
@@ -0,0 +1,39 @@
+"""
+Tabelas da página de Relatórios, montadas fora do Streamlit.
+"""
+
+import pandas as pd
+
+from estoque.instrumentacao import medido
+from estoque.validades import classificar_validades
+
+
+def _bytes_dataframe(df):
+    return int(df.memory_usage(index=False).sum())
+
+
+@medido("tabela_estoque", tamanho=_bytes_dataframe)
+def estoque_atual(contagem, catalogo):
+    """Quantidade por produto e volume, da maior para a menor.
+
+    ``contagem`` é o {produto_id: quantidade} de ``BancoEstoque.contagem_por_produto``.
+    """
+    return (catalogo.como_dataframe()
+            .merge(pd.Series(contagem, dtype="int64").rename("Quantidade"), left_on="id", right_index=True)
+            .groupby(["nome", "volume"], as_index=False, sort=False)
+            .agg(Categoria=("categoria", "first"), Quantidade=("Quantidade", "sum"))
+            .rename(columns={"nome": "Produto", "volume": "Volume"})
+            .sort_values("Quantidade", ascending=False))
+
+
+@medido("tabela_validades", tamanho=_bytes_dataframe)
+def tabela_validades(colunas, catalogo, posicoes, hoje):
+    """Linhas ``posicoes`` das ``UnidadesColunares`` com dias restantes e faixa de vencimento."""
+    dias = colunas.dias_restantes(hoje, posicoes)
+    return pd.DataFrame({
+        "Nº": colunas.numero[posicoes],
+        "Produto": catalogo.nomes(colunas.produto_id[posicoes]),
+        "Validade": colunas.datas_validade(posicoes),
+        "Dias Restantes": pd.Series(dias).astype("Int64"),
+        "Status": classificar_validades(dias),
+    })
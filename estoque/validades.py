@@ -0,0 +1,75 @@
+"""
+Contadores e faixas de vencimento das unidades.
+"""
+
+from datetime import date
+
+from estoque.derivados import DerivadoDoBanco
+
+DIAS_ALERTA = 30
+DIAS_ATENCAO = 90
+
+VENCIDO = "🔴 VENCIDO"
+VENCE_EM_BREVE = "🟡 Vence em breve"
+ATENCAO = "🟠 Atenção"
+OK = "🟢 OK"
+SEM_DATA = "❓ Sem data"
+
+
+def classificar_validades(dias):
+    """Faixa de vencimento para uma série de dias restantes (vazio = sem data)."""
+    import numpy as np
+    import pandas as pd
+
+    dias = pd.to_numeric(pd.Series(dias), errors="coerce")
+    faixas = np.select(
+        [dias.isna(), dias < 0, dias <= DIAS_ALERTA, dias <= DIAS_ATENCAO],
+        [SEM_DATA, VENCIDO, VENCE_EM_BREVE, ATENCAO],
+        default=OK,
+    )
+    return pd.Series(faixas, index=dias.index)
+
+
+class _Contagem:
+    __slots__ = ("dia", "vencidos", "proximos")
+
+    def __init__(self, dia, vencidos, proximos):
+        self.dia, self.vencidos, self.proximos = dia, vencidos, proximos
+
+
+class ContadoresValidade(DerivadoDoBanco):
+    """Unidades em estoque vencidas e a vencer em até ``DIAS_ALERTA`` dias.
+
+    ``recalcular(hoje)`` devolve (seq do diário, vencidos, próximos) lidos
+    numa mesma transação. Os totais são recalculados na primeira consulta
+    de cada dia ou quando o banco avançou sem passar por este processo;
+    entre uma e outra, cada transação aplica os seus pares (validade, delta).
+    """
+
+    def __init__(self, recalcular, seq_atual):
+        self._contar = recalcular
+        super().__init__(lambda: self._contar_em(date.today()), seq_atual)
+
+    def _contar_em(self, hoje):
+        seq, vencidos, proximos = self._contar(hoje)
+        return seq, _Contagem(hoje, vencidos, proximos)
+
+    def _aplicar(self, contagem, diferencas):
+        for validade, delta in diferencas:
+            if validade is None:
+                continue
+            dias = (validade - contagem.dia).days
+            if dias < 0:
+                contagem.vencidos += delta
+            elif dias <= DIAS_ALERTA:
+                contagem.proximos += delta
+        return contagem
+
+    def obter(self, hoje=None):
+        hoje = hoje or date.today()
+        with self._lock:
+            contagem = self._atualizado()
+            if contagem.dia != hoje:
+                self._seq, self._estado = self._contar_em(hoje)
+                contagem = self._estado
+            return contagem.vencidos, contagem.proximos
@@ -0,0 +1,106 @@
+"""
+Varredura contínua de QR codes em vídeo (câmera, stream ou arquivo gravado).
+
+Só alguns frames são decodificados: um a cada ``a_cada``, e mesmo esses
+são pulados se a cena não mudou desde o último decodificado. Leituras
+repetidas da mesma unidade dentro de ``janela`` segundos são descartadas
+e as novas saem em lotes para serem gravadas de uma vez.
+"""
+
+import time
+
+import numpy as np
+
+from estoque import payload
+from estoque.leitor import obter_decodificador
+
+A_CADA = 5
+LIMIAR_MUDANCA = 4.0
+JANELA_SEGUNDOS = 10.0
+TAMANHO_LOTE = 20
+
+
+class FiltroRepeticoes:
+    """Aceita cada número de unidade no máximo uma vez por janela de tempo."""
+
+    def __init__(self, janela=JANELA_SEGUNDOS):
+        self.janela = janela
+        self._ultima_vez = {}
+
+    def novo(self, numero, tempo):
+        ultima = self._ultima_vez.get(numero)
+        self._ultima_vez[numero] = tempo
+        return ultima is None or tempo - ultima > self.janela
+
+
+def _assinatura(frame):
+    """Miniatura usada para detectar mudança de cena sem comparar o frame inteiro."""
+    return np.asarray(frame, dtype=np.int16)[::8, ::8]
+
+
+def ler_frames(origem):
+    """Frames em tons de cinza de um arquivo, URL de stream ou índice de câmera.
+
+    Produz (tempo em segundos, frame). Em arquivos o tempo vem da posição no
+    vídeo, então a mesma gravação sempre dá o mesmo resultado.
+    """
+    import cv2
+
+    captura = cv2.VideoCapture(origem)
+    if not captura.isOpened():
+        raise ValueError(f"Não foi possível abrir o vídeo: {origem}")
+    ao_vivo = isinstance(origem, int) or "://" in str(origem)
+    inicio = time.monotonic()
+    try:
+        while True:
+            ok, frame = captura.read()
+            if not ok:
+                break
+            if ao_vivo:
+                tempo = time.monotonic() - inicio
+            else:
+                tempo = captura.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            yield tempo, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    finally:
+        captura.release()
+
+
+def varrer_frames(frames, decodificar=None, a_cada=A_CADA, limiar_mudanca=LIMIAR_MUDANCA,
+                  janela=JANELA_SEGUNDOS, tamanho_lote=TAMANHO_LOTE):
+    """Percorre (tempo, frame) e produz lotes de leituras novas.
+
+    Cada lote é um dict com ``novos`` (dados decodificados do QR), ``frames``
+    vistos, ``decodificados`` e ``repetidos`` até o momento. O último lote
+    sai ao fim dos frames, mesmo que vazio.
+    """
+    decodificar = decodificar or obter_decodificador()
+    filtro = FiltroRepeticoes(janela)
+    novos = []
+    vistos = decodificados = repetidos = 0
+    anterior = None
+
+    def lote():
+        return {"novos": novos, "frames": vistos, "decodificados": decodificados, "repetidos": repetidos}
+
+    for indice, (tempo, frame) in enumerate(frames):
+        vistos += 1
+        if indice % a_cada:
+            continue
+        assinatura = _assinatura(frame)
+        if anterior is not None and np.abs(assinatura - anterior).mean() <= limiar_mudanca:
+            continue
+        anterior = assinatura
+        decodificados += 1
+        for texto in decodificar(frame):
+            try:
+                dados = payload.decodificar(texto)
+            except ValueError:
+                continue
+            if filtro.novo(dados.get("n"), tempo):
+                novos.append(dados)
+            else:
+                repetidos += 1
+        if len(novos) >= tamanho_lote:
+            yield lote()
+            novos = []
+    yield lote()
@@ -0,0 +1,92 @@
+"""
+Etiquetas em ZPL para impressoras térmicas (Zebra e compatíveis).
+
+O layout fixo é enviado uma vez como formato armazenado (``^DF``); cada
+etiqueta só chama o formato (``^XF``) com os campos variáveis e o QR.
+"""
+
+from functools import lru_cache
+
+import qrcode
+
+from estoque.etiquetas import dados_qr
+
+# Etiqueta 4" x 6" a 203 dpi
+LARGURA_DOTS = 812
+ALTURA_DOTS = 1218
+FORMATO = "R:CAMDA.ZPL"
+
+# (número do campo ^FN, y, altura da fonte)
+CAMPOS = {
+    "numero": (1, 110, 80),
+    "produto": (2, 830, 34),
+    "volume": (3, 880, 34),
+    "validade": (4, 930, 34),
+    "lote": (5, 980, 34),
+    "rodape": (6, ALTURA_DOTS - 70, 28),
+}
+
+
+def _campo(texto):
+    """Escapa o texto para ``^FH``: ^, ~ e _ viram códigos hexadecimais."""
+    return "".join(f"_{ord(ch):02X}" if ch in "^~_" else ch for ch in str(texto))
+
+
+@lru_cache(maxsize=None)
+def _modulos_qr_tamanho(tamanho, alfanumerico):
+    qr = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_H)
+    qr.add_data("A" * tamanho if alfanumerico else b"\x00" * tamanho, optimize=0)
+    return 17 + 4 * qr.best_fit()
+
+
+def _modulos_qr(texto):
+    """Módulos por lado do QR (correção H) para o texto, pelo tamanho e modo de codificação."""
+    dados = texto.encode("utf-8")
+    return _modulos_qr_tamanho(len(dados), qrcode.util.optimal_mode(dados) != qrcode.util.MODE_8BIT_BYTE)
+
+
+def formato_zpl():
+    """Formato armazenado com cabeçalho, linhas e posições dos campos de texto."""
+    linhas = [
+        "^XA",
+        f"^DF{FORMATO}^FS",
+        "^CI28",
+        f"^PW{LARGURA_DOTS}",
+        f"^LL{ALTURA_DOTS}",
+        # Cabeçalho em negativo
+        f"^FO20,20^GB{LARGURA_DOTS - 40},70,70^FS",
+        f"^FO20,38^FR^FB{LARGURA_DOTS - 40},1,0,C^A0N,40,40^FDCAMDA - CONTROLE DE ESTOQUE^FS",
+        f"^FO20,{ALTURA_DOTS - 90}^GB{LARGURA_DOTS - 40},2,2^FS",
+    ]
+    for fn, y, altura in CAMPOS.values():
+        linhas.append(f"^FO0,{y}^FB{LARGURA_DOTS},1,0,C^A0N,{altura},{altura}^FN{fn}^FS")
+    linhas.append("^XZ")
+    return "\n".join(linhas) + "\n"
+
+
+def etiqueta_zpl(unidade, produto, ampliacao_qr=8):
+    """Uma etiqueta: chama o formato armazenado e desenha o QR nativo (^BQ)."""
+    numero_str = f"#{unidade['numero']:04d}"
+    payload = dados_qr(unidade, produto)
+    qr_x = max(0, (LARGURA_DOTS - _modulos_qr(payload) * ampliacao_qr) // 2)
+    valores = {
+        "numero": numero_str,
+        "produto": f"Produto: {produto['nome']}",
+        "volume": f"Volume: {produto['volume']}",
+        "validade": f"Validade: {unidade['validade']}",
+        "lote": f"Lote: {unidade.get('lote', 'N/I')}",
+        "rodape": f"Código: {produto['id']} | Unidade: {numero_str}",
+    }
+    campos = "".join(f"^FN{CAMPOS[nome][0]}^FH^FD{_campo(valor)}^FS" for nome, valor in valores.items())
+    # QR modelo 2, correção H, entrada automática
+    return (f"^XA^CI28^XF{FORMATO}^FS{campos}"
+            f"^FO{qr_x},200^BQN,2,{ampliacao_qr}^FH^FDHA,{_campo(payload)}^FS^XZ\n")
+
+
+def gerar_zpl_etiquetas(unidades_selecionadas, catalogo, ampliacao_qr=8):
+    """Gera o lote em ZPL aos pedaços (formato + uma etiqueta por vez), pronto para streaming."""
+    yield formato_zpl()
+    for un in unidades_selecionadas:
+        produto = catalogo.buscar(un["produto_id"])
+        if produto:
+            yield etiqueta_zpl(un, produto, ampliacao_qr)
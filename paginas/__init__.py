@@ -0,0 +1,23 @@
+"""
+Páginas do app, cada uma em um módulo carregado só quando é aberta.
+
+O módulo fica em ``sys.modules`` depois da primeira vez, então as
+próximas execuções do script só chamam ``exibir``.
+"""
+
+import importlib
+
+PAGINAS = {
+    "🏠 Painel Geral": "painel",
+    "📋 Cadastro de Produtos": "produtos",
+    "🏷️ Cadastrar Unidades": "unidades",
+    "🖨️ Gerar Etiquetas": "impressao",
+    "📷 Leitor de QR Code": "leitor",
+    "🚚 Verificar Pedido": "pedidos",
+    "📊 Relatórios": "relatorios",
+    "🩺 Diagnósticos": "diagnosticos",
+}
+
+
+def exibir(pagina, resumo):
+    importlib.import_module(f"paginas.{PAGINAS[pagina]}").exibir(resumo)
@@ -0,0 +1,119 @@
+"""
+Estado e funções compartilhados pelas páginas: banco, catálogo, CSS e leituras.
+
+Só dependências leves aqui; cada página importa o que usa (pandas, PIL,
+qrcode, pyzbar...) quando é aberta pela primeira vez.
+"""
+
+import os
+from datetime import datetime
+
+import streamlit as st
+
+from estoque import payload
+from estoque.banco import BancoEstoque, CAMINHO_PADRAO
+from estoque.catalogo import PRODUTOS_PADRAO
+from estoque.conferencia import DESCONHECIDA, JA_EXPEDIDA
+
+# Números listados em cada alerta de leitura; o resto vira reticências
+NUMEROS_POR_ALERTA = 20
+
+CSS = """
+<style>
+    .main-header {
+        font-size: 2rem;
+        font-weight: 700;
+        color: #1a5276;
+        text-align: center;
+        padding: 1rem 0;
+        border-bottom: 3px solid #2ecc71;
+        margin-bottom: 1.5rem;
+    }
+    .stat-card {
+        background: linear-gradient(135deg, #1a5276, #2980b9);
+        color: white;
+        padding: 1.2rem;
+        border-radius: 12px;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .stat-card h2 { margin: 0; font-size: 2rem; }
+    .stat-card p { margin: 0; font-size: 0.9rem; opacity: 0.85; }
+    .success-box {
+        background: #d5f5e3;
+        border-left: 4px solid #2ecc71;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+    }
+    .error-box {
+        background: #fadbd8;
+        border-left: 4px solid #e74c3c;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+    }
+    .warning-box {
+        background: #fef9e7;
+        border-left: 4px solid #f39c12;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+    }
+</style>
+"""
+
+
+@st.cache_resource
+def obter_banco():
+    return BancoEstoque(CAMINHO_PADRAO, produtos_iniciais=PRODUTOS_PADRAO)
+
+
+@st.cache_resource
+def iniciar_api(_banco):
+    """Sobe a API HTTP no mesmo processo se ``CAMDA_API_PORTA`` estiver definida."""
+    porta = os.environ.get("CAMDA_API_PORTA")
+    if not porta:
+        return None
+    from estoque.api import iniciar
+
+    return iniciar(_banco, host=os.environ.get("CAMDA_API_HOST", "127.0.0.1"), porta=int(porta),
+                   token=os.environ.get("CAMDA_API_TOKEN"))
+
+
+banco = obter_banco()
+iniciar_api(banco)
+catalogo = banco.catalogo
+
+
+def cabecalho(titulo):
+    st.markdown(f'<div class="main-header">{titulo}</div>', unsafe_allow_html=True)
+
+
+def buscar_produto_por_id(produto_id):
+    return catalogo.buscar(produto_id)
+
+
+def ler_conteudo_qr(texto):
+    """Decodifica o QR (compacto ou JSON legado) e completa os dados pelo cadastro."""
+    dados = payload.decodificar(texto)
+    return payload.resolver(dados, catalogo, banco.buscar_unidade(dados.get("n")))
+
+
+def avisar_leituras(alertas):
+    """Avisa as leituras de números desconhecidos ou de unidades já expedidas ({numero: alerta})."""
+    for alerta in (DESCONHECIDA, JA_EXPEDIDA):
+        numeros = sorted(n for n, a in alertas.items() if a == alerta)
+        if numeros:
+            lista = ", ".join(f"#{n}" for n in numeros[:NUMEROS_POR_ALERTA])
+            st.warning(f"⚠️ {len(numeros)} leitura(s) de {alerta}: {lista}"
+                       + ("…" if len(numeros) > NUMEROS_POR_ALERTA else ""))
+
+
+def leitura_de(dados):
+    return {
+        "numero": dados.get("n"),
+        "produto_id": dados.get("p"),
+        "nome": dados.get("nome"),
+        "horario": datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    }
@@ -0,0 +1,94 @@
+"""
+🩺 Diagnósticos
+"""
+
+import os
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from estoque import instrumentacao
+from paginas.comum import banco, cabecalho
+
+ULTIMAS_MEDICOES = 50
+
+
+def _bytes_legiveis(valor):
+    if valor is None or pd.isna(valor):
+        return ""
+    for unidade in ("B", "KiB", "MiB"):
+        if valor < 1024:
+            return f"{valor:.0f} {unidade}"
+        valor /= 1024
+    return f"{valor:.1f} GiB"
+
+
+def exibir(resumo):
+    cabecalho("🩺 Diagnósticos")
+
+    ligada = st.toggle("Medir tempos das etapas", value=instrumentacao.ativa(),
+                       help="Vale para todas as estações servidas por este processo.")
+    if ligada != instrumentacao.ativa():
+        instrumentacao.ativar(ligada)
+
+    linhas = instrumentacao.resumo()
+    if not linhas:
+        st.info("Nenhuma medição ainda. Use as outras páginas e volte aqui.")
+    else:
+        st.markdown(f"### ⏱️ Tempo por Etapa (últimas {instrumentacao.CAPACIDADE} medições)")
+        df = pd.DataFrame(linhas)
+        st.dataframe(pd.DataFrame({
+            "Etapa": df["etapa"],
+            "Contagem": df["contagem"],
+            "p50 (ms)": df["p50_s"] * 1000,
+            "p95 (ms)": df["p95_s"] * 1000,
+            "Máx (ms)": df["max_s"] * 1000,
+            "Total (s)": df["total_s"],
+            "Tamanho médio": df["bytes_medio"].map(_bytes_legiveis),
+            "Tamanho total": df["bytes_total"].map(_bytes_legiveis),
+        }), use_container_width=True, hide_index=True,
+            column_config={coluna: st.column_config.NumberColumn(format="%.1f")
+                           for coluna in ("p50 (ms)", "p95 (ms)", "Máx (ms)")})
+
+        st.markdown("### 🕒 Últimas Medições")
+        st.dataframe([{"Horário": datetime.fromtimestamp(horario).strftime("%H:%M:%S"), "Etapa": etapa,
+                       "ms": round(segundos * 1000, 1), "Tamanho": _bytes_legiveis(tamanho)}
+                      for etapa, horario, segundos, tamanho in reversed(instrumentacao.registros()[-ULTIMAS_MEDICOES:])],
+                     use_container_width=True, hide_index=True)
+
+    st.markdown("### 🧮 Contagens do Estoque")
+    st.caption("Recontagem de todas as unidades do zero, comparada com as contagens mantidas a cada escrita.")
+    if st.button("🔍 Verificar contagens"):
+        diferencas = banco.verificar_agregados()
+        if diferencas:
+            st.error(f"{len(diferencas)} contagem(ns) divergente(s); serão recalculadas.")
+            st.dataframe([{"Produto": p, "Lote": l, "Status": s, "Mantida": mantida, "Recontada": recontada}
+                          for (p, l, s), (mantida, recontada) in diferencas.items()],
+                         use_container_width=True, hide_index=True)
+            banco.agregados.invalidar()
+        else:
+            st.success("Contagens conferem.")
+
+    st.markdown("### 📤 Métricas (Prometheus)")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Baixar métricas", instrumentacao.prometheus, "metricas.prom",
+                           "text/plain; version=0.0.4", use_container_width=True)
+    with col2:
+        if st.button("🗑️ Limpar medições", use_container_width=True):
+            instrumentacao.limpar()
+            st.rerun()
+    # O destino vem só da configuração do servidor: a página não escolhe onde gravar
+    caminho = os.environ.get("CAMDA_METRICAS")
+    if caminho:
+        st.caption(f"Arquivo do coletor textfile do node_exporter: {os.path.abspath(caminho)}")
+    else:
+        st.caption("Defina CAMDA_METRICAS com o arquivo do coletor textfile do node_exporter para gravar as métricas.")
+    if st.button("💾 Gravar métricas no arquivo", disabled=not caminho):
+        try:
+            instrumentacao.exportar_prometheus(caminho)
+        except OSError as e:
+            st.error(f"Erro: {e}")
+        else:
+            st.success(f"Métricas gravadas em {os.path.abspath(caminho)}")
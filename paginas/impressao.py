@@ -0,0 +1,116 @@
+"""
+🖨️ Gerar Etiquetas
+"""
+
+import os
+
+import streamlit as st
+
+from estoque.etiquetas import (
+    gerar_etiqueta, gerar_pdf_etiquetas, gerar_pdf_etiquetas_vetorial, imagem_para_bytes
+)
+from estoque.zpl import gerar_zpl_etiquetas
+from paginas.comum import banco, buscar_produto_por_id, cabecalho, catalogo
+
+
+def exibir(resumo):
+    total_unidades = resumo["total_unidades"]
+    cabecalho("🖨️ Gerar Etiquetas para Impressão")
+
+    if not total_unidades:
+        st.warning("Nenhuma unidade cadastrada. Cadastre unidades primeiro.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            filtro_produto = st.selectbox(
+                "Filtrar por produto",
+                ["Todos"] + catalogo.opcoes()
+            )
+        with col2:
+            filtro_status = st.selectbox("Filtrar por status", ["Todos", "em_estoque", "expedido"])
+
+        filtros = {}
+        if filtro_produto != "Todos":
+            filtros["produto_id"] = filtro_produto.split(" - ")[0]
+        if filtro_status != "Todos":
+            filtros["status"] = filtro_status
+
+        st.info(f"**{banco.contar_unidades(**filtros)}** unidades encontradas")
+
+        num_min, num_max = banco.faixa_numeros(**filtros)
+        if num_min is not None:
+            col1, col2 = st.columns(2)
+            with col1:
+                num_de = st.number_input("Do número", min_value=num_min, max_value=num_max, value=num_min)
+            with col2:
+                num_ate = st.number_input("Até número", min_value=num_min, max_value=num_max, value=num_max)
+
+            filtros_faixa = dict(filtros, numero_de=num_de, numero_ate=num_ate)
+            st.write(f"**{banco.contar_unidades(**filtros_faixa)}** etiquetas serão geradas")
+
+            col1, col2 = st.columns(2)
+            with col1:
+                formato_pdf = st.radio("Formato do PDF", ["Vetorial", "Imagem (raster)"], horizontal=True,
+                                       help="Vetorial gera arquivos bem menores e nítidos em qualquer impressora")
+            with col2:
+                max_processos = os.cpu_count() or 1
+                processos = st.number_input("Processos para gerar o PDF", min_value=1, max_value=max_processos,
+                                            value=max_processos, disabled=formato_pdf == "Vetorial",
+                                            help="Renderiza as etiquetas em paralelo usando vários núcleos")
+
+            col_btn1, col_btn2, col_btn3 = st.columns(3)
+
+            with col_btn1:
+                if st.button("👁️ Visualizar Etiquetas", use_container_width=True):
+                    for un in banco.listar_unidades(limite=6, **filtros_faixa):
+                        prod = buscar_produto_por_id(un["produto_id"])
+                        if prod:
+                            etiqueta = gerar_etiqueta(un, prod)
+                            st.image(etiqueta, caption=f"Unidade #{un['numero']:04d} - {prod['nome']}", width=350)
+
+            with col_btn2:
+                if st.button("📄 Gerar PDF para Impressão", use_container_width=True):
+                    with st.spinner("Gerando PDF..."):
+                        selecionadas = banco.listar_unidades(**filtros_faixa)
+                        barra = st.progress(0.0, text="Gerando PDF...")
+                        def progresso(feitas, total):
+                            barra.progress(feitas / total, text=f"{feitas}/{total} etiquetas")
+
+                        try:
+                            if formato_pdf == "Vetorial":
+                                pdf_bytes = gerar_pdf_etiquetas_vetorial(selecionadas, catalogo, progresso=progresso)
+                            else:
+                                pdf_bytes = gerar_pdf_etiquetas(selecionadas, catalogo, processos=processos,
+                                                                progresso=progresso)
+                            st.download_button(
+                                label="⬇️ Baixar PDF",
+                                data=pdf_bytes,
+                                file_name=f"etiquetas_{num_de}_a_{num_ate}.pdf",
+                                mime="application/pdf",
+                                use_container_width=True
+                            )
+                        except Exception as e:
+                            st.error(f"Erro ao gerar PDF: {e}")
+                            for un in selecionadas:
+                                prod = buscar_produto_por_id(un["produto_id"])
+                                if prod:
+                                    etiqueta = gerar_etiqueta(un, prod)
+                                    img_bytes = imagem_para_bytes(etiqueta)
+                                    st.download_button(
+                                        f"⬇️ Etiqueta #{un['numero']:04d}",
+                                        img_bytes,
+                                        f"etiqueta_{un['numero']:04d}.png",
+                                        "image/png"
+                                    )
+
+            with col_btn3:
+                if st.button("🧾 Gerar ZPL (térmica)", use_container_width=True):
+                    selecionadas = banco.listar_unidades(**filtros_faixa)
+                    zpl = "".join(gerar_zpl_etiquetas(selecionadas, catalogo))
+                    st.download_button(
+                        label="⬇️ Baixar ZPL",
+                        data=zpl.encode("utf-8"),
+                        file_name=f"etiquetas_{num_de}_a_{num_ate}.zpl",
+                        mime="text/plain",
+                        use_container_width=True
+                    )
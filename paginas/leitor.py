@@ -0,0 +1,214 @@
+"""
+📷 Leitor de QR Code
+"""
+
+import os
+import tempfile
+from itertools import takewhile
+
+import streamlit as st
+from PIL import Image
+
+from estoque import payload
+from estoque.leitor import decodificar_lote, decodificar_palete
+from estoque.video import ler_frames, varrer_frames
+from paginas.comum import avisar_leituras, banco, cabecalho, catalogo, leitura_de, ler_conteudo_qr
+
+
+def registrar_fotos(arquivos):
+    """Decodifica as fotos ainda não lidas e grava todas as leituras de uma vez."""
+    pendentes = [f for f in arquivos if f.file_id not in st.session_state.fotos_lidas]
+    if not pendentes:
+        return None
+    lote = decodificar_lote([(f.name, f) for f in pendentes])
+    leituras = []
+    for resultado in lote:
+        resultado["dados"] = []
+        for texto in resultado["textos"]:
+            try:
+                dados = ler_conteudo_qr(texto)
+            except ValueError:
+                continue
+            resultado["dados"].append(dados)
+            leituras.append(leitura_de(dados))
+    if leituras:
+        avisar_leituras(banco.registrar_leituras(leituras))
+    st.session_state.fotos_lidas.update(f.file_id for f in pendentes)
+    return lote
+
+
+def exibir(resumo):
+    if "fotos_lidas" not in st.session_state:
+        st.session_state.fotos_lidas = set()
+    if "paletes_lidos" not in st.session_state:
+        st.session_state.paletes_lidos = {}
+
+    cabecalho("📷 Leitor de QR Code")
+
+    st.markdown("""
+    ### Como usar:
+    1. **Upload:** Tire fotos dos QR codes e faça upload (várias de uma vez)
+    2. **Câmera:** Use a câmera do navegador
+    3. **Manual:** Cole o conteúdo do QR code
+    4. **Palete:** Fotografe a face inteira do palete e leia todas as etiquetas de uma vez
+    5. **Vídeo:** Leitura contínua de uma câmera/stream ou de um vídeo gravado
+    """)
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📸 Upload de Foto", "📹 Câmera", "⌨️ Manual", "🧱 Palete",
+                                            "🎥 Vídeo"])
+
+    with tab1:
+        fotos = st.file_uploader("Envie fotos dos QR Codes", type=["png", "jpg", "jpeg", "webp"],
+                                 accept_multiple_files=True)
+        if fotos:
+            if len(fotos) == 1:
+                st.image(fotos[0], width=400)
+            try:
+                lote = registrar_fotos(fotos)
+                if lote:
+                    lidos = sum(len(r["dados"]) for r in lote)
+                    if lidos:
+                        st.markdown(f'<div class="success-box"><b>✅ {lidos} QR Code(s) lido(s) '
+                                    f'em {len(lote)} foto(s)!</b></div>', unsafe_allow_html=True)
+                    else:
+                        st.warning("Nenhum QR code encontrado na imagem.")
+                    if len(lote) == 1:
+                        for dados in lote[0]["dados"]:
+                            st.json(dados)
+                    st.dataframe([{
+                        "Arquivo": r["arquivo"],
+                        "QR lidos": len(r["dados"]),
+                        "Tentativa": r["etapa"] or "—",
+                        "Resolução": f"{r['largura']}×{r['altura']}",
+                        "Tempo (ms)": round(r["tempo_ms"], 1),
+                    } for r in lote], use_container_width=True, hide_index=True)
+            except ImportError:
+                st.warning("pyzbar não disponível.")
+
+    with tab2:
+        camera_foto = st.camera_input("Aponte para o QR Code")
+        if camera_foto:
+            try:
+                lote = registrar_fotos([camera_foto])
+                if lote:
+                    if lote[0]["dados"]:
+                        for dados in lote[0]["dados"]:
+                            st.success("✅ QR Code Lido!")
+                            st.json(dados)
+                    else:
+                        st.warning("QR code não detectado. Tente com melhor foco/iluminação.")
+            except ImportError:
+                st.warning("pyzbar não disponível.")
+
+    with tab3:
+        texto_qr = st.text_area("Cole o conteúdo do QR Code (formato compacto ou JSON)")
+        if st.button("Processar") and texto_qr:
+            try:
+                dados = ler_conteudo_qr(texto_qr)
+                st.success("✅ Dados processados!")
+                st.json(dados)
+                avisar_leituras(banco.registrar_leituras([leitura_de(dados)]))
+            except ValueError:
+                st.error("Conteúdo inválido.")
+
+    with tab4:
+        foto_palete = st.file_uploader("Foto do palete (alta resolução)", type=["png", "jpg", "jpeg", "webp"],
+                                       key="foto_palete")
+        esperadas = st.number_input("Unidades esperadas na foto", min_value=0, value=0,
+                                    help="Deixe 0 se não souber")
+        if foto_palete:
+            st.image(foto_palete, width=400)
+            try:
+                if foto_palete.file_id not in st.session_state.paletes_lidos:
+                    resultado = decodificar_palete(Image.open(foto_palete))
+                    resultado["por_numero"] = {
+                        n: payload.resolver(dados, catalogo, banco.buscar_unidade(n))
+                        for n, dados in resultado["por_numero"].items()
+                    }
+                    resultado["alertas"] = {}
+                    if resultado["por_numero"]:
+                        resultado["alertas"] = banco.registrar_leituras(
+                            [leitura_de(dados) for dados in resultado["por_numero"].values()])
+                    st.session_state.paletes_lidos[foto_palete.file_id] = resultado
+                resultado = st.session_state.paletes_lidos[foto_palete.file_id]
+                lidas = len(resultado["por_numero"])
+                st.caption(f"{resultado['blocos']} blocos de {resultado['largura']}×{resultado['altura']} "
+                           f"em {resultado['tempo_ms']:.0f} ms")
+                if esperadas and lidas == esperadas:
+                    st.markdown(f'<div class="success-box">✅ {lidas}/{esperadas} unidades lidas</div>',
+                                unsafe_allow_html=True)
+                elif esperadas:
+                    st.markdown(f'<div class="warning-box">⏳ {lidas}/{esperadas} unidades lidas — '
+                                f'confira as etiquetas que faltam</div>', unsafe_allow_html=True)
+                else:
+                    st.success(f"✅ {lidas} unidade(s) lida(s)")
+                if resultado["por_numero"]:
+                    st.dataframe([{
+                        "Nº": dados.get("n"),
+                        "Produto": dados.get("nome") or dados.get("p"),
+                        "Validade": dados.get("val"),
+                    } for dados in resultado["por_numero"].values()], use_container_width=True, hide_index=True)
+                if resultado["invalidos"]:
+                    st.warning(f"{len(resultado['invalidos'])} QR code(s) que não são etiquetas do sistema.")
+                avisar_leituras(resultado.get("alertas", {}))
+            except ImportError:
+                st.warning("pyzbar não disponível.")
+
+    with tab5:
+        tipo_origem = st.radio("Origem", ["Arquivo de vídeo", "Câmera ou stream"], horizontal=True)
+        if tipo_origem == "Arquivo de vídeo":
+            arquivo_video = st.file_uploader("Vídeo gravado", type=["mp4", "avi", "mov", "mkv"])
+            origem = None
+        else:
+            arquivo_video = None
+            origem = st.text_input("Índice da câmera ou URL do stream", value="0",
+                                   help="Ex.: 0 para a câmera local, rtsp://... para câmera IP")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            a_cada = st.number_input("Decodificar 1 a cada N frames", min_value=1, value=5)
+        with col2:
+            janela = st.number_input("Ignorar repetição (s)", min_value=1, value=10)
+        with col3:
+            duracao = st.number_input("Duração máxima (s)", min_value=5, value=120,
+                                      help="Só para câmera/stream")
+
+        if st.button("▶️ Iniciar varredura") and (arquivo_video or origem):
+            status_video = st.empty()
+            tmp = None
+            try:
+                if arquivo_video:
+                    # O OpenCV lê de um caminho, não de um buffer
+                    with tempfile.NamedTemporaryFile(suffix=os.path.splitext(arquivo_video.name)[1],
+                                                     delete=False) as tmp:
+                        tmp.write(arquivo_video.getbuffer())
+                    frames = ler_frames(tmp.name)
+                else:
+                    fonte = int(origem) if origem.strip().isdigit() else origem.strip()
+                    # Para de ler a câmera/stream ao passar da duração, não só descarta os frames
+                    frames = takewhile(lambda quadro: quadro[0] <= duracao, ler_frames(fonte))
+                total, alertas = 0, {}
+                for lote in varrer_frames(frames, a_cada=a_cada, janela=janela):
+                    if lote["novos"]:
+                        alertas.update(banco.registrar_leituras([
+                            leitura_de(payload.resolver(dados, catalogo, banco.buscar_unidade(dados.get("n"))))
+                            for dados in lote["novos"]
+                        ]))
+                        total += len(lote["novos"])
+                    status_video.info(f"🎥 {lote['frames']} frames, {lote['decodificados']} decodificados — "
+                                      f"{total} unidade(s) lida(s), {lote['repetidos']} repetição(ões) ignorada(s)")
+                st.success(f"✅ Varredura concluída: {total} unidade(s) lida(s).")
+                avisar_leituras(alertas)
+            except ImportError:
+                st.warning("OpenCV (opencv-python-headless) ou pyzbar não disponível.")
+            except ValueError as e:
+                st.error(str(e))
+            finally:
+                if tmp is not None:
+                    os.unlink(tmp.name)
+
+    if banco.contar_leituras():
+        st.markdown("### 📜 Histórico de Leituras")
+        st.dataframe(banco.listar_leituras(), use_container_width=True, hide_index=True)
+        if st.button("🗑️ Limpar leituras"):
+            banco.limpar_leituras()
+            st.rerun()
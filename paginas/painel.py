@@ -0,0 +1,47 @@
+"""
+🏠 Painel Geral
+"""
+
+import pandas as pd
+import streamlit as st
+
+from estoque.faixas import EM_ESTOQUE
+from paginas.comum import banco, cabecalho, catalogo
+
+
+def exibir(resumo):
+    total_unidades = resumo["total_unidades"]
+    vencidos = resumo["vencidos"]
+    proximos_vencer = resumo["proximos_vencer"]
+    em_estoque = banco.agregados.total(EM_ESTOQUE)
+    cabecalho("📦 Controle de Estoque com QR Code")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.markdown(f'<div class="stat-card"><h2>{len(catalogo)}</h2><p>Tipos de Produto</p></div>', unsafe_allow_html=True)
+    with col2:
+        st.markdown(f'<div class="stat-card"><h2>{em_estoque}</h2><p>Unidades no Estoque</p></div>', unsafe_allow_html=True)
+    with col3:
+        st.markdown(f'<div class="stat-card"><h2>{vencidos}</h2><p>Unidades Vencidas</p></div>', unsafe_allow_html=True)
+    with col4:
+        st.markdown(f'<div class="stat-card"><h2>{proximos_vencer}</h2><p>Vencem em 30 dias</p></div>', unsafe_allow_html=True)
+
+    st.markdown("### 📋 Últimas Unidades Cadastradas")
+    if total_unidades:
+        df = pd.DataFrame(banco.listar_unidades(limite=10, recentes_primeiro=True))
+        df["produto"] = catalogo.nomes(df["produto_id"])
+        df = df[["numero", "produto", "validade", "lote", "data_cadastro"]]
+        df.columns = ["Nº", "Produto", "Validade", "Lote", "Cadastro"]
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("Nenhuma unidade cadastrada ainda. Vá em **🏷️ Cadastrar Unidades** para começar.")
+
+    st.markdown("### 📦 Estoque por Produto")
+    if em_estoque:
+        qtd_por_id = pd.Series(banco.contagem_por_produto(EM_ESTOQUE))
+        df_estoque = (qtd_por_id.groupby(catalogo.nomes(qtd_por_id.index, padrao="Desconhecido").values)
+                      .sum()
+                      .sort_values(ascending=False)
+                      .rename_axis("Produto")
+                      .reset_index(name="Quantidade"))
+        st.bar_chart(df_estoque.set_index("Produto"))
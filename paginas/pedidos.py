@@ -0,0 +1,123 @@
+"""
+🚚 Verificar Pedido
+"""
+
+import streamlit as st
+
+from estoque.conferencia import ACEITA, DESCONHECIDA, DUPLICADA, EXPEDIDA, JA_EXPEDIDA
+from paginas.comum import banco, buscar_produto_por_id, cabecalho, catalogo, leitura_de, ler_conteudo_qr
+
+
+def exibir(resumo):
+    cabecalho("🚚 Verificação de Carregamento")
+
+    st.markdown("### 📝 Montar Pedido")
+    with st.form("form_pedido"):
+        cliente = st.text_input("Nome do Cliente")
+        st.markdown("**Itens do Pedido:**")
+        itens = []
+        for i in range(5):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                prod = st.selectbox(
+                    f"Produto {i + 1}",
+                    ["(nenhum)"] + catalogo.opcoes(com_volume=True),
+                    key=f"ped_prod_{i}"
+                )
+            with col2:
+                qtd = st.number_input(f"Qtd", min_value=0, max_value=500, value=0, key=f"ped_qtd_{i}")
+            if prod != "(nenhum)" and qtd > 0:
+                itens.append({"produto_id": prod.split(" - ")[0], "quantidade": qtd})
+
+        if st.form_submit_button("✅ Salvar Pedido", use_container_width=True):
+            if cliente and itens:
+                banco.salvar_pedido(cliente, itens)
+                st.success(f"Pedido de **{cliente}** salvo com {len(itens)} item(ns)!")
+                st.rerun()
+            else:
+                st.warning("Preencha o cliente e adicione pelo menos 1 item.")
+
+    st.markdown("### 🔍 Verificar Carregamento")
+    pedidos_pendentes = banco.listar_pedidos(status="pendente")
+    if pedidos_pendentes:
+        pedido_sel = st.selectbox(
+            "Selecione o pedido",
+            [f"{p['cliente']} - {p['data']}" for p in pedidos_pendentes]
+        )
+        idx = [f"{p['cliente']} - {p['data']}" for p in pedidos_pendentes].index(pedido_sel)
+        pedido = pedidos_pendentes[idx]
+
+        st.markdown("**Itens esperados:**")
+        for item in pedido["itens"]:
+            prod = buscar_produto_por_id(item["produto_id"])
+            if prod:
+                st.write(f"- {prod['nome']} {prod['volume']} × {item['quantidade']}")
+
+        conferencia = banco.conferencia(pedido["id"])
+
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            with st.form("form_conferir", clear_on_submit=True):
+                codigo = st.text_input("Código lido (leitor de mão ou colado)",
+                                       placeholder="C1:123:ENGEO20:2KF")
+                if st.form_submit_button("➕ Conferir unidade") and codigo.strip():
+                    try:
+                        dados = ler_conteudo_qr(codigo)
+                    except ValueError as e:
+                        st.error(f"Código inválido: {e}")
+                    else:
+                        try:
+                            resultado, = banco.conferir(pedido["id"], [leitura_de(dados)])
+                        except ValueError as e:
+                            st.error(str(e))
+                        else:
+                            if resultado == ACEITA:
+                                st.success(f"Unidade #{dados.get('n')} conferida.")
+                            else:
+                                st.warning(f"Unidade #{dados.get('n')}: {resultado}.")
+        with col2:
+            if st.button("⬇️ Trazer leituras do Leitor", use_container_width=True):
+                try:
+                    resultados = banco.conferir(pedido["id"], banco.listar_leituras())
+                except ValueError as e:
+                    st.error(str(e))
+                else:
+                    st.info(f"{resultados.count(ACEITA)} aceita(s), "
+                            f"{resultados.count(DUPLICADA)} já conferida(s).")
+                    if resultados.count(DESCONHECIDA) + resultados.count(JA_EXPEDIDA):
+                        st.warning(f"⚠️ {resultados.count(DESCONHECIDA)} número(s) desconhecido(s), "
+                                   f"{resultados.count(JA_EXPEDIDA)} unidade(s) já expedida(s).")
+
+        st.markdown(f"**Unidades conferidas:** {len(conferencia.numeros)}")
+        if conferencia.numeros:
+            for pid, lido, esperado in conferencia.itens():
+                prod = buscar_produto_por_id(pid)
+                nome = prod["nome"] if prod else pid
+                if pid in conferencia.faltando:
+                    st.markdown(f'<div class="warning-box">⏳ {nome}: {lido}/{esperado} — Faltam {conferencia.faltando[pid]}</div>', unsafe_allow_html=True)
+                elif pid in conferencia.excedentes:
+                    st.markdown(f'<div class="error-box">❌ {nome}: {lido}/{esperado} — {conferencia.excedentes[pid]} a mais!</div>', unsafe_allow_html=True)
+                else:
+                    st.markdown(f'<div class="success-box">✅ {nome}: {lido}/{esperado} — OK</div>', unsafe_allow_html=True)
+
+            for pid, qtd in conferencia.inesperados.items():
+                prod = buscar_produto_por_id(pid)
+                nome = prod["nome"] if prod else pid
+                st.markdown(f'<div class="error-box">🚫 {nome}: {qtd} un. — NÃO ESTÁ NO PEDIDO!</div>', unsafe_allow_html=True)
+
+            if conferencia.completa:
+                st.balloons()
+                st.success("🎉 Carregamento 100% correto!")
+                if st.button("🚚 Confirmar expedição", use_container_width=True):
+                    try:
+                        resultados = list(banco.confirmar_pedido(pedido["id"]).values())
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.success(f"{resultados.count(EXPEDIDA)} unidade(s) marcada(s) como expedida(s).")
+                        if resultados.count(EXPEDIDA) < len(resultados):
+                            st.warning(f"⚠️ {len(resultados) - resultados.count(EXPEDIDA)} unidade(s) já tinham saído.")
+        else:
+            st.info("Nenhuma unidade conferida. Escaneie acima ou traga as leituras do **📷 Leitor de QR Code**.")
+    else:
+        st.info("Nenhum pedido cadastrado.")
@@ -0,0 +1,76 @@
+"""
+📋 Cadastro de Produtos
+"""
+
+import streamlit as st
+
+from estoque.importacao import importar_produtos, ler_planilha
+from paginas.comum import banco, cabecalho, catalogo
+
+
+def exibir(resumo):
+    cabecalho("📋 Cadastro de Tipos de Produto")
+
+    st.markdown("### Produtos Cadastrados")
+    if catalogo:
+        df_prod = catalogo.como_dataframe()
+        df_prod.columns = ["Código", "Nome", "Volume", "Categoria"]
+        st.dataframe(df_prod, use_container_width=True, hide_index=True)
+
+    st.markdown("### ➕ Adicionar Novo Produto")
+    with st.form("form_produto"):
+        col1, col2 = st.columns(2)
+        with col1:
+            novo_id = st.text_input("Código (ex: PRIORI20)", max_chars=20)
+            novo_nome = st.text_input("Nome do Produto")
+        with col2:
+            novo_volume = st.text_input("Volume/Peso (ex: 20L, 5kg)")
+            nova_cat = st.selectbox("Categoria",
+                                    ["Inseticida", "Fungicida", "Herbicida", "Adjuvante",
+                                     "Acaricida", "Fertilizante", "Outro"])
+
+        if st.form_submit_button("✅ Adicionar Produto", use_container_width=True):
+            if novo_id and novo_nome and novo_volume:
+                if novo_id.upper() in catalogo:
+                    st.error("Código já existe!")
+                else:
+                    banco.adicionar_produtos([{
+                        "id": novo_id.upper(),
+                        "nome": novo_nome,
+                        "volume": novo_volume,
+                        "categoria": nova_cat
+                    }])
+                    st.success(f"Produto **{novo_nome}** adicionado!")
+                    st.rerun()
+            else:
+                st.warning("Preencha todos os campos.")
+
+    st.markdown("### 📤 Importar de Planilha")
+    uploaded = st.file_uploader("Envie CSV ou Excel com colunas: id, nome, volume, categoria",
+                                type=["csv", "xlsx"])
+    # O resultado da importação vale só para o arquivo que a gerou
+    arquivo = (uploaded.name, uploaded.size) if uploaded else None
+    if st.session_state.get("importacao", (arquivo,))[0] != arquivo:
+        del st.session_state.importacao
+    if uploaded:
+        try:
+            st.dataframe(next(ler_planilha(uploaded, uploaded.name, tamanho_bloco=5), None),
+                         use_container_width=True)
+            if st.button("✅ Importar Produtos"):
+                uploaded.seek(0)
+                with st.spinner("Importando..."):
+                    st.session_state.importacao = (
+                        arquivo, importar_produtos(banco, ler_planilha(uploaded, uploaded.name)))
+                st.rerun()
+        except Exception as e:
+            st.error(f"Erro ao ler arquivo: {e}")
+
+    if "importacao" in st.session_state:
+        _, (count, erros) = st.session_state.importacao
+        st.success(f"{count} produtos importados!")
+        if len(erros):
+            st.warning(f"{len(erros)} linha(s) recusada(s):")
+            st.dataframe(erros.rename(columns={"linha": "Linha", "id": "Código", "erro": "Motivo"}),
+                         use_container_width=True, hide_index=True)
+            st.download_button("⬇️ Baixar relatório de erros", erros.to_csv(index=False).encode("utf-8"),
+                               "erros_importacao.csv", "text/csv")
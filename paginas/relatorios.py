@@ -0,0 +1,112 @@
+"""
+📊 Relatórios
+"""
+
+import json
+import tempfile
+
+import streamlit as st
+
+from estoque.exportacao import FORMATOS, exportar, parquet_disponivel
+from estoque.faixas import EM_ESTOQUE
+from estoque.relatorios import estoque_atual, tabela_validades
+from paginas.comum import banco, cabecalho, catalogo
+from paginas.tabelas import filtros_tabela, paginar
+
+
+def exibir(resumo):
+    total_unidades = resumo["total_unidades"]
+    hoje = resumo["hoje"]
+    cabecalho("📊 Relatórios")
+
+    tab1, tab2, tab3 = st.tabs(["📦 Estoque Atual", "⏰ Validades", "📤 Exportar"])
+
+    with tab1:
+        if total_unidades:
+            df_est = estoque_atual(banco.contagem_por_produto(EM_ESTOQUE), catalogo)
+            st.dataframe(df_est, use_container_width=True, hide_index=True)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                por_categoria = banco.agregados.por_campo_do_produto(catalogo, "categoria", padrao="Desconhecida")
+                st.dataframe([{"Categoria": c, "Quantidade": q} for c, q in
+                              sorted(por_categoria.items(), key=lambda item: item[1], reverse=True)],
+                             use_container_width=True, hide_index=True)
+            with col2:
+                st.dataframe([{"Status": s, "Quantidade": q} for s, q in banco.agregados.por_status().items()],
+                             use_container_width=True, hide_index=True)
+        else:
+            st.info("Nenhuma unidade cadastrada.")
+
+    with tab2:
+        if total_unidades:
+            colunas = banco.unidades_colunares()
+            ordem, decrescente, filtros = filtros_tabela("tabela_validades", ordem_padrao="Validade")
+            posicoes = paginar(colunas.consultar(ordem, decrescente, **filtros), "tabela_validades")
+            df_val = tabela_validades(colunas, catalogo, posicoes, hoje)
+            st.dataframe(df_val, use_container_width=True, hide_index=True,
+                         column_config={"Validade": st.column_config.DateColumn(format="DD/MM/YYYY")})
+        else:
+            st.info("Nenhuma unidade cadastrada.")
+
+    with tab3:
+        if total_unidades:
+            formatos = ["csv"] + (["parquet"] if parquet_disponivel() else [])
+            formato = st.radio("Formato", formatos, format_func=str.upper, horizontal=True)
+            tipo, extensao = FORMATOS[formato]
+
+            def estoque():
+                # Gerado só no clique, em blocos, direto para um arquivo temporário
+                arquivo = tempfile.TemporaryFile()
+                exportar(banco, formato, arquivo)
+                arquivo.seek(0)
+                return arquivo
+
+            st.download_button(f"⬇️ Exportar Estoque ({formato.upper()})", estoque, "estoque_completo" + extensao,
+                               tipo, use_container_width=True)
+            st.caption(f"O Streamlit lê o arquivo inteiro para a memória do servidor antes de enviá-lo ao "
+                       f"navegador. Para estoques grandes, baixe pela API (``GET /estoque{extensao}``), que "
+                       f"envia o arquivo em partes à medida que é gerado.")
+
+            def snapshot():
+                arquivo = tempfile.TemporaryFile()
+                banco.exportar_snapshot(arquivo)
+                arquivo.seek(0)
+                return arquivo
+
+            st.download_button("⬇️ Backup Completo (snapshot comprimido)", snapshot, "backup_estoque.jsonl.gz",
+                               "application/gzip", use_container_width=True)
+            st.caption("O backup também passa inteiro pela memória do servidor; a API envia o mesmo snapshot "
+                       "em partes, direto do banco (``GET /snapshot.jsonl.gz``).")
+
+        st.markdown("### 📥 Importar Backup")
+        backup_file = st.file_uploader("Carregar backup (snapshot .jsonl.gz ou JSON antigo)", type=["gz", "json"])
+        if backup_file:
+            if st.button("✅ Restaurar Backup"):
+                try:
+                    if backup_file.name.endswith(".gz"):
+                        banco.restaurar_snapshot(backup_file)
+                    else:
+                        banco.restaurar_backup(json.loads(backup_file.read()))
+                except Exception as e:
+                    st.error(f"Erro: {e}")
+                else:
+                    st.success("Backup restaurado!")
+                    st.rerun()
+
+        st.markdown("### ⏪ Recuperar Estado Anterior")
+        eventos = banco.diario.ultimos(20)
+        if eventos:
+            st.dataframe([{"Evento": e["seq"], "Horário": e["horario"].replace("T", " "), "Tipo": e["tipo"]}
+                          for e in reversed(eventos)], use_container_width=True, hide_index=True)
+            ate = st.number_input("Recuperar até o evento nº", min_value=1, value=eventos[-1]["seq"])
+            if st.button("⏪ Recuperar"):
+                try:
+                    recuperado = banco.recuperar(ate=int(ate))
+                except ValueError as e:
+                    st.error(f"Erro: {e}")
+                else:
+                    st.success(f"Banco recuperado até o evento {recuperado}.")
+                    st.rerun()
+        else:
+            st.info("Nenhuma alteração registrada no diário.")
@@ -0,0 +1,63 @@
+"""
+Filtros, ordenação e paginação das tabelas de unidades.
+"""
+
+import streamlit as st
+
+from paginas.comum import catalogo
+
+ORDENS_TABELA = {"Nº": "numero", "Produto": "produto_id", "Validade": "validade", "Lote": "lote", "Status": "status"}
+
+
+def filtros_tabela(chave, ordem_padrao="Nº"):
+    """Filtros e ordenação de uma tabela de unidades; retorna (ordem, decrescente, filtros)."""
+    with st.expander("🔎 Filtrar e ordenar"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            produto = st.selectbox("Produto", ["Todos"] + catalogo.opcoes(),
+                                   key=f"{chave}_produto")
+            lote = st.text_input("Lote", key=f"{chave}_lote")
+        with col2:
+            status = st.selectbox("Status", ["Todos", "em_estoque", "expedido"], key=f"{chave}_status")
+            validade = st.date_input("Validade entre", value=(), key=f"{chave}_validade")
+        with col3:
+            numero_de = st.number_input("Do número", min_value=1, value=None, key=f"{chave}_de")
+            numero_ate = st.number_input("Até número", min_value=1, value=None, key=f"{chave}_ate")
+        col1, col2 = st.columns(2)
+        with col1:
+            ordem = st.selectbox("Ordenar por", list(ORDENS_TABELA), index=list(ORDENS_TABELA).index(ordem_padrao),
+                                 key=f"{chave}_ordem")
+        with col2:
+            decrescente = st.checkbox("Decrescente", key=f"{chave}_decrescente")
+
+    filtros = {"numero_de": numero_de, "numero_ate": numero_ate}
+    if produto != "Todos":
+        filtros["produto_id"] = produto.split(" - ")[0]
+    if status != "Todos":
+        filtros["status"] = status
+    if lote.strip():
+        filtros["lote"] = lote.strip()
+    if len(validade) == 2:
+        filtros["validade_de"], filtros["validade_ate"] = validade
+    return ORDENS_TABELA[ordem], decrescente, filtros
+
+
+def paginar(posicoes, chave):
+    """Posições da página escolhida; só elas viram DataFrame."""
+    total = len(posicoes)
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        por_pagina = st.selectbox("Por página", [25, 50, 100, 500], index=1, key=f"{chave}_por_pagina")
+    paginas = max(1, -(-total // por_pagina))
+    # A página fica só no session_state: o widget com ``key`` ignoraria um ``value``
+    if f"{chave}_pagina" not in st.session_state:
+        st.session_state[f"{chave}_pagina"] = 1
+    # Os filtros podem ter encolhido a tabela desde a última página escolhida
+    elif st.session_state[f"{chave}_pagina"] > paginas:
+        st.session_state[f"{chave}_pagina"] = paginas
+    with col2:
+        pagina = st.number_input("Página", min_value=1, max_value=paginas, key=f"{chave}_pagina")
+    with col3:
+        st.caption(f"{total} unidade(s) — página {pagina} de {paginas}")
+    inicio = (pagina - 1) * por_pagina
+    return posicoes[inicio:inicio + por_pagina]
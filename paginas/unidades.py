@@ -0,0 +1,61 @@
+"""
+🏷️ Cadastrar Unidades
+"""
+
+import pandas as pd
+import streamlit as st
+
+from estoque.etiquetas import gerar_etiqueta
+from paginas.comum import banco, buscar_produto_por_id, cabecalho, catalogo
+from paginas.tabelas import filtros_tabela, paginar
+
+
+def exibir(resumo):
+    cabecalho("🏷️ Cadastrar Unidades Individuais")
+
+    st.info(f"Próximo número disponível: **#{banco.proximo_numero():04d}**")
+
+    with st.form("form_unidade"):
+        col1, col2 = st.columns(2)
+        with col1:
+            produto_nomes = catalogo.opcoes(com_volume=True)
+            produto_sel = st.selectbox("Produto", produto_nomes)
+            quantidade = st.number_input("Quantidade de unidades a cadastrar", min_value=1, max_value=100, value=1)
+        with col2:
+            validade = st.date_input("Data de Validade")
+            lote = st.text_input("Lote (opcional)", placeholder="Ex: 2025-A")
+
+        if st.form_submit_button("🏷️ Cadastrar Unidade(s)", use_container_width=True):
+            produto_id = produto_sel.split(" - ")[0]
+            novas_unidades = banco.cadastrar_unidades(produto_id, quantidade, validade, lote if lote else "N/I")
+
+            prod = buscar_produto_por_id(produto_id)
+            st.success(f"✅ {quantidade} unidade(s) de **{prod['nome']}** cadastrada(s)! "
+                       f"(#{novas_unidades[0]['numero']:04d} a #{novas_unidades[-1]['numero']:04d})")
+
+            st.markdown("### 👀 Preview das Etiquetas")
+            cols = st.columns(min(quantidade, 3))
+            for i, un in enumerate(novas_unidades[:3]):
+                with cols[i % 3]:
+                    etiqueta = gerar_etiqueta(un, prod)
+                    st.image(etiqueta, caption=f"Unidade #{un['numero']:04d}", width=300)
+
+    st.markdown("### 📋 Unidades Cadastradas")
+    if banco.contar_unidades():
+        colunas = banco.unidades_colunares()
+        ordem, decrescente, filtros = filtros_tabela("tabela_unidades")
+        pagina_un = colunas.linhas(paginar(colunas.consultar(ordem, decrescente, **filtros), "tabela_unidades"))
+        df_un = pd.DataFrame({
+            "Nº": pagina_un["numero"],
+            "Produto": catalogo.nomes(pagina_un["produto_id"]),
+            "Validade": pagina_un["validade"],
+            "Lote": pagina_un["lote"],
+            "Cadastro": pagina_un["data_cadastro"],
+            "Status": pagina_un["status"],
+        })
+        st.dataframe(
+            df_un,
+            use_container_width=True,
+            hide_index=True,
+            column_config={"Validade": st.column_config.DateColumn(format="DD/MM/YYYY")}
+        )
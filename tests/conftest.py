@@ -0,0 +1,12 @@
+import pytest
+
+from estoque.banco import BancoEstoque
+from estoque.catalogo import PRODUTOS_PADRAO
+
+
+@pytest.fixture
+def banco(tmp_path):
+    """Banco novo em ``tmp_path``, com o catálogo padrão."""
+    banco = BancoEstoque(str(tmp_path / "estoque.db"), produtos_iniciais=PRODUTOS_PADRAO)
+    yield banco
+    banco.fechar()
@@ -0,0 +1,68 @@
+"""Os agregados mantidos incrementalmente batem com uma recontagem do zero."""
+
+from estoque.catalogo import PRODUTOS_PADRAO
+from estoque.conferencia import EXPEDIDA
+
+ENGEO, ACTARA = PRODUTOS_PADRAO[0]["id"], PRODUTOS_PADRAO[1]["id"]
+
+
+def _leituras(numeros):
+    return [{"numero": numero, "horario": "18/10/2026 10:00"} for numero in numeros]
+
+
+def test_cadastro(banco):
+    banco.cadastrar_unidades(ENGEO, 10, "01/01/2027", "L1")
+    banco.cadastrar_lote([(ACTARA, 5, "2027-02-01", "L2"), (ENGEO, 3, None, "L3")])
+    assert banco.agregados.total() == 18
+    assert banco.verificar_agregados() == {}
+
+
+def test_expedicao(banco):
+    banco.cadastrar_unidades(ENGEO, 10, "01/01/2027", "L1")
+    resultados = banco.expedir([2, 3, 3, 999])
+    assert resultados[2] == resultados[3] == EXPEDIDA
+    assert banco.contar_unidades(status="expedido") == 2
+    assert banco.verificar_agregados() == {}
+
+
+def test_confirmacao_parcial(banco):
+    banco.cadastrar_unidades(ENGEO, 10, "01/01/2027", "L1")
+    pedido = banco.salvar_pedido("Cliente", [{"produto_id": ENGEO, "quantidade": 5}])
+    banco.conferir(pedido["id"], _leituras([1, 2, 3]))
+    assert set(banco.confirmar_pedido(pedido["id"], parcial=True)) == {1, 2, 3}
+    assert banco.contar_unidades(status="expedido") == 3
+    assert banco.verificar_agregados() == {}
+
+
+def test_recuperar_ate_evento(banco):
+    banco.gravar_snapshot()
+    banco.cadastrar_unidades(ENGEO, 10, "01/01/2027", "L1")
+    banco.expedir([1, 2])
+    ate = banco._seq_diario()
+    banco.cadastrar_unidades(ACTARA, 5, None, "L2")
+    banco.expedir([3, 11])
+    assert banco.recuperar(ate=ate) == ate
+    assert banco.contar_unidades() == 10
+    assert banco.contar_unidades(status="expedido") == 2
+    assert banco.verificar_agregados() == {}
+
+
+def test_restaurar_backup(banco):
+    banco.cadastrar_unidades(ENGEO, 10, "01/01/2027", "L1")
+    banco.restaurar_backup({
+        "produtos": PRODUTOS_PADRAO,
+        "faixas": [{"inicio": 1, "fim": 4, "produto_id": ACTARA, "validade": "2027-03-01", "lote": "B1"}],
+        "situacoes": [{"numero": 2, "status": "expedido"}],
+        "proximo_numero": 5,
+    })
+    assert banco.contar_unidades() == 4
+    assert banco.contar_unidades(status="expedido") == 1
+    assert banco.verificar_agregados() == {}
+
+
+def test_divergencia_aparece(banco):
+    banco.cadastrar_unidades(ENGEO, 10, "01/01/2027", "L1")
+    chave = (ENGEO, "L1", "em_estoque")
+    assert banco.agregados.contagens() == {chave: 10}
+    banco.agregados._estado[chave] = 9
+    assert banco.verificar_agregados() == {chave: (9, 10)}
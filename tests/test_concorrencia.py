@@ -0,0 +1,75 @@
+"""Cadastros simultâneos no mesmo banco nunca repetem nem pulam números."""
+
+import multiprocessing
+import threading
+
+from estoque.banco import BancoEstoque
+from estoque.catalogo import PRODUTOS_PADRAO
+
+THREADS = 8
+CADASTROS = 25
+PRODUTO = PRODUTOS_PADRAO[0]["id"]
+
+
+def _cadastrar(banco, semente, inicio=None):
+    """Faz ``CADASTROS`` cadastros de tamanhos variados; retorna as faixas (inicio, fim)."""
+    if inicio is not None:
+        inicio.wait()
+    faixas = []
+    for i in range(CADASTROS):
+        faixa = banco.cadastrar_unidades(PRODUTO, 1 + (semente * 7 + i) % 13, None, f"T{semente}")
+        faixas.append((faixa.inicio, faixa.fim))
+    return faixas
+
+
+def _em_threads(banco, sementes):
+    inicio = threading.Barrier(len(sementes))
+    resultados = {}
+
+    def rodar(semente):
+        resultados[semente] = _cadastrar(banco, semente, inicio)
+
+    threads = [threading.Thread(target=rodar, args=(s,)) for s in sementes]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [f for s in sementes for f in resultados[s]]
+
+
+def _processo(caminho, sementes, fila):
+    banco = BancoEstoque(caminho)
+    fila.put(_em_threads(banco, sementes))
+    banco.fechar()
+
+
+def _verificar(banco, faixas):
+    """As faixas não se sobrepõem e cobrem 1..proximo_numero - 1 sem buracos."""
+    faixas = sorted(faixas)
+    assert faixas[0][0] == 1
+    for (_, fim_anterior), (inicio, _) in zip(faixas, faixas[1:]):
+        assert inicio == fim_anterior + 1
+    assert faixas[-1][1] == banco.proximo_numero() - 1 == banco.contar_unidades()
+
+
+def test_threads_nao_repetem_numeros(banco):
+    faixas = _em_threads(banco, range(THREADS))
+    assert len(faixas) == THREADS * CADASTROS
+    _verificar(banco, faixas)
+    assert banco.verificar_agregados() == {}
+
+
+def test_processos_nao_repetem_numeros(banco):
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processos = [contexto.Process(target=_processo, args=(banco.caminho, range(p * 4, p * 4 + 4), fila))
+                 for p in (1, 2)]
+    for p in processos:
+        p.start()
+    faixas = _em_threads(banco, range(4))
+    for _ in processos:
+        faixas += fila.get(timeout=60)
+    for p in processos:
+        p.join()
+    assert len(faixas) == 12 * CADASTROS
+    _verificar(banco, faixas)